@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Asset Bundler for LangGames
+Builds content-hashed script and stylesheet bundles for the game pages
+
+The scripts and CSS referenced by the HTML pages are concatenated, lightly
+minified and written to src/dist/ under names containing a hash of their
+content, together with copies of the pages that point at the bundles. Since
+a bundle's name changes whenever its content does, the server can let
+browsers cache bundles forever.
+
+Usage:
+    python asset_bundler.py
+"""
+
+import hashlib
+import os
+import re
+
+SRC_DIRECTORY = "src"
+DIST_DIRECTORY = "dist"
+
+# Bundle name -> source files, in load order
+BUNDLES = {
+    'app.js': ['vocabulary.js', 'crypto.js', 'game.js'],
+    'app.css': ['style.css'],
+}
+
+PAGES = ['index.html', 'landing.html']
+
+HASHED_ASSET_PATTERN = re.compile(r'^/dist/[\w-]+\.[0-9a-f]{12}\.(js|css)$')
+BUNDLE_NAME_PATTERN = re.compile(r'^([\w-]+)\.[0-9a-f]{12}(\.(?:js|css))$')
+
+
+def minify_js(source):
+    """
+    Conservative JS minification
+
+    Drops full-line comments, indentation and blank lines. Line breaks are
+    kept so automatic semicolon insertion behaves exactly as before.
+    """
+    lines = []
+    for line in source.splitlines():
+        stripped = line.strip()
+        if stripped and not stripped.startswith('//'):
+            lines.append(stripped)
+    return '\n'.join(lines)
+
+
+def minify_css(source):
+    """Drop comments and whitespace that carries no meaning in CSS"""
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};])\s*', r'\1', source)
+    return source.replace(';}', '}').strip()
+
+
+def _content_hash(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+
+
+def _rewrite_page(html, bundle_urls):
+    """Point a page at the bundles instead of the individual files"""
+    for bundle, sources in BUNDLES.items():
+        names = '|'.join(re.escape(source) for source in sources)
+        if bundle.endswith('.js'):
+            pattern = re.compile(r'([ \t]*)<script src="/?(?:' + names + r')"></script>\n?')
+            tag = f'<script src="{bundle_urls[bundle]}"></script>\n'
+        else:
+            pattern = re.compile(r'([ \t]*)<link rel="stylesheet" href="/?(?:' + names + r')">\n?')
+            tag = f'<link rel="stylesheet" href="{bundle_urls[bundle]}">\n'
+
+        # The first reference becomes the bundle, later ones are dropped
+        matches = iter(range(len(sources)))
+        html = pattern.sub(lambda match: match.group(1) + tag if next(matches) == 0 else '', html)
+    return html
+
+
+def build_assets(src_dir=SRC_DIRECTORY):
+    """
+    Build bundles and rewritten pages into src/dist/
+
+    Returns:
+        dict: {page name: path of the rewritten page relative to src_dir}
+    """
+    dist_dir = os.path.join(src_dir, DIST_DIRECTORY)
+    os.makedirs(dist_dir, exist_ok=True)
+
+    bundle_urls = {}
+    keep = set()
+    for bundle, sources in BUNDLES.items():
+        parts = []
+        for source in sources:
+            with open(os.path.join(src_dir, source), 'r', encoding='utf-8') as f:
+                parts.append(f.read())
+
+        if bundle.endswith('.js'):
+            # Separate files with ';' so a missing trailing semicolon can't merge statements
+            content = '\n;\n'.join(minify_js(part) for part in parts) + '\n'
+        else:
+            content = '\n'.join(minify_css(part) for part in parts) + '\n'
+
+        stem, ext = os.path.splitext(bundle)
+        filename = f"{stem}.{_content_hash(content)}{ext}"
+        keep.add(filename)
+        bundle_urls[bundle] = f"/{DIST_DIRECTORY}/{filename}"
+
+        path = os.path.join(dist_dir, filename)
+        if not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        else:
+            os.utime(path)  # Newest of its bundle, so cleanup keeps the one before it
+
+    pages = {}
+    for page in PAGES:
+        with open(os.path.join(src_dir, page), 'r', encoding='utf-8') as f:
+            html = _rewrite_page(f.read(), bundle_urls)
+        with open(os.path.join(dist_dir, page), 'w', encoding='utf-8') as f:
+            f.write(html)
+        keep.add(page)
+        pages[page] = f"{DIST_DIRECTORY}/{page}"
+
+    # Remove bundles from earlier builds, except the generation just replaced: pages
+    # another server process rendered before this build may still reference it
+    previous = {}
+    for name in os.listdir(dist_dir):
+        if name in keep:
+            continue
+        path = os.path.join(dist_dir, name)
+        match = BUNDLE_NAME_PATTERN.match(name)
+        if match:
+            bundle = match.group(1) + match.group(2)
+            older = previous.get(bundle)
+            if older is None or os.path.getmtime(path) > os.path.getmtime(older):
+                previous[bundle] = path
+                path = older  # Displaced by a newer one
+        if path:
+            os.remove(path)
+
+    return pages
+
+
+def is_hashed_asset(path):
+    """Check whether a request path names a content-hashed bundle"""
+    return bool(HASHED_ASSET_PATTERN.match(path.split('?', 1)[0]))
+
+
+if __name__ == "__main__":
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(script_dir)
+
+    pages = build_assets()
+    dist_dir = os.path.join(SRC_DIRECTORY, DIST_DIRECTORY)
+    print(f"✓ Built assets in {dist_dir}")
+    for name in sorted(os.listdir(dist_dir)):
+        size = os.path.getsize(os.path.join(dist_dir, name))
+        print(f"  {name:32s} {size:8d} bytes")
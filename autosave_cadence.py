@@ -0,0 +1,60 @@
+"""
+Autosave Cadence for LangGames
+Recommends how long clients should wait before their next autosave
+"""
+
+import threading
+
+
+class AutosaveCadence:
+    """
+    Derives an autosave interval from backend latency and queue depth
+
+    Backend call latency is tracked as an exponentially weighted moving
+    average. Pressure is the larger of latency relative to its target and
+    backend slot utilisation relative to half the pool; the base interval is
+    scaled by it, so an idle server asks for frequent saves and a loaded one
+    spreads them out.
+    """
+
+    def __init__(self, base_interval=30, min_interval=10, max_interval=300,
+                 target_latency=0.25, smoothing=0.2):
+        """
+        Args:
+            base_interval (float): Seconds between autosaves at nominal load
+            min_interval (float): Shortest interval ever recommended
+            max_interval (float): Longest interval ever recommended
+            target_latency (float): Backend latency (seconds) considered nominal
+            smoothing (float): Weight of each new latency sample
+        """
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_latency = target_latency
+        self.smoothing = smoothing
+        self.latency = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        """Record how long a backend call took"""
+        with self._lock:
+            if self.latency == 0.0:
+                self.latency = seconds
+            else:
+                self.latency += self.smoothing * (seconds - self.latency)
+
+    def recommend(self, in_flight=0, capacity=1):
+        """
+        Recommended autosave interval
+
+        Args:
+            in_flight (int): Backend calls currently running
+            capacity (int): Backend calls allowed at once
+
+        Returns:
+            int: Milliseconds until the client's next autosave
+        """
+        utilisation = in_flight / capacity if capacity else 1.0
+        pressure = max(self.latency / self.target_latency, utilisation * 2)
+        interval = min(self.max_interval, max(self.min_interval, self.base_interval * pressure))
+        return int(interval) * 1000
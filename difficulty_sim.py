@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Difficulty Simulator for LangGames
+Plays many headless sessions of the spawn/lives model at once to tune pacing
+
+The model follows game.js: spawn intervals from startSpawning, vehicle
+speeds from Tank.getSpeed, the level item mix from getVocabularyForLevel
+and the path length from pathWaypoints. A simulated player answers tanks
+oldest first; each answer takes a log-normally distributed time and is
+wrong with a per-difficulty probability (costing a life, then retrying).
+A tank that reaches the end before it is answered costs a life and its
+item spawns again later.
+
+Sessions advance together, one spawn per step, as numpy arrays, so
+millions of sessions run in seconds. Simplifications: an item leaves the
+spawn draw as soon as its tank is answered (the game also re-spawns items
+whose tank is still on screen), and a retry takes as long as the first try.
+
+Usage:
+    python difficulty_sim.py --sessions 1000000 --grid base_spawn_rate=2500,3000,3500 --grid lives=3,5
+"""
+
+import copy
+import itertools
+import json
+import math
+import os
+import re
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from var import BASE_SPAWN_RATE, DEFAULT_LIVES
+from vocabulary import load_vocabulary
+
+GAME_FILE = os.path.join("src", "game.js")
+DIFFICULTIES = ('letter', 'word', 'sentence')
+
+DEFAULT_PARAMS = {
+    # startSpawning: fixed intervals for levels 1-3, then base - level * step, floored
+    'early_spawn_rates': [5000, 4000, 3500],
+    'base_spawn_rate': BASE_SPAWN_RATE,
+    'spawn_rate_step': 200,
+    'min_spawn_rate': 1000,
+    # Tank.getSpeed: pixels per frame for levels 1-3, then base + level * step
+    'early_speeds': [0.3, 0.5, 0.7],
+    'speed_base': 1.0,
+    'speed_step': 0.15,
+    'vehicle_speed': {'letter': 1.8, 'word': 1.2, 'sentence': 0.7},  # suv, tank, blimp
+    'speed_multiplier': 1.0,
+    'fps': 60,
+    'lives': DEFAULT_LIVES,
+    # Simulated player
+    'response_ms': {'letter': 1500, 'word': 2500, 'sentence': 4500},  # median time per answer
+    'response_sigma': 0.5,  # log-normal spread
+    'accuracy': {'letter': 0.95, 'word': 0.9, 'sentence': 0.85},
+}
+
+# Share of each category the game draws from at a level (see getVocabularyForLevel)
+LEVEL_MIX = [
+    (2, {'letters': 1.0}),
+    (5, {'words': 1.0, 'letters': 0.3}),
+    (None, {'sentences': 1.0, 'words': 0.2, 'letters': 0.1}),
+]
+
+
+def path_length(path=GAME_FILE):
+    """Length in pixels of pathWaypoints in game.js"""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    block = re.search(r'const pathWaypoints = \[(.*?)\];', source, re.S).group(1)
+    points = [(int(x), int(y)) for x, y in re.findall(r'x:\s*(\d+),\s*y:\s*(\d+)', block)]
+    return sum(math.dist(a, b) for a, b in zip(points, points[1:]))
+
+
+def level_items(vocabulary, max_level):
+    """
+    Items per difficulty at each level
+
+    Returns:
+        ndarray: int32[max_level + 1][3], row = level, columns in DIFFICULTIES order
+    """
+    by_category = {}
+    for item in vocabulary:
+        by_category.setdefault(item['category'], []).append(item['difficulty'])
+
+    counts = np.zeros((max_level + 1, len(DIFFICULTIES)), dtype=np.int32)
+    for level in range(1, max_level + 1):
+        mix = next(mix for top, mix in LEVEL_MIX if top is None or level <= top)
+        for category, share in mix.items():
+            difficulties = by_category.get(category, [])
+            for difficulty in difficulties[:int(len(difficulties) * share)]:
+                counts[level, DIFFICULTIES.index(difficulty)] += 1
+    return counts
+
+
+def _level_tables(params, max_level, length):
+    """Spawn interval (ms) per level and tank travel time (ms) per level and difficulty"""
+    levels = np.arange(max_level + 1)
+    interval = np.maximum(params['min_spawn_rate'], params['base_spawn_rate'] - levels * params['spawn_rate_step'])
+    speed = params['speed_base'] + levels * params['speed_step']
+    for level, (rate, early_speed) in enumerate(zip(params['early_spawn_rates'], params['early_speeds']), start=1):
+        if level <= max_level:
+            interval[level] = rate
+            speed[level] = early_speed
+    interval = interval / params['speed_multiplier']
+
+    vehicle = np.array([params['vehicle_speed'][d] for d in DIFFICULTIES])
+    pixels_per_ms = speed[:, None] * vehicle[None, :] * params['speed_multiplier'] * params['fps'] / 1000
+    return interval.astype(np.float64), length / pixels_per_ms
+
+
+def simulate(params, sessions, max_level=30, vocabulary=None, length=None, seed=None):
+    """
+    Run sessions until each one ends or reaches max_level
+
+    Args:
+        params (dict): Parameter set (see DEFAULT_PARAMS)
+        sessions (int): Sessions to simulate
+        max_level (int): Level at which a session counts as finished
+        vocabulary (list): Items from vocabulary.load_vocabulary()
+        length (float): Path length in pixels (default: from game.js)
+        seed (int): Random seed
+
+    Returns:
+        dict: reach[level] (share of sessions reaching it), gameOver[level]
+              (share ending there), medianMinutes (session length) and steps
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = vocabulary if vocabulary is not None else load_vocabulary()
+    length = length if length is not None else path_length()
+    items = level_items(vocabulary, max_level)
+    interval, travel = _level_tables(params, max_level, length)
+    median = np.log([params['response_ms'][d] for d in DIFFICULTIES])
+    accuracy = np.array([params['accuracy'][d] for d in DIFFICULTIES])
+
+    level = np.ones(sessions, dtype=np.int32)
+    lives = np.full(sessions, params['lives'], dtype=np.int32)
+    remaining = np.repeat(items[1][None, :], sessions, axis=0)
+    spawn_index = np.zeros(sessions, dtype=np.int64)
+    level_start = np.zeros(sessions)
+    free_at = np.zeros(sessions)
+
+    final_level = np.zeros(sessions, dtype=np.int32)
+    ended_at = np.zeros(sessions)
+    ids = np.arange(sessions)
+    steps = 0
+
+    while ids.size:
+        steps += 1
+        now = level_start + spawn_index * interval[level]
+
+        # Draw the spawned item's difficulty in proportion to unanswered items
+        cumulative = remaining.cumsum(axis=1)
+        pick = rng.random(ids.size) * cumulative[:, -1]
+        difficulty = (pick[:, None] >= cumulative).sum(axis=1)
+
+        deadline = now + travel[level, difficulty]
+        start = np.maximum(now, free_at)
+        answer = np.exp(median[difficulty] + params['response_sigma'] * rng.standard_normal(ids.size))
+        wrong = rng.geometric(accuracy[difficulty]) - 1
+        finish = start + answer * (wrong + 1)
+
+        hit = finish <= deadline
+        # On a miss, only the wrong answers given before the tank escaped count
+        wrong_in_time = np.minimum(wrong, np.floor(np.maximum(deadline - start, 0) / answer).astype(np.int64))
+        lives -= np.where(hit, wrong, wrong_in_time + 1).astype(np.int32)
+        free_at = np.where(hit, finish, np.where(start < deadline, deadline, free_at))
+        remaining[np.flatnonzero(hit), difficulty[hit]] -= 1
+
+        # Level cleared: the next spawn tick levels up and spawns immediately
+        cleared = hit & (remaining.sum(axis=1) == 0) & (lives > 0)
+        spawn_index += 1
+        if cleared.any():
+            ticks = np.ceil((free_at[cleared] - level_start[cleared]) / interval[level[cleared]])
+            level_start[cleared] += ticks * interval[level[cleared]]
+            level[cleared] += 1
+            spawn_index[cleared] = 0
+            remaining[cleared] = items[np.minimum(level[cleared], max_level)]
+
+        done = (lives <= 0) | (level >= max_level)
+        if done.any():
+            final_level[ids[done]] = level[done]
+            ended_at[ids[done]] = np.maximum(free_at[done], now[done])
+            keep = ~done
+            ids, level, lives, remaining = ids[keep], level[keep], lives[keep], remaining[keep]
+            spawn_index, level_start, free_at = spawn_index[keep], level_start[keep], free_at[keep]
+
+    reached = np.bincount(final_level, minlength=max_level + 1)
+    reach = reached[::-1].cumsum()[::-1] / sessions
+    game_over = reached / sessions
+    game_over[max_level] = 0.0  # finished sessions didn't lose
+    return {
+        'reach': [round(float(value), 5) for value in reach[1:]],
+        'gameOver': [round(float(value), 5) for value in game_over[1:]],
+        'medianMinutes': round(float(np.median(ended_at)) / 60000, 2),
+        'steps': steps,
+    }
+
+
+def _parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _apply(params, assignment):
+    """Set a possibly dotted key, e.g. accuracy.word=0.8"""
+    key, value = assignment.split('=', 1)
+    target = params
+    *parents, leaf = key.split('.')
+    for parent in parents:
+        target = target[parent]
+    if leaf not in target:
+        raise KeyError(f"Unknown parameter: {key}")
+    target[leaf] = _parse_value(value)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate LangGames sessions to tune difficulty")
+    parser.add_argument('--sessions', type=int, default=100000, help="Sessions per parameter set")
+    parser.add_argument('--max-level', type=int, default=30, help="Level at which a session counts as finished")
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                        help="Override a parameter for every set (dotted keys for per-difficulty values)")
+    parser.add_argument('--grid', action='append', default=[], metavar='KEY=V1,V2',
+                        help="Try each listed value; several --grid options combine")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', metavar='PATH', help="Also write the full curves to a JSON file")
+    args = parser.parse_args()
+
+    if np is None:
+        print("✗ numpy is required (pip install numpy)")
+        raise SystemExit(1)
+
+    base = copy.deepcopy(DEFAULT_PARAMS)
+    for assignment in args.set:
+        _apply(base, assignment)
+
+    axes = []
+    for option in args.grid:
+        key, values = option.split('=', 1)
+        axes.append([f"{key}={value}" for value in values.split(',')])
+
+    vocabulary = load_vocabulary()
+    length = path_length()
+    shown = [level for level in (2, 3, 4, 5, 6, 8, 10, 15, 20, 25) if level <= args.max_level]
+    results = []
+
+    print(f"{'parameters':<40}" + ''.join(f"{'L' + str(level):>7}" for level in shown) + f"{'minutes':>9}{'secs':>7}")
+    for combination in itertools.product(*axes):
+        params = copy.deepcopy(base)
+        for assignment in combination:
+            _apply(params, assignment)
+
+        started = time.time()
+        result = simulate(params, args.sessions, args.max_level, vocabulary, length, args.seed)
+        elapsed = time.time() - started
+
+        label = ' '.join(combination) or 'defaults'
+        reach = ''.join(f"{result['reach'][level - 1]:>7.1%}" for level in shown)
+        print(f"{label:<40}{reach}{result['medianMinutes']:>9}{elapsed:>7.1f}")
+        results.append({'parameters': params, 'label': label, **result})
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"✓ Wrote {args.json}")
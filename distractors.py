@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Distractors for LangGames
+Precomputes "similar looking" wrong answers for every vocabulary item
+
+Candidates come from cosine similarity of hashed Kannada grapheme and
+grapheme-bigram counts, computed as blocked matrix products. The best
+candidates per item are then re-ranked with the English edit distance,
+computed for all pairs at once with Myers' bit-parallel algorithm on
+uint64 lanes. The top-k per item are stored in a small indexed file:
+
+    header   'LGDS1', version, item count, k, vocabulary fingerprint
+    indices  int32[items][k]   (-1 pads items with fewer distractors)
+    scores   float16[items][k]
+
+The server memory-maps the file and reads one row per request.
+
+Usage:
+    python distractors.py [--k 8] [--bench 20000]
+"""
+
+import mmap
+import os
+import struct
+import time
+import unicodedata
+import zlib
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from vocabulary import vocabulary_fingerprint
+
+FILE_MAGIC = b'LGDS1'
+FILE_VERSION = 1
+HEADER = struct.Struct('<5sBII16s')  # magic, version, item count, k, fingerprint
+FINGERPRINT_FIELDS = ('english', 'kannada')  # Distractors are computed from both
+
+FEATURE_BUCKETS = 256
+CANDIDATES = 32   # Kannada-similar candidates re-ranked by English distance
+BLOCK_ROWS = 512  # Rows of the similarity matrix computed at once
+KANNADA_WEIGHT = 0.7
+MAX_PATTERN = 64  # English is compared on its first 64 characters (one uint64 lane)
+
+
+def graphemes(text):
+    """Split text into grapheme clusters (consonant conjuncts keep their virama and signs)"""
+    clusters = []
+    joined = False  # Previous character was a virama, so the next consonant joins
+    for char in unicodedata.normalize('NFC', text):
+        if char.isspace():
+            joined = False
+            continue
+        if clusters and (joined or unicodedata.category(char).startswith('M')):
+            clusters[-1] += char
+        else:
+            clusters.append(char)
+        joined = char == '್'
+    return clusters
+
+
+def _bucket(token):
+    return zlib.crc32(token.encode('utf-8')) % FEATURE_BUCKETS
+
+
+def kannada_features(vocabulary):
+    """L2-normalized hashed grapheme and grapheme-bigram counts, one row per item"""
+    features = np.zeros((len(vocabulary), FEATURE_BUCKETS), dtype=np.float32)
+    for row, item in enumerate(vocabulary):
+        clusters = graphemes(item['kannada'])
+        for cluster in clusters:
+            features[row, _bucket(cluster)] += 1.0
+        for first, second in zip(clusters, clusters[1:]):
+            features[row, _bucket(first + '|' + second)] += 0.5
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return features / np.maximum(norms, 1e-9)
+
+
+def _encode_english(vocabulary):
+    """Per-item character codes and Myers match masks (Peq) over a folded alphabet"""
+    texts = [item['english'].lower()[:MAX_PATTERN] for item in vocabulary]
+    alphabet = {}
+    for text in texts:
+        for char in text:
+            alphabet.setdefault(char, len(alphabet))
+
+    lengths = np.array([len(text) for text in texts], dtype=np.int64)
+    codes = np.full((len(texts), max(1, lengths.max(initial=0))), len(alphabet), dtype=np.int64)
+    peq = np.zeros((len(texts), len(alphabet) + 1), dtype=np.uint64)
+    for row, text in enumerate(texts):
+        for position, char in enumerate(text):
+            code = alphabet[char]
+            codes[row, position] = code
+            peq[row, code] |= np.uint64(1 << position)
+    return codes, lengths, peq
+
+
+def edit_distances(rows, cols, codes, lengths, peq):
+    """
+    Levenshtein distance for many (pattern row, text col) pairs at once
+
+    Myers' bit-vector algorithm, run in lockstep across pairs: one uint64 per
+    pair holds the vertical deltas of its whole DP column.
+    """
+    one = np.uint64(1)
+    m = lengths[rows]
+    safe_m = np.maximum(m, 1).astype(np.uint64)
+    mask = np.where(m >= 64, np.uint64(0xFFFFFFFFFFFFFFFF), (one << safe_m) - one)
+    high = one << (safe_m - one)
+
+    pv = mask.copy()
+    mv = np.zeros_like(pv)
+    score = m.copy()
+    text_lengths = lengths[cols]
+
+    for position in range(codes.shape[1]):
+        active = position < text_lengths
+        if not active.any():
+            break
+        eq = peq[rows, codes[cols, position]]
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        delta = ((ph & high) != 0).astype(np.int64) - ((mh & high) != 0).astype(np.int64)
+        ph = ((ph << one) | one) & mask
+        mh = (mh << one) & mask
+        new_pv = (mh | ~(xv | ph)) & mask
+        new_mv = ph & xv
+
+        score = np.where(active, score + delta, score)
+        pv = np.where(active, new_pv, pv)
+        mv = np.where(active, new_mv, mv)
+
+    # Empty patterns: the distance is the text length
+    return np.where(m == 0, text_lengths, score)
+
+
+def compute_distractors(vocabulary, k=8, candidates=CANDIDATES):
+    """
+    Top-k distractors for every item
+
+    Returns:
+        tuple: (indices int32[n][k], scores float32[n][k]); -1 marks missing entries
+    """
+    n = len(vocabulary)
+    k = min(k, max(n - 1, 0))
+    indices = np.full((n, k), -1, dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if n < 2 or k == 0:
+        return indices, scores
+
+    features = kannada_features(vocabulary)
+    codes, lengths, peq = _encode_english(vocabulary)
+    kannada = np.array([unicodedata.normalize('NFC', item['kannada']) for item in vocabulary], dtype=object)
+    english = np.array([item['english'].lower() for item in vocabulary], dtype=object)
+    candidates = min(candidates, n - 1)
+
+    for start in range(0, n, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, n)
+        block = features[start:stop] @ features.T
+        block[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+
+        # Best Kannada candidates per row, unordered
+        top = np.argpartition(-block, candidates - 1, axis=1)[:, :candidates]
+        rows = np.repeat(np.arange(start, stop), candidates)
+        cols = top.ravel()
+        visual = block[rows - start, cols]
+
+        distance = edit_distances(rows, cols, codes, lengths, peq)
+        longest = np.maximum(np.maximum(lengths[rows], lengths[cols]), 1)
+        spelling = 1.0 - distance / longest
+        combined = KANNADA_WEIGHT * visual + (1 - KANNADA_WEIGHT) * spelling
+
+        # Another item with the same answer isn't a wrong answer
+        same = (kannada[rows] == kannada[cols]) | (english[rows] == english[cols])
+        combined = np.where(same, -np.inf, combined).reshape(stop - start, candidates)
+
+        order = np.argsort(-combined, axis=1)[:, :k]
+        best = np.take_along_axis(combined, order, axis=1)
+        chosen = np.take_along_axis(top, order, axis=1)
+        valid = np.isfinite(best)
+        indices[start:stop] = np.where(valid, chosen, -1)
+        scores[start:stop] = np.where(valid, best, 0)
+
+    return indices, scores
+
+
+def write_distractors(path, vocabulary, indices, scores):
+    """Write the table atomically"""
+    n, k = indices.shape
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(FILE_MAGIC, FILE_VERSION, n, k, vocabulary_fingerprint(vocabulary, FINGERPRINT_FIELDS)))
+        f.write(indices.astype('<i4').tobytes())
+        f.write(scores.astype('<f2').tobytes())
+    os.replace(tmp_path, path)
+
+
+class DistractorTable:
+    """Read-only, memory-mapped view of a distractor file"""
+
+    def __init__(self, path, vocabulary, k_wanted=None):
+        """
+        Args:
+            k_wanted (int): Distractors per item the file must have been built with (None = any)
+
+        Raises:
+            ValueError: If the file is not a distractor table for this vocabulary (and k)
+        """
+        self.vocabulary = vocabulary
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < HEADER.size:
+            raise ValueError('Distractor file is truncated')
+        magic, version, n, k, fingerprint = HEADER.unpack_from(self._mmap)
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            raise ValueError('Unknown distractor file format')
+        if n != len(vocabulary) or fingerprint != vocabulary_fingerprint(vocabulary, FINGERPRINT_FIELDS):
+            raise ValueError('Distractor file was built for another vocabulary')
+        if k_wanted is not None and k != min(k_wanted, max(n - 1, 0)):
+            raise ValueError(f'Distractor file keeps {k} per item, not {k_wanted}')
+        if len(self._mmap) != HEADER.size + n * k * 6:
+            raise ValueError('Distractor file is truncated')
+
+        self.k = k
+        self._ids = {}
+        for item in vocabulary:
+            self._ids.setdefault(item['english'], item['id'])
+        self._indices = np.frombuffer(self._mmap, dtype='<i4', count=n * k, offset=HEADER.size).reshape(n, k)
+        self._scores = np.frombuffer(self._mmap, dtype='<f2', count=n * k,
+                                     offset=HEADER.size + n * k * 4).reshape(n, k)
+
+    def item_id(self, english):
+        """Id of the item with this English text, or -1"""
+        return self._ids.get(english, -1)
+
+    def lookup(self, item_id, limit=None):
+        """
+        Distractors for an item, best first
+
+        Returns:
+            list: Dicts with id, english, kannada and score
+        """
+        results = []
+        for index, score in zip(self._indices[item_id][:limit], self._scores[item_id][:limit]):
+            if index < 0:
+                break
+            item = self.vocabulary[index]
+            results.append({
+                'id': int(index),
+                'english': item['english'],
+                'kannada': item['kannada'],
+                'score': round(float(score), 3),
+            })
+        return results
+
+
+def load_distractors(path, vocabulary, k=8):
+    """
+    Open the distractor table, rebuilding it first if missing or stale
+
+    Returns:
+        DistractorTable: Table for this vocabulary
+    """
+    if np is None:
+        raise RuntimeError('numpy is not installed')
+
+    try:
+        return DistractorTable(path, vocabulary, k)
+    except (OSError, ValueError):
+        pass
+
+    started = time.time()
+    indices, scores = compute_distractors(vocabulary, k)
+    write_distractors(path, vocabulary, indices, scores)
+    print(f"✓ Distractors computed for {len(vocabulary)} items in {time.time() - started:.2f}s")
+    return DistractorTable(path, vocabulary)
+
+
+def _synthetic_vocabulary(count, seed=7):
+    """Random Kannada/English pairs for benchmarking"""
+    rng = np.random.default_rng(seed)
+    consonants = [chr(code) for code in range(0x0C95, 0x0CB9) if unicodedata.category(chr(code)) == 'Lo']
+    signs = ['', 'ಾ', 'ಿ', 'ು', 'ೆ', 'ೋ', '್']
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    items = []
+    for index in range(count):
+        kannada = ''.join(consonants[rng.integers(len(consonants))] + signs[rng.integers(len(signs))]
+                          for _ in range(rng.integers(2, 8)))
+        english = ''.join(letters[rng.integers(26)] for _ in range(rng.integers(3, 24)))
+        items.append({'id': index, 'english': english, 'kannada': kannada, 'category': 'words'})
+    return items
+
+
+if __name__ == "__main__":
+    import argparse
+    from vocabulary import load_vocabulary
+
+    parser = argparse.ArgumentParser(description="Precompute distractors for the vocabulary")
+    parser.add_argument('--k', type=int, default=8, help="Distractors kept per item")
+    parser.add_argument('--output', default='distractors.bin', help="Distractor file to write")
+    parser.add_argument('--bench', type=int, metavar='N', help="Time the computation on N synthetic items instead")
+    args = parser.parse_args()
+
+    if np is None:
+        print("✗ numpy is required (pip install numpy)")
+        raise SystemExit(1)
+
+    if args.bench:
+        vocabulary = _synthetic_vocabulary(args.bench)
+        started = time.time()
+        compute_distractors(vocabulary, args.k)
+        print(f"✓ {args.bench} items: {time.time() - started:.2f}s")
+        raise SystemExit(0)
+
+    vocabulary = load_vocabulary()
+    started = time.time()
+    indices, scores = compute_distractors(vocabulary, args.k)
+    write_distractors(args.output, vocabulary, indices, scores)
+    print(f"✓ Wrote {args.output} ({os.path.getsize(args.output)} bytes) in {time.time() - started:.2f}s")
+
+    table = DistractorTable(args.output, vocabulary)
+    for item in vocabulary[::10]:
+        names = ', '.join(d['kannada'] for d in table.lookup(item['id'], 3))
+        print(f"  {item['kannada']} ({item['english']}): {names}")
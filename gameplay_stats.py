@@ -0,0 +1,324 @@
+"""
+Gameplay Stats for LangGames
+Batched match/miss event ingestion and per-vocabulary-item difficulty counters
+
+Events are counted into one array per event kind, indexed by vocabulary
+item id, and appended to a compact binary log (9 bytes per event) that is
+replayed at startup. The log is written in buffered chunks, never once per
+event. The log header carries a fingerprint of the vocabulary so a changed
+word list starts a fresh log instead of miscounting old item ids.
+
+Once the log passes checkpoint_bytes, the counters are written to a
+snapshot next to it (<log>.counts) and the log starts over, so startup
+replays only the events since the last checkpoint. Snapshot and log carry
+a generation number; a log older than the snapshot (a crash between the
+two writes) is already counted and is not replayed.
+
+Several server processes may share one log. Appends and checkpoints hold
+an exclusive lock on <log>.lock, and a checkpoint folds the log on disk
+into the snapshot on disk rather than writing one process's counters.
+The counters in memory cover what was on disk at startup plus what this
+process has ingested since.
+"""
+
+import os
+import struct
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+
+# Cross-process log locking needs fcntl (not on Windows, where one process is assumed)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from vocabulary import categories_for_level, vocabulary_fingerprint
+
+LOG_MAGIC = b'LGEV2'
+LEGACY_LOG_MAGIC = b'LGEV1'  # No generation; read as generation 0
+GENERATION = struct.Struct('<I')
+LOG_HEADER_SIZE = len(LOG_MAGIC) + 16 + GENERATION.size
+RECORD = struct.Struct('<IHHB')  # unix time, item id, level, kind
+
+SNAPSHOT_MAGIC = b'LGEC1'
+SNAPSHOT_HEADER = struct.Struct('<II')  # generation, item count
+
+EVENT_KINDS = ('match', 'wrong', 'miss')
+KIND_IDS = {kind: index for index, kind in enumerate(EVENT_KINDS)}
+
+
+class GameplayStats:
+    """Per-item match, wrong and miss counters backed by an append-only event log"""
+
+    def __init__(self, vocabulary, log_path=None, cache_ttl=30, flush_bytes=64 * 1024, flush_interval=5,
+                 checkpoint_bytes=1024 * 1024):
+        """
+        Args:
+            vocabulary (list): Items from vocabulary.load_vocabulary()
+            log_path (str): Event log file, or None to keep counters in memory only
+            cache_ttl (float): Seconds a hardest-items ranking is reused
+            flush_bytes (int): Buffered log bytes that force a write
+            flush_interval (float): Seconds after which buffered events are written
+            checkpoint_bytes (int): Log size after which counters are snapshotted and the log restarted
+        """
+        self.vocabulary = vocabulary
+        self.log_path = log_path
+        self.snapshot_path = log_path + '.counts' if log_path else None
+        self.cache_ttl = cache_ttl
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.checkpoint_bytes = checkpoint_bytes
+
+        self._ids = {}
+        for item in vocabulary:
+            self._ids.setdefault(item['english'], item['id'])
+        self._counts = [array('Q', bytes(8 * len(vocabulary))) for _ in EVENT_KINDS]
+        self._fingerprint = vocabulary_fingerprint(vocabulary)
+
+        self._pending = bytearray()
+        self._last_flush = time.monotonic()
+        self._generation = 0
+        self._log_size = 0  # Record bytes in the log since its header
+        self._cache = {}  # {(categories, limit): (expires, ranking)}
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+
+        self.load()
+
+    def ingest(self, events):
+        """
+        Count a batch of events
+
+        Args:
+            events (list): Dicts with type ('match', 'wrong' or 'miss'),
+                           english (item text) and level
+
+        Returns:
+            tuple: (accepted, rejected) event counts
+        """
+        now = int(time.time())
+        accepted = 0
+        with self._lock:
+            for event in events:
+                if not isinstance(event, dict):
+                    continue
+                kind = KIND_IDS.get(event.get('type'))
+                item_id = self._ids.get(event.get('english'))
+                level = event.get('level')
+                if kind is None or item_id is None or isinstance(level, bool) or not isinstance(level, int):
+                    continue
+
+                self._counts[kind][item_id] += 1
+                self._pending += RECORD.pack(now, item_id, min(max(level, 0), 0xFFFF), kind)
+                accepted += 1
+
+            due = (len(self._pending) >= self.flush_bytes or
+                   time.monotonic() - self._last_flush >= self.flush_interval)
+
+        if due:
+            self.flush()
+        return accepted, len(events) - accepted
+
+    def flush(self):
+        """Append buffered events to the log, and checkpoint once the log is large"""
+        with self._log_lock:
+            with self._lock:
+                pending, self._pending = self._pending, bytearray()
+                self._last_flush = time.monotonic()
+            if not pending or not self.log_path:
+                return
+
+            try:
+                with self._locked_log():
+                    with open(self.log_path, 'ab') as f:
+                        if f.tell() == 0:
+                            f.write(self._log_header())
+                        f.write(pending)
+                        # The file's size, so appends from other processes count too
+                        self._log_size = f.tell() - LOG_HEADER_SIZE
+                    if self._log_size >= self.checkpoint_bytes:
+                        self._checkpoint()
+            except OSError as e:
+                print(f"✗ Gameplay log write failed: {e}")
+
+    @contextmanager
+    def _locked_log(self):
+        """Hold the cross-process lock on the log and snapshot"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.log_path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _log_header(self):
+        return LOG_MAGIC + self._fingerprint + GENERATION.pack(self._generation)
+
+    def _checkpoint(self):
+        """Fold the log into the snapshot, then restart the log under the next generation"""
+        counts = [array('Q', bytes(8 * len(self.vocabulary))) for _ in EVENT_KINDS]
+        generation = self._load_snapshot(counts)
+        log = self._read_log()
+        if log and log[0] >= generation:
+            generation = log[0]
+            self._replay(log[1], counts)
+
+        generation += 1
+        _write_atomically(self.snapshot_path, SNAPSHOT_MAGIC + self._fingerprint +
+                          SNAPSHOT_HEADER.pack(generation, len(self.vocabulary)) +
+                          b''.join(bytes(counter) for counter in counts))
+        self._generation = generation
+        _write_atomically(self.log_path, self._log_header())
+        self._log_size = 0
+
+    def _load_snapshot(self, counts):
+        """Read the last checkpoint into counts; returns its generation (0 if none)"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return 0
+
+        with open(self.snapshot_path, 'rb') as f:
+            data = f.read()
+        prefix = SNAPSHOT_MAGIC + self._fingerprint
+        size = len(self.vocabulary)
+        if not data.startswith(prefix) or len(data) != len(prefix) + SNAPSHOT_HEADER.size + 8 * size * len(EVENT_KINDS):
+            # Another word list, or a damaged file; the log alone is all that can be trusted
+            os.replace(self.snapshot_path, self.snapshot_path + '.old')
+            print(f"ℹ Gameplay counts snapshot not usable ({self.snapshot_path}.old kept)")
+            return 0
+
+        generation, _ = SNAPSHOT_HEADER.unpack_from(data, len(prefix))
+        offset = len(prefix) + SNAPSHOT_HEADER.size
+        for counter in counts:
+            counter[:] = array('Q', data[offset:offset + 8 * size])
+            offset += 8 * size
+        return generation
+
+    def _read_log(self):
+        """
+        Read the event log
+
+        Returns:
+            tuple: (generation, whole records, legacy header) or None if there is no log;
+                   a log for another word list is moved aside and also gives None
+        """
+        if not os.path.exists(self.log_path):
+            return None
+
+        with open(self.log_path, 'rb') as f:
+            header = f.read(LOG_HEADER_SIZE)
+            if header[:len(LOG_MAGIC) + 16] == LOG_MAGIC + self._fingerprint:
+                generation = GENERATION.unpack_from(header, len(LOG_MAGIC) + 16)[0]
+                legacy = False
+            elif header[:len(LEGACY_LOG_MAGIC) + 16] == LEGACY_LOG_MAGIC + self._fingerprint:
+                generation = 0
+                legacy = True
+                f.seek(len(LEGACY_LOG_MAGIC) + 16)
+            else:
+                # Records refer to item ids of another word list; keep them aside
+                f.close()
+                os.replace(self.log_path, self.log_path + '.old')
+                print(f"ℹ Vocabulary changed, started a new gameplay log ({self.log_path}.old kept)")
+                return None
+            body = f.read()
+
+        # A torn final record from a crash is dropped
+        torn = len(body) % RECORD.size
+        if torn:
+            body = body[:len(body) - torn]
+        return generation, body, legacy or bool(torn)
+
+    def _replay(self, body, counts):
+        """Add logged events to counts; returns how many were counted"""
+        size = len(self.vocabulary)
+        replayed = 0
+        for _, item_id, _, kind in RECORD.iter_unpack(body):
+            if item_id < size and kind < len(EVENT_KINDS):
+                counts[kind][item_id] += 1
+                replayed += 1
+        return replayed
+
+    def load(self):
+        """Rebuild the counters from the last checkpoint and the event log after it"""
+        if not self.log_path:
+            return
+
+        with self._locked_log():
+            self._generation = self._load_snapshot(self._counts)
+            log = self._read_log()
+            if log is None:
+                return
+            log_generation, body, rewrite = log
+
+            if log_generation < self._generation:
+                # Crashed between writing the snapshot and restarting the log: already counted
+                _write_atomically(self.log_path, self._log_header())
+                print("✓ Gameplay counters restored from checkpoint")
+                return
+            self._generation = log_generation
+
+            self._log_size = len(body)
+            if rewrite:
+                # Rewritten so later appends line up (and carry a generation)
+                _write_atomically(self.log_path, self._log_header() + body)
+            replayed = self._replay(body, self._counts)
+        print(f"✓ Replayed {replayed} gameplay events")
+
+    def item_stats(self, item_id):
+        """Counters for one item"""
+        with self._lock:
+            return {kind: self._counts[index][item_id] for index, kind in enumerate(EVENT_KINDS)}
+
+    def hardest(self, level, limit=10):
+        """
+        Items with the highest error rate among those the game shows at a level
+
+        The error rate is (wrong + missed + 1) / (attempts + 2), which keeps
+        items with only a couple of attempts from topping the list.
+
+        Returns:
+            list: Dicts with english, kannada, category, attempts, errors and errorRate
+        """
+        categories = categories_for_level(level)
+        key = (categories, limit)
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        matches, wrong, missed = self._counts
+        ranked = []
+        with self._lock:
+            for item in self.vocabulary:
+                if item['category'] not in categories:
+                    continue
+                item_id = item['id']
+                errors = wrong[item_id] + missed[item_id]
+                attempts = matches[item_id] + errors
+                if attempts:
+                    ranked.append(((errors + 1) / (attempts + 2), attempts, errors, item))
+
+        ranked.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
+        ranking = [{
+            'english': item['english'],
+            'kannada': item['kannada'],
+            'category': item['category'],
+            'attempts': attempts,
+            'errors': errors,
+            'errorRate': round(rate, 4),
+        } for rate, attempts, errors, item in ranked[:limit]]
+
+        self._cache[key] = (time.monotonic() + self.cache_ttl, ranking)
+        return ranking
+
+
+def _write_atomically(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,137 @@
+"""
+Hedged Reads for LangGames
+Cuts tail latency of backend reads by racing a second request against a slow first one
+
+A read runs on a worker thread. If it hasn't answered within the recent
+p95 latency of reads, a hedge (the same read again, or another source) is
+started and whichever answers first is used (a fixed cold_delay stands in
+for the p95 until enough reads were seen). Only slow reads are hedged,
+so about 5% of reads are, and a token budget caps hedges at a fixed share
+of reads so a slow backend never sees its load doubled.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class LatencyWindow:
+    """Latencies of the most recent reads, with a cached percentile"""
+
+    def __init__(self, size=512, percentile=95, refresh_every=16):
+        """
+        Args:
+            size (int): Samples kept
+            percentile (float): Percentile reported by threshold()
+            refresh_every (int): New samples between percentile recomputations
+        """
+        self.percentile = percentile
+        self.refresh_every = refresh_every
+        self._samples = deque(maxlen=size)
+        self._since_refresh = 0
+        self._value = None
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+            self._since_refresh += 1
+
+    def threshold(self, min_samples=20):
+        """Current percentile in seconds, or None until min_samples reads were seen"""
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            if self._value is None or self._since_refresh >= self.refresh_every:
+                ordered = sorted(self._samples)
+                self._value = ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))]
+                self._since_refresh = 0
+            return self._value
+
+
+class HedgedReader:
+    """Runs reads with a budgeted hedge after an adaptive delay"""
+
+    def __init__(self, max_workers=16, budget=0.05, burst=10, min_delay=0.02, percentile=95, cold_delay=1.0):
+        """
+        Args:
+            max_workers (int): Threads running reads and hedges
+            budget (float): Hedges allowed per read, on average
+            burst (float): Hedges allowed back to back when the budget is full
+            min_delay (float): Shortest wait (seconds) before hedging
+            percentile (float): Latency percentile after which a read is hedged
+            cold_delay (float): Wait before hedging while too few reads were seen for a percentile
+        """
+        self.budget = budget
+        self.burst = burst
+        self.min_delay = min_delay
+        self.cold_delay = cold_delay
+        self.latency = LatencyWindow(percentile=percentile)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedged-read')
+        self._tokens = burst
+        self._lock = threading.Lock()
+        self._stats = {'reads': 0, 'hedged': 0, 'hedgeWins': 0, 'budgetDenied': 0}
+
+    def _run(self, read):
+        started = time.monotonic()
+        try:
+            return read()
+        finally:
+            self.latency.observe(time.monotonic() - started)
+
+    def _take_token(self):
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self._stats['hedged'] += 1
+                return True
+            self._stats['budgetDenied'] += 1
+            return False
+
+    def read(self, primary, hedge=None):
+        """
+        Run primary, hedging it with hedge (default: primary again) if it is slow
+
+        Args:
+            primary (callable): Performs the read and returns its result
+            hedge (callable): Alternative read with the same result
+
+        Returns:
+            The result of whichever read succeeded first
+        """
+        with self._lock:
+            self._stats['reads'] += 1
+            self._tokens = min(self.burst, self._tokens + self.budget)
+
+        first = self._executor.submit(self._run, primary)
+        threshold = self.latency.threshold()
+        if threshold is None:
+            threshold = self.cold_delay  # No percentile yet; still don't wait on a stuck read forever
+
+        done, _ = wait([first], timeout=max(self.min_delay, threshold))
+        if done or not self._take_token():
+            return first.result()
+
+        second = self._executor.submit(self._run, hedge or primary)
+        pending = {first, second}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is second:
+                        with self._lock:
+                            self._stats['hedgeWins'] += 1
+                    return future.result()
+        # Both failed; report the original read's error
+        return first.result()
+
+    def stats(self):
+        """Hedge counters, rates and the current hedge delay"""
+        threshold = self.latency.threshold()
+        with self._lock:
+            stats = dict(self._stats)
+        stats['hedgeRate'] = round(stats['hedged'] / stats['reads'], 4) if stats['reads'] else 0.0
+        stats['winRate'] = round(stats['hedgeWins'] / stats['hedged'], 4) if stats['hedged'] else 0.0
+        stats['delayMs'] = None if threshold is None else round(max(self.min_delay, threshold) * 1000, 1)
+        return stats
@@ -28,7 +28,7 @@ def setup_venv():
 
         # Install dependencies
         print("Installing dependencies...")
-        requirements = ['pycryptodome', 'requests', 'supabase']
+        requirements = ['pycryptodome', 'requests', 'supabase', 'numpy']
         subprocess.run([venv_python, '-m', 'pip', 'install', '--quiet'] + requirements, check=True)
 
         # Re-execute script in venv
@@ -40,11 +40,14 @@ if __name__ == "__main__":
     setup_venv()
 
 import http.server
-import socketserver
 import webbrowser
 import time
 import threading
 import json
+import math
+import hmac
+import signal
+from datetime import datetime, timezone
 
 USE_PYNPUT = os.getenv('DISABLE_PYNPUT', '0') != '1'
 Controller = None
@@ -62,6 +65,54 @@ else:
     print("pynput disabled by DISABLE_PYNPUT=1; fullscreen auto-toggle disabled")
 
 from walkerauth_client import WalkerAuthClient
+from rate_limiter import RateLimiter, ConcurrencyLimiter
+import progress_codec
+from progress_events import ProgressBroker
+from asset_bundler import build_assets, is_hashed_asset
+from static_files import StaticFileMixin
+from pastebin_client import PastebinAdapter, create_pastebin_client, load_pastebin_credentials
+from paste_compactor import PasteCompactor
+from autosave_cadence import AutosaveCadence
+from profiler import SamplingProfiler, MemoryProfiler
+from tracing import Tracer, span, carry
+from vocabulary import load_vocabulary
+from gameplay_stats import GameplayStats
+from vocab_search import VocabularyIndex
+from distractors import load_distractors
+from request_body import read_body, BodyError
+from sharding import ShardedClient
+from hedged_reads import HedgedReader
+from write_queue import KeyedExecutor, QueueFull
+from usage_stats import UsageStats
+from progress_cache import ProgressCache
+from progress_versions import VersionIndex, progress_etag, etag_matches
+from warm_restart import save_state, restore_state
+from var import (
+    RATE_LIMIT_IP_RATE, RATE_LIMIT_IP_BURST,
+    RATE_LIMIT_USER_RATE, RATE_LIMIT_USER_BURST,
+    RATE_LIMIT_MAX_KEYS, BACKEND_MAX_CONCURRENCY, TRUST_FORWARDED_FOR, SAVE_QUEUE_MAX_PENDING,
+    SYNC_MAX_EVENTS,
+    SSE_HEARTBEAT_INTERVAL, SSE_QUEUE_SIZE, SSE_MAX_SUBSCRIBERS,
+    ASSET_BUNDLING,
+    PASTE_COMPACTION_INTERVAL, PASTE_COMPACTION_KEEP,
+    AUTO_SAVE_INTERVAL, AUTO_SAVE_MIN_INTERVAL, AUTO_SAVE_MAX_INTERVAL, AUTO_SAVE_TARGET_LATENCY,
+    ADMIN_TOKEN, PROFILE_MAX_SECONDS,
+    TRACE_SAMPLE_RATE, TRACE_EXPORT_DIR, TRACE_MAX_FILES,
+    GAMEPLAY_LOG_FILE, GAMEPLAY_MAX_EVENTS, GAMEPLAY_STATS_TTL,
+    DISTRACTORS_FILE, DISTRACTORS_K,
+    BODY_LIMIT_DEFAULT, BODY_LIMIT_SAVE, BODY_LIMIT_SYNC, BODY_LIMIT_GAMEPLAY, BODY_READ_TIMEOUT,
+    SHARDS_FILE, SHARD_VNODES,
+    HEDGED_READS, HEDGE_BUDGET, HEDGE_MIN_DELAY, HEDGE_PERCENTILE, HEDGE_COLD_DELAY,
+    PROGRESS_CACHE_MAX_ITEMS, PROGRESS_CACHE_TTL, STATE_SNAPSHOT_FILE, STATE_SNAPSHOT_MAX_AGE,
+    VERSION_INDEX_MAX_ITEMS, SHARED_CACHE_DIR, SHARED_CACHE_SLOT_SIZE, SHARED_SESSION_SLOTS,
+)
+
+# Shared cache needs fcntl (not on Windows)
+try:
+    from shared_cache import SharedTable, SharedProgressCache, SharedVersionIndex, SharedSessions
+    SHARED_CACHE_AVAILABLE = True
+except ImportError:
+    SHARED_CACHE_AVAILABLE = False
 
 # Import Supabase client
 try:
@@ -85,6 +136,49 @@ PORT = int(os.getenv('PORT', '2937'))
 WALKERAUTH_SECRET_KEY = "langgames_secret_key_12345"
 walkerauth_client = WalkerAuthClient(WALKERAUTH_SECRET_KEY)
 
+# Admission control for API routes
+ip_limiter = RateLimiter(RATE_LIMIT_IP_RATE, RATE_LIMIT_IP_BURST, RATE_LIMIT_MAX_KEYS)
+user_limiter = RateLimiter(RATE_LIMIT_USER_RATE, RATE_LIMIT_USER_BURST, RATE_LIMIT_MAX_KEYS)
+backend_limiter = ConcurrencyLimiter(BACKEND_MAX_CONCURRENCY)
+
+# Autosave interval handed to clients, stretched when the backend is slow or busy
+autosave_cadence = AutosaveCadence(AUTO_SAVE_INTERVAL, AUTO_SAVE_MIN_INTERVAL,
+                                   AUTO_SAVE_MAX_INTERVAL, AUTO_SAVE_TARGET_LATENCY)
+
+# Recently loaded or saved progress; loads are served from here when possible
+progress_cache = ProgressCache(PROGRESS_CACHE_MAX_ITEMS, PROGRESS_CACHE_TTL)
+
+# Current progress ETag per player, so conditional loads can skip the cache and storage
+version_index = VersionIndex(VERSION_INDEX_MAX_ITEMS, PROGRESS_CACHE_TTL)
+
+# Unique players, most active players and loads/saves per minute, in fixed memory
+usage_stats = UsageStats()
+
+# Saves run in order per user and in parallel across users
+save_queue = KeyedExecutor(BACKEND_MAX_CONCURRENCY, SAVE_QUEUE_MAX_PENDING)
+
+# Progress loads slower than the recent p95 are raced against a second read
+hedged_reader = HedgedReader(BACKEND_MAX_CONCURRENCY * 2, HEDGE_BUDGET, min_delay=HEDGE_MIN_DELAY,
+                             percentile=HEDGE_PERCENTILE, cold_delay=HEDGE_COLD_DELAY) if HEDGED_READS else None
+
+# Largest POST body accepted per route (prefix match, first hit wins)
+POST_BODY_LIMITS = [
+    ('/api/data/save', BODY_LIMIT_SAVE),
+    ('/api/sync', BODY_LIMIT_SYNC),
+    ('/api/gameplay/events', BODY_LIMIT_GAMEPLAY),
+    ('/api/admin/', 0),
+]
+
+# On-demand profiling (admin only, idle until requested)
+cpu_profiler = SamplingProfiler()
+memory_profiler = MemoryProfiler()
+
+# Request tracing (sampled requests are exported as Chrome trace-event JSON)
+tracer = Tracer(TRACE_SAMPLE_RATE, TRACE_EXPORT_DIR, TRACE_MAX_FILES)
+
+# Cross-device progress push (server-sent events)
+progress_broker = ProgressBroker(SSE_QUEUE_SIZE, SSE_MAX_SUBSCRIBERS)
+
 # Initialize Supabase client
 supabase_client: Client = None
 
@@ -108,11 +202,41 @@ def load_supabase_credentials():
 
     return supabase_url, supabase_key
 
+def init_pastebin():
+    """Use encrypted pastebin storage if it is configured (PASTEBIN_URL, SITE_ID, SECRET_KEY)"""
+    global supabase_client
+
+    pastebin_url, site_id, secret_key = load_pastebin_credentials()
+    if not (pastebin_url and site_id and secret_key):
+        return None
+
+    try:
+        supabase_client = create_pastebin_client(pastebin_url, site_id, secret_key)
+        print(f"✓ Encrypted pastebin connected: {pastebin_url}")
+        return supabase_client
+    except Exception as e:
+        print(f"✗ Pastebin setup failed: {e}")
+        return None
+
 def init_supabase():
-    """Initialize Supabase client"""
+    """Initialize Supabase client, falling back to encrypted pastebin storage"""
     global supabase_client
 
+    # A shard list replaces the single backend
+    if os.path.exists(SHARDS_FILE):
+        try:
+            supabase_client = ShardedClient.from_config(SHARDS_FILE, SHARD_VNODES)
+            print(f"✓ Storage sharded over {', '.join(supabase_client.ring.nodes)}")
+            if supabase_client.previous_ring:
+                print("ℹ New shards pending; run shard_rebalance.py to move their users")
+            return supabase_client
+        except Exception as e:
+            print(f"✗ Shard setup failed: {e}")
+            return None
+
     if not SUPABASE_AVAILABLE:
+        if init_pastebin():
+            return supabase_client
         print("✗ Supabase client not available")
         print("  Install with: pip install supabase")
         return None
@@ -130,6 +254,8 @@ def init_supabase():
             print(f"✗ Supabase connection failed: {e}")
             return None
     else:
+        if init_pastebin():
+            return supabase_client
         print("ℹ Supabase credentials not configured in .env")
         print("  Required: SUPABASE_URL, SUPABASE_KEY")
         print("  Get these from: https://app.supabase.com")
@@ -138,7 +264,205 @@ def init_supabase():
 # Initialize Supabase on startup
 init_supabase()
 
-class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+# Bundled pages {page: path under src/}, empty when serving unbundled files
+asset_pages = {}
+
+def init_assets():
+    """Build content-hashed asset bundles for the game pages"""
+    global asset_pages
+
+    if not ASSET_BUNDLING:
+        print("ℹ Asset bundling disabled (ASSET_BUNDLING=0)")
+        return
+
+    try:
+        asset_pages = build_assets()
+        print("✓ Asset bundles built in src/dist")
+    except Exception as e:
+        asset_pages = {}
+        print(f"✗ Asset bundling failed, serving unbundled files: {e}")
+
+# Vocabulary search index, distractor table and per-item match/miss counters,
+# None until the vocabulary is loaded
+vocab_index = None
+distractor_table = None
+gameplay_stats = None
+
+def init_vocabulary():
+    """Load the vocabulary, build its search index and replay the gameplay event log"""
+    global vocab_index, distractor_table, gameplay_stats
+
+    try:
+        vocabulary = load_vocabulary()
+    except Exception as e:
+        print(f"✗ Vocabulary not loaded, search and gameplay stats disabled: {e}")
+        return
+
+    vocab_index = VocabularyIndex(vocabulary)
+    print(f"✓ Search index built for {len(vocabulary)} vocabulary items")
+
+    try:
+        distractor_table = load_distractors(DISTRACTORS_FILE, vocabulary, DISTRACTORS_K)
+    except Exception as e:
+        distractor_table = None
+        print(f"ℹ Distractors disabled: {e}")
+
+    try:
+        gameplay_stats = GameplayStats(vocabulary, GAMEPLAY_LOG_FILE or None, GAMEPLAY_STATS_TTL)
+    except Exception as e:
+        gameplay_stats = None
+        print(f"✗ Gameplay stats disabled: {e}")
+
+def init_shared_cache():
+    """Move progress, ETags and sessions into shared memory so every server process on the host uses one copy"""
+    global progress_cache, version_index
+
+    if not SHARED_CACHE_DIR:
+        return False
+    if not SHARED_CACHE_AVAILABLE:
+        print("✗ Shared cache needs fcntl, keeping per-process caches")
+        return False
+
+    try:
+        os.makedirs(SHARED_CACHE_DIR, exist_ok=True)
+        tables = {
+            'progress': SharedTable(os.path.join(SHARED_CACHE_DIR, 'progress.cache'),
+                                    PROGRESS_CACHE_MAX_ITEMS, SHARED_CACHE_SLOT_SIZE)
+            if PROGRESS_CACHE_MAX_ITEMS > 0 else None,
+            'versions': SharedTable(os.path.join(SHARED_CACHE_DIR, 'versions.cache'), VERSION_INDEX_MAX_ITEMS, 128)
+            if VERSION_INDEX_MAX_ITEMS > 0 else None,
+            # Sessions are the only copy, so that table never evicts
+            'sessions': SharedTable(os.path.join(SHARED_CACHE_DIR, 'sessions.cache'), SHARED_SESSION_SLOTS, 1024,
+                                    evict=False),
+        }
+    except (OSError, ValueError) as e:
+        print(f"✗ Shared cache unavailable, keeping per-process caches: {e}")
+        return False
+
+    # A cache turned off (max items 0) stays the per-process one, which stores nothing
+    if tables['progress']:
+        progress_cache = SharedProgressCache(tables['progress'], PROGRESS_CACHE_TTL)
+    if tables['versions']:
+        version_index = SharedVersionIndex(tables['versions'], PROGRESS_CACHE_TTL)
+    walkerauth_client.sessions = SharedSessions(tables['sessions'])
+    print(f"✓ Shared cache in {SHARED_CACHE_DIR}")
+    return True
+
+def parse_timestamp(value):
+    """Parse an ISO-8601 timestamp into an aware datetime (epoch if missing or invalid)"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return datetime.min.replace(tzinfo=timezone.utc)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def progress_record(user_id, data):
+    """The progress fields stored for a save payload"""
+    return {
+        'user_id': user_id,
+        'level': data.get('level', 0),
+        'score': data.get('score', 0),
+        'highScore': data.get('highScore', 0),
+        'gamesPlayed': data.get('gamesPlayed', 0),
+        'stats': data.get('stats', {}),
+        'lastPlayed': data.get('lastPlayed', ''),
+    }
+
+def save_progress(user_id, data, only_if_newer=False):
+    """
+    Write a player's progress to Supabase
+
+    Args:
+        user_id (str): Player id
+        data (dict): Save payload from the client
+        only_if_newer (bool): Skip the write if the stored lastPlayed is newer
+
+    Returns:
+        bool: True if the record was written
+    """
+    # Prepare data for Supabase
+    supabase_data = dict(progress_record(user_id, data), updated_at='now()')
+
+    # Check if record exists
+    with span('supabase.select'):
+        existing = supabase_client.table('GIDbasedlv').select('id, lastPlayed').eq('user_id', user_id).execute()
+
+    if existing.data and len(existing.data) > 0:
+        stored_last_played = parse_timestamp(existing.data[0].get('lastPlayed'))
+        if only_if_newer and stored_last_played > parse_timestamp(supabase_data['lastPlayed']):
+            print(f"ℹ Skipped stale save for user: {user_id}")
+            return False
+
+        # Update existing record
+        with span('supabase.update'):
+            supabase_client.table('GIDbasedlv').update(supabase_data).eq('user_id', user_id).execute()
+        print(f"✓ Updated Supabase data for user: {user_id}")
+    else:
+        # Insert new record
+        with span('supabase.insert'):
+            supabase_client.table('GIDbasedlv').insert(supabase_data).execute()
+        print(f"✓ Inserted new Supabase data for user: {user_id}")
+
+    # Push the new state to the player's other open devices
+    event = {key: value for key, value in supabase_data.items() if key != 'updated_at'}
+    progress_cache.put(user_id, event)
+    version_index.put(user_id, progress_etag(event))
+    event['clientId'] = data.get('clientId')
+    progress_broker.publish(user_id, event)
+
+    return True
+
+def queue_save(user_id, data):
+    """
+    Queue a save behind the player's earlier ones
+
+    Saves older (by lastPlayed) than the stored record or than a save queued
+    after them are dropped.
+
+    Returns:
+        Future: True if the save was written
+
+    Raises:
+        QueueFull: If too many saves are already waiting for the player
+    """
+    usage_stats.record('save', user_id)
+
+    def timed_save():
+        started = time.monotonic()
+        try:
+            return save_progress(user_id, data, only_if_newer=True)
+        finally:
+            autosave_cadence.observe(time.monotonic() - started)
+
+    return save_queue.submit(user_id, carry(timed_save), order=parse_timestamp(data.get('lastPlayed')))
+
+def valid_save_event(event):
+    """Whether a queued save event has the shape merge_save_events relies on"""
+    if not isinstance(event, dict):
+        return False
+    if not isinstance(event.get('user_id', ''), (str, int)) or isinstance(event.get('user_id'), bool):
+        return False
+    if not isinstance(event.get('lastPlayed', ''), str):
+        return False
+    return all(isinstance(event.get(field, 0), (int, float)) and not isinstance(event.get(field), bool)
+               for field in ('highScore', 'gamesPlayed'))
+
+def merge_save_events(events):
+    """
+    Collapse a queue of save events for one user into its final state
+
+    Events are replayed in lastPlayed order so the newest one wins, while
+    counters that only ever grow keep their highest value.
+    """
+    ordered = sorted(events, key=lambda event: parse_timestamp(event.get('lastPlayed')))
+    merged = dict(ordered[-1])
+    merged['highScore'] = max(event.get('highScore', 0) for event in ordered)
+    merged['gamesPlayed'] = max(event.get('gamesPlayed', 0) for event in ordered)
+    return merged
+
+class CustomHTTPRequestHandler(StaticFileMixin, http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory="src", **kwargs)
 
@@ -146,11 +470,167 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         # Suppress default logging
         pass
 
+    def _send_json(self, status, payload, headers=None):
+        """Send a JSON response with optional extra headers"""
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(json.dumps(payload).encode())
+
+    def _send_progress(self, data, user_id=None):
+        """Send progress data as compact binary if the client accepts it, JSON otherwise"""
+        etag = progress_etag(data)
+        if user_id is not None:
+            version_index.put(user_id, etag)
+        if etag_matches(self.headers.get('If-None-Match'), etag):
+            self._send_not_modified(etag)
+            return
+
+        binary, zlib_ok = progress_codec.accepts_binary(self.headers.get('Accept'))
+        if binary:
+            body = progress_codec.encode(data, compress=zlib_ok)
+            content_type = progress_codec.CONTENT_TYPE
+        else:
+            body = json.dumps(data).encode()
+            content_type = 'application/json'
+
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Vary', 'Accept')
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_not_modified(self, etag):
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept')
+        self.end_headers()
+
+    def _stream_progress(self, user_id):
+        """Stream progress events for user_id until the client disconnects"""
+        subscriber = progress_broker.subscribe(user_id)
+        if subscriber is None:
+            self._send_json(503, {"error": "Too many event streams"}, {'Retry-After': '30'})
+            return
+
+        try:
+            self.send_response(200)
+            self.send_header('Content-type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('X-Accel-Buffering', 'no')
+            self.end_headers()
+            self.wfile.write(f"retry: {SSE_HEARTBEAT_INTERVAL * 1000}\n\n".encode())
+            self.wfile.flush()
+
+            while True:
+                event = subscriber.get(timeout=SSE_HEARTBEAT_INTERVAL)
+                if event is None:
+                    # Heartbeat comment keeps proxies from closing an idle stream
+                    self.wfile.write(b": heartbeat\n\n")
+                else:
+                    self.wfile.write(f"event: progress\ndata: {json.dumps(event)}\n\n".encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            pass
+        finally:
+            progress_broker.unsubscribe(subscriber)
+            self.close_connection = True
+
+    def _client_ip(self):
+        """Client address, honouring X-Forwarded-For only when configured"""
+        if TRUST_FORWARDED_FOR:
+            forwarded = self.headers.get('X-Forwarded-For')
+            if forwarded:
+                return forwarded.split(',')[0].strip()
+        return self.client_address[0]
+
+    def _admit(self, *user_ids):
+        """
+        Apply per-IP and per-user token buckets
+
+        The IP bucket is charged once per request, however many users it covers.
+
+        Returns:
+            bool: True if the request may proceed, False if a 429 was sent
+        """
+        retry_after = ip_limiter.acquire(self._client_ip())
+        for user_id in user_ids:
+            if retry_after:
+                break
+            if user_id:
+                retry_after = user_limiter.acquire(user_id)
+
+        if retry_after:
+            self._send_json(429, {"success": False, "error": "Too many requests"},
+                            {'Retry-After': str(max(1, math.ceil(retry_after)))})
+            return False
+        return True
+
+    def _require_admin(self):
+        """
+        Check the X-Admin-Token header against ADMIN_TOKEN
+
+        Returns:
+            bool: True if the request may proceed; otherwise 404 (admin disabled) or 403 was sent
+        """
+        if not ADMIN_TOKEN:
+            self._send_json(404, {"error": "Not found"})
+            return False
+        if not hmac.compare_digest(self.headers.get('X-Admin-Token', '').encode(), ADMIN_TOKEN.encode()):
+            self._send_json(403, {"error": "Forbidden"})
+            return False
+        return True
+
+    def _next_save_ms(self):
+        """Autosave interval to recommend to the client right now"""
+        return autosave_cadence.recommend(backend_limiter.in_flight, BACKEND_MAX_CONCURRENCY)
+
+    def _reject_busy(self):
+        """Send 503 when the backend concurrency limit is reached"""
+        self._send_json(503, {"success": False, "error": "Server busy"}, {'Retry-After': '1'})
+
+    def _traced_request(self, handler):
+        """Run a request handler under a trace if it is an API or auth request"""
+        if not self.path.startswith(('/api/', '/oauth/')):
+            handler()
+            return
+
+        self._trace_id = tracer.begin(f"{self.command} {self.path.split('?', 1)[0]}",
+                                      self.headers.get('X-Trace-Id'))
+        try:
+            handler()
+        finally:
+            tracer.end()
+            self._trace_id = None
+
+    def send_response(self, code, message=None):
+        self._response_status = code
+        super().send_response(code, message)
+
     def end_headers(self):
+        # Hashed bundles never change; pages must revalidate to pick up new hashes.
+        # A missing bundle (deploy race) must not be cached for a year
+        if is_hashed_asset(self.path) and getattr(self, '_response_status', None) in (200, 206):
+            self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+        elif self.path.endswith('.html'):
+            self.send_header('Cache-Control', 'no-cache')
+
         # Add CORS headers
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, X-Trace-Id, If-None-Match')
+        if getattr(self, '_trace_id', None):
+            self.send_header('X-Trace-Id', self._trace_id)
+            self.send_header('Access-Control-Expose-Headers', 'ETag, X-Trace-Id')
+        else:
+            self.send_header('Access-Control-Expose-Headers', 'ETag')
         super().end_headers()
 
     def do_OPTIONS(self):
@@ -158,6 +638,9 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         self.end_headers()
 
     def do_GET(self):
+        self._traced_request(self._do_GET)
+
+    def _do_GET(self):
         # Serve landing page at root
         if self.path == '/':
             self.path = '/landing.html'
@@ -165,8 +648,37 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         elif self.path == '/game':
             self.path = '/index.html'
 
+        # Serve the copy of a page that points at the asset bundles
+        if self.path.lstrip('/') in asset_pages:
+            self.path = '/' + asset_pages[self.path.lstrip('/')]
+
         # Handle API endpoints
         if self.path.startswith('/api/data/load'):
+            # Parse user_id from query params if available
+            from urllib.parse import urlparse, parse_qs
+            parsed_url = urlparse(self.path)
+            params = parse_qs(parsed_url.query)
+            user_id = params.get('user_id', ['default_user'])[0]
+
+            if not self._admit(user_id):
+                return
+            usage_stats.record('load', user_id)
+
+            # The client already has the current version: no cache or storage lookup needed
+            current = version_index.get(user_id)
+            if etag_matches(self.headers.get('If-None-Match'), current):
+                self._send_not_modified(current)
+                return
+
+            cached = progress_cache.get(user_id)
+            if cached is not None:
+                self._send_progress(cached, user_id)
+                return
+
+            if not backend_limiter.try_acquire():
+                self._reject_busy()
+                return
+
             # Load data from Supabase only
             try:
                 if not supabase_client:
@@ -176,33 +688,151 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
                     self.wfile.write(json.dumps({"error": "Database not configured"}).encode())
                     return
 
-                # Parse user_id from query params if available
-                from urllib.parse import urlparse, parse_qs
-                parsed_url = urlparse(self.path)
-                params = parse_qs(parsed_url.query)
-                user_id = params.get('user_id', ['default_user'])[0]
-
                 # Query Supabase
-                result = supabase_client.table('GIDbasedlv').select('*').eq('user_id', user_id).order('updated_at', desc=True).limit(1).execute()
+                def read_progress():
+                    return supabase_client.table('GIDbasedlv').select('*').eq('user_id', user_id).order('updated_at', desc=True).limit(1).execute()
+
+                started = time.monotonic()
+                with span('supabase.select', hedged=hedged_reader is not None):
+                    # carry() keeps spans from the hedge pool's threads in this request's trace
+                    result = hedged_reader.read(carry(read_progress)) if hedged_reader else read_progress()
+                autosave_cadence.observe(time.monotonic() - started)
 
                 if result.data and len(result.data) > 0:
                     # Use the most recent save
                     data = result.data[0]
+                    progress_cache.put(user_id, data)
                     print(f"✓ Loaded data from Supabase for user: {user_id}")
                 else:
                     print(f"ℹ No data found for user: {user_id}")
                     data = {}
 
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(data).encode())
+                self._send_progress(data, user_id)
             except Exception as e:
                 print(f"✗ Supabase load error: {e}")
                 self.send_response(500)
                 self.send_header('Content-type', 'application/json')
                 self.end_headers()
                 self.wfile.write(json.dumps({"error": str(e)}).encode())
+            finally:
+                backend_limiter.release()
+            return
+
+        elif self.path.startswith('/api/events'):
+            from urllib.parse import urlparse, parse_qs
+            params = parse_qs(urlparse(self.path).query)
+            user_id = params.get('user_id', ['default_user'])[0]
+
+            if not self._admit(user_id):
+                return
+            self._stream_progress(user_id)
+            return
+
+        elif self.path.startswith('/api/admin/stats'):
+            if not self._require_admin():
+                return
+            self._send_json(200, usage_stats.snapshot())
+            return
+
+        elif self.path.startswith('/api/admin/hedging'):
+            if not self._require_admin():
+                return
+            if not hedged_reader:
+                self._send_json(404, {"error": "Hedged reads are off (HEDGED_READS=1)"})
+                return
+            self._send_json(200, hedged_reader.stats())
+            return
+
+        elif self.path.startswith('/api/admin/profile/memory/diff'):
+            from urllib.parse import urlparse, parse_qs
+            params = parse_qs(urlparse(self.path).query)
+
+            if not self._require_admin():
+                return
+            try:
+                first = int(params.get('from', [0])[0])
+                second = int(params.get('to', [0])[0])
+                limit = int(params.get('limit', [25])[0])
+            except ValueError:
+                self._send_json(400, {"error": "from, to and limit must be integers"})
+                return
+
+            sites = memory_profiler.diff(first, second, limit)
+            if sites is None:
+                self._send_json(404, {"error": "Unknown snapshot"})
+                return
+            self._send_json(200, {"from": first, "to": second, "sites": sites})
+            return
+
+        elif self.path.startswith('/api/vocab/search'):
+            from urllib.parse import urlparse, parse_qs
+            params = parse_qs(urlparse(self.path).query)
+
+            if not self._admit():
+                return
+            if not vocab_index:
+                self._send_json(503, {"error": "Vocabulary search not available"})
+                return
+            query = params.get('q', [''])[0][:100]
+            try:
+                limit = max(1, min(int(params.get('limit', [10])[0]), 50))
+            except ValueError:
+                self._send_json(400, {"error": "limit must be an integer"})
+                return
+
+            started = time.perf_counter()
+            results = vocab_index.search(query, limit) if query.strip() else []
+            self._send_json(200, {"query": query, "results": results,
+                                  "tookUs": round((time.perf_counter() - started) * 1e6)})
+            return
+
+        elif self.path.startswith('/api/vocab/distractors'):
+            from urllib.parse import urlparse, parse_qs
+            params = parse_qs(urlparse(self.path).query)
+
+            if not self._admit():
+                return
+            if not distractor_table:
+                self._send_json(503, {"error": "Distractors not available"})
+                return
+            try:
+                item_id = int(params.get('id', [-1])[0])
+                limit = max(1, min(int(params.get('limit', [DISTRACTORS_K])[0]), DISTRACTORS_K))
+            except ValueError:
+                self._send_json(400, {"error": "id and limit must be integers"})
+                return
+
+            vocabulary = distractor_table.vocabulary
+            if 'english' in params:
+                item_id = distractor_table.item_id(params['english'][0])
+            if not 0 <= item_id < len(vocabulary):
+                self._send_json(404, {"error": "Unknown vocabulary item"})
+                return
+
+            item = vocabulary[item_id]
+            self._send_json(200, {"id": item_id, "english": item['english'], "kannada": item['kannada'],
+                                  "distractors": distractor_table.lookup(item_id, limit)},
+                            {'Cache-Control': 'public, max-age=3600'})
+            return
+
+        elif self.path.startswith('/api/gameplay/hardest'):
+            from urllib.parse import urlparse, parse_qs
+            params = parse_qs(urlparse(self.path).query)
+
+            if not self._admit():
+                return
+            if not gameplay_stats:
+                self._send_json(503, {"error": "Gameplay stats not available"})
+                return
+            try:
+                level = int(params.get('level', [1])[0])
+                limit = max(1, min(int(params.get('limit', [10])[0]), 100))
+            except ValueError:
+                self._send_json(400, {"error": "level and limit must be integers"})
+                return
+
+            self._send_json(200, {"level": level, "items": gameplay_stats.hardest(level, limit)},
+                            {'Cache-Control': f'public, max-age={GAMEPLAY_STATS_TTL}'})
             return
 
         elif self.path.startswith('/auth/success'):
@@ -312,8 +942,20 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         super().do_GET()
 
     def do_POST(self):
-        content_length = int(self.headers.get('Content-Length', 0))
-        post_data = self.rfile.read(content_length) if content_length > 0 else b'{}'
+        self._traced_request(self._do_POST)
+
+    def _do_POST(self):
+        # The route decides how much body it accepts; oversized bodies are refused unread
+        limit = next((limit for prefix, limit in POST_BODY_LIMITS if self.path.startswith(prefix)),
+                     BODY_LIMIT_DEFAULT)
+        try:
+            with span('request.read', limit=limit):
+                post_data = read_body(self.rfile, self.headers, self.connection, limit, BODY_READ_TIMEOUT) or b'{}'
+        except BodyError as e:
+            # Whatever is left of the body is still on the socket, so it can't be reused
+            self.close_connection = True
+            self._send_json(e.status, {"success": False, "error": e.message})
+            return
 
         # Handle WalkerAuth OAuth callback
         if self.path == '/oauth/callback':
@@ -358,7 +1000,18 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         # Handle save data request
         if self.path.startswith('/api/data/save'):
             try:
-                data = json.loads(post_data.decode())
+                if progress_codec.is_binary_content_type(self.headers.get('Content-Type')):
+                    with span('codec.decode', bytes=len(post_data)):
+                        data = progress_codec.decode(post_data)
+                else:
+                    with span('json.parse', bytes=len(post_data)):
+                        data = json.loads(post_data.decode())
+
+                # Get user_id from data or use default
+                user_id = data.get('user_id', 'default_user')
+
+                if not self._admit(user_id):
+                    return
 
                 # Save to database (encrypted pastebin)
                 if not supabase_client:
@@ -368,37 +1021,22 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
                     self.wfile.write(json.dumps({"success": False, "error": "Database not configured"}).encode())
                     return
 
-                # Get user_id from data or use default
-                user_id = data.get('user_id', 'default_user')
-
-                # Prepare data for Supabase
-                supabase_data = {
-                    'user_id': user_id,
-                    'level': data.get('level', 0),
-                    'score': data.get('score', 0),
-                    'highScore': data.get('highScore', 0),
-                    'gamesPlayed': data.get('gamesPlayed', 0),
-                    'stats': data.get('stats', {}),
-                    'lastPlayed': data.get('lastPlayed', ''),
-                    'updated_at': 'now()'
-                }
-
-                # Check if record exists
-                existing = supabase_client.table('GIDbasedlv').select('id').eq('user_id', user_id).execute()
-
-                if existing.data and len(existing.data) > 0:
-                    # Update existing record
-                    result = supabase_client.table('GIDbasedlv').update(supabase_data).eq('user_id', user_id).execute()
-                    print(f"✓ Updated Supabase data for user: {user_id}")
-                else:
-                    # Insert new record
-                    result = supabase_client.table('GIDbasedlv').insert(supabase_data).execute()
-                    print(f"✓ Inserted new Supabase data for user: {user_id}")
+                if not backend_limiter.try_acquire():
+                    self._reject_busy()
+                    return
 
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"success": True}).encode())
+                try:
+                    written = queue_save(user_id, data).result()
+                finally:
+                    backend_limiter.release()
+
+                # The ETag lets the client answer its next load from its own copy
+                etag = progress_etag(progress_record(user_id, data)) if written else None
+                self._send_json(200, {"success": True, "etag": etag, "nextSaveMs": self._next_save_ms()})
+            except QueueFull:
+                self._reject_busy()
+            except progress_codec.CodecError as e:
+                self._send_json(400, {"success": False, "error": str(e)})
             except Exception as e:
                 print(f"✗ Supabase save error: {e}")
                 self.send_response(500)
@@ -407,6 +1045,134 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
                 self.wfile.write(json.dumps({"success": False, "error": str(e)}).encode())
             return
 
+        # Admin: sample CPU stacks for a few seconds and return them collapsed
+        if self.path.startswith('/api/admin/profile/cpu'):
+            from urllib.parse import urlparse, parse_qs
+            params = parse_qs(urlparse(self.path).query)
+
+            if not self._require_admin():
+                return
+            try:
+                seconds = min(float(params.get('seconds', [10])[0]), PROFILE_MAX_SECONDS)
+                interval = float(params.get('interval_ms', [5])[0]) / 1000
+            except ValueError:
+                self._send_json(400, {"error": "seconds and interval_ms must be numbers"})
+                return
+            if seconds <= 0 or interval <= 0:
+                self._send_json(400, {"error": "seconds and interval_ms must be positive"})
+                return
+
+            print(f"ℹ CPU profiling for {seconds:g}s")
+            stacks = cpu_profiler.profile(seconds, interval, exclude={threading.get_ident()})
+            if stacks is None:
+                self._send_json(409, {"error": "A CPU profile is already running"})
+                return
+
+            body = SamplingProfiler.collapsed(stacks).encode()
+            self.send_response(200)
+            self.send_header('Content-type', 'text/plain; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        # Admin: tracemalloc snapshots (the first one starts tracing)
+        if self.path.startswith('/api/admin/profile/memory/snapshot'):
+            if not self._require_admin():
+                return
+            number = memory_profiler.snapshot()
+            print(f"ℹ Memory snapshot {number} taken")
+            self._send_json(200, {"snapshot": number})
+            return
+
+        if self.path.startswith('/api/admin/profile/memory/stop'):
+            if not self._require_admin():
+                return
+            memory_profiler.stop()
+            print("ℹ Memory tracing stopped")
+            self._send_json(200, {"success": True})
+            return
+
+        # Batched match/miss events from the game
+        if self.path.startswith('/api/gameplay/events'):
+            try:
+                data = json.loads(post_data.decode())
+                if not isinstance(data, dict):
+                    self._send_json(400, {"success": False, "error": "Invalid request"})
+                    return
+                events = data.get('events', [])
+
+                if not isinstance(events, list):
+                    self._send_json(400, {"success": False, "error": "events must be a list"})
+                    return
+                if len(events) > GAMEPLAY_MAX_EVENTS:
+                    self._send_json(413, {"success": False, "error": f"At most {GAMEPLAY_MAX_EVENTS} events per batch"})
+                    return
+                if not self._admit(data.get('user_id')):
+                    return
+                if not gameplay_stats:
+                    self._send_json(503, {"success": False, "error": "Gameplay stats not available"})
+                    return
+
+                accepted, rejected = gameplay_stats.ingest(events)
+                self._send_json(200, {"success": True, "accepted": accepted, "rejected": rejected})
+            except (ValueError, AttributeError) as e:
+                self._send_json(400, {"success": False, "error": str(e)})
+            return
+
+        # Handle offline save queue replay
+        if self.path.startswith('/api/sync'):
+            try:
+                data = json.loads(post_data.decode())
+                if not isinstance(data, dict):
+                    self._send_json(400, {"success": False, "error": "Invalid request"})
+                    return
+                events = data.get('events', [])
+
+                if not isinstance(events, list) or not events:
+                    self._send_json(400, {"success": False, "error": "No events to sync"})
+                    return
+                if len(events) > SYNC_MAX_EVENTS:
+                    self._send_json(413, {"success": False, "error": f"At most {SYNC_MAX_EVENTS} events per sync"})
+                    return
+
+                if not all(valid_save_event(event) for event in events):
+                    self._send_json(400, {"success": False, "error": "Invalid save event"})
+                    return
+
+                # Group the queue by player; only the final state of each is written
+                events_by_user = {}
+                for event in events:
+                    events_by_user.setdefault(event.get('user_id', 'default_user'), []).append(event)
+
+                if not self._admit(*events_by_user):
+                    return
+
+                if not supabase_client:
+                    self._send_json(503, {"success": False, "error": "Database not configured"})
+                    return
+
+                if not backend_limiter.try_acquire():
+                    self._reject_busy()
+                    return
+
+                try:
+                    saves = [queue_save(user_id, merge_save_events(user_events))
+                             for user_id, user_events in events_by_user.items()]
+                    written = sum(1 for save in saves if save.result())
+                finally:
+                    backend_limiter.release()
+
+                print(f"✓ Synced {len(events)} queued saves for {len(events_by_user)} user(s)")
+                self._send_json(200, {"success": True, "received": len(events), "written": written,
+                                      "nextSaveMs": self._next_save_ms()})
+            except QueueFull:
+                self._reject_busy()
+            except Exception as e:
+                print(f"✗ Sync error: {e}")
+                self._send_json(500, {"success": False, "error": str(e)})
+            return
+
         super().do_POST()
 
 def press_asterisk():
@@ -421,7 +1187,33 @@ def press_asterisk():
 
 def start_server():
     """Start the HTTP server"""
-    with socketserver.TCPServer((HOST, PORT), CustomHTTPRequestHandler) as httpd:
+    init_assets()
+    init_vocabulary()
+    shared = init_shared_cache()
+
+    # Pick up sessions, cached progress and rate limits from the previous run before serving.
+    # Shared sessions and progress outlive the process in SHARED_CACHE_DIR (and other processes
+    # may have updated them since), so then each process only keeps its rate limits, in its own file
+    rate_limiters = {'ip': ip_limiter, 'user': user_limiter}
+    snapshot_path = f"{STATE_SNAPSHOT_FILE}.{PORT}" if shared else STATE_SNAPSHOT_FILE
+    snapshot_sessions = None if shared else walkerauth_client
+    snapshot_progress = None if shared else progress_cache
+    if STATE_SNAPSHOT_FILE:
+        restore_state(snapshot_path, snapshot_sessions, snapshot_progress, rate_limiters, STATE_SNAPSHOT_MAX_AGE)
+
+    # Treat SIGTERM (docker stop, platform redeploys) like Ctrl+C so state gets saved
+    def handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+    # Pastebin storage keeps a paste per save; trim superseded versions in the background
+    backends = supabase_client.shards.values() if isinstance(supabase_client, ShardedClient) else [supabase_client]
+    for backend in backends:
+        if isinstance(backend, PastebinAdapter) and PASTE_COMPACTION_INTERVAL > 0:
+            PasteCompactor(backend.client, keep=PASTE_COMPACTION_KEEP).start(PASTE_COMPACTION_INTERVAL)
+
+    # Threaded so long-lived event streams don't block other requests
+    with http.server.ThreadingHTTPServer((HOST, PORT), CustomHTTPRequestHandler) as httpd:
         # Show appropriate URL based on hosting mode
         if HOST == '0.0.0.0':
             # Get local IP for network access
@@ -457,6 +1249,7 @@ def start_server():
         print("Features:")
         print("  ✓ Local HTTP server for game")
         print("  ✓ Cloud data storage via Supabase")
+        print("  ✓ Live cross-device progress sync")
         print("  ✓ WalkerAuth OAuth integration")
         if Controller is None:
             print("  ℹ Fullscreen auto-toggle disabled")
@@ -480,6 +1273,10 @@ def start_server():
         except KeyboardInterrupt:
             print("\n\n" + "=" * 60)
             print("Shutting down server...")
+            if gameplay_stats:
+                gameplay_stats.flush()
+            if STATE_SNAPSHOT_FILE:
+                save_state(snapshot_path, snapshot_sessions, snapshot_progress, rate_limiters)
             print("✓ Game data is saved in Supabase")
             print("Goodbye!")
             print("=" * 60)
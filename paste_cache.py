@@ -0,0 +1,184 @@
+"""
+Paste Cache for LangGames
+Local cache of decrypted pastes so retrieves only fetch what is new
+
+Pastes are kept per location, keyed by paste id, epoch and IV, along with the
+newest epoch seen (the cursor for incremental retrieval). The cache is
+bounded by the total number of pastes and evicts whole locations in
+least-recently-used order. On disk it is stored encrypted with AES-GCM
+under a key derived from the site secret. Changes are written out a few
+seconds after they happen (batching the saves of busy periods) and at exit.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
+
+FILE_MAGIC = b'LGPC1'
+
+
+class PasteCache:
+    """Bounded, encrypted-at-rest cache of decrypted pastes"""
+
+    def __init__(self, path, secret_key, max_items=5000, save_delay=5.0):
+        """
+        Args:
+            path (str): Cache file, or None to keep the cache in memory only
+            secret_key (str): Site secret used to derive the file key
+            max_items (int): Maximum number of pastes kept across all locations
+            save_delay (float): Seconds a change waits before the file is rewritten
+        """
+        self.path = path
+        self.max_items = max_items
+        self.save_delay = save_delay
+        self._key = hashlib.sha256((secret_key + ':paste-cache').encode()).digest()
+        self._locations = OrderedDict()  # {location: {'cursor': epoch, 'items': {id: item}}}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self.load()
+        if path:
+            atexit.register(self.flush)
+
+    def cursor(self, location):
+        """Newest epoch cached for location, or None if nothing is cached"""
+        with self._lock:
+            entry = self._locations.get(location)
+            return entry['cursor'] if entry else None
+
+    def lookup(self, location, paste_id, epoch, iv):
+        """Return the cached item for this paste version, or None
+
+        Every write is encrypted with a fresh IV, so the IV tells apart two
+        updates made within the same second.
+        """
+        with self._lock:
+            entry = self._locations.get(location)
+            if not entry:
+                return None
+            item = entry['items'].get(str(paste_id))
+            if item and item['epoch'] == epoch and item.get('iv') == iv:
+                return item
+            return None
+
+    def items(self, location):
+        """All cached pastes for location, newest first"""
+        with self._lock:
+            entry = self._locations.get(location)
+            if not entry:
+                return []
+            self._locations.move_to_end(location)
+            return sorted(entry['items'].values(),
+                          key=lambda item: (item['created_at'] or '', item['epoch']),
+                          reverse=True)
+
+    def merge(self, location, new_items):
+        """Add or replace pastes for location and advance its cursor"""
+        if not new_items:
+            return
+
+        with self._lock:
+            entry = self._locations.setdefault(location, {'cursor': 0, 'items': {}})
+            self._locations.move_to_end(location)
+
+            for item in new_items:
+                key = str(item['id'])
+                if key not in entry['items']:
+                    self._size += 1
+                entry['items'][key] = item
+                entry['cursor'] = max(entry['cursor'], item['epoch'])
+
+            self._evict()
+
+        self._schedule_save()
+
+    def remove(self, paste_id):
+        """Forget a paste (after it has been deleted)"""
+        key = str(paste_id)
+        with self._lock:
+            for entry in self._locations.values():
+                if entry['items'].pop(key, None) is not None:
+                    self._size -= 1
+                    break
+            else:
+                return
+
+        self._schedule_save()
+
+    def _evict(self):
+        # Whole locations go, so a cached location is never missing older pastes
+        while self._size > self.max_items and len(self._locations) > 1:
+            _, entry = self._locations.popitem(last=False)
+            self._size -= len(entry['items'])
+
+    def load(self):
+        """Load the cache file; a missing, foreign or corrupt file starts empty"""
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'rb') as f:
+                blob = f.read()
+            if not blob.startswith(FILE_MAGIC):
+                raise ValueError('Unknown cache file format')
+
+            nonce, tag = blob[5:17], blob[17:33]
+            cipher = AES.new(self._key, AES.MODE_GCM, nonce=nonce)
+            state = json.loads(cipher.decrypt_and_verify(blob[33:], tag))
+
+            with self._lock:
+                self._locations = OrderedDict(state['locations'])
+                self._size = sum(len(entry['items']) for entry in self._locations.values())
+                self._evict()
+        except Exception as e:
+            print(f"Paste cache ignored ({e})")
+
+    def _schedule_save(self):
+        # One pending write covers every change made until it runs
+        if not self.path:
+            return
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Write pending changes now"""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer is None:
+            return
+        timer.cancel()
+        self.save()
+
+    def save(self):
+        """Write the cache file atomically"""
+        if not self.path:
+            return
+
+        with self._lock:
+            raw = json.dumps({'locations': self._locations}, separators=(',', ':')).encode()
+
+        nonce = get_random_bytes(12)
+        cipher = AES.new(self._key, AES.MODE_GCM, nonce=nonce)
+        encrypted, tag = cipher.encrypt_and_digest(raw)
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with self._save_lock:
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(FILE_MAGIC + nonce + tag + encrypted)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Paste cache not saved: {e}")
+
+    def __len__(self):
+        return self._size
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Paste Compactor for LangGames
+Deletes superseded pastes so every location keeps only its newest versions
+
+Usage:
+    python paste_compactor.py [--dry-run] [--keep N] [--location LOC]
+"""
+
+import sys
+import threading
+import time
+
+
+class PasteCompactor:
+    """Keeps the newest N pastes per location and deletes the rest in rate-limited batches"""
+
+    def __init__(self, client, keep=3, batch_size=10, batch_interval=2.0):
+        """
+        Args:
+            client (PastebinClient): Client used to list and delete pastes
+            keep (int): Versions kept per location
+            batch_size (int): Deletes sent before pausing
+            batch_interval (float): Seconds to pause between batches
+        """
+        self.client = client
+        self.keep = max(1, keep)
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def plan(self, location=None):
+        """
+        Find superseded pastes
+
+        Args:
+            location (str): Only look at this location (default: all locations)
+
+        Returns:
+            dict: {location: [pastes to delete, newest first]}
+        """
+        # Only ids and timestamps are needed, so nothing is decrypted
+        by_location = {}
+        for item in self.client.list_pastes(location=location):
+            by_location.setdefault(item['location'], []).append(item)
+
+        plan = {}
+        for loc, items in by_location.items():
+            items.sort(key=lambda item: (item['created_at'] or '', item['epoch']), reverse=True)
+            if len(items) > self.keep:
+                plan[loc] = items[self.keep:]
+        return plan
+
+    def compact(self, location=None, dry_run=False):
+        """
+        Run one compaction pass
+
+        Returns:
+            dict: Report with reclaimable, deleted and failed counts per location
+        """
+        plan = self.plan(location)
+        report = {
+            'dry_run': dry_run,
+            'locations': len(plan),
+            'reclaimable': sum(len(items) for items in plan.values()),
+            'deleted': 0,
+            'failed': 0,
+            'by_location': {loc: len(items) for loc, items in plan.items()},
+        }
+        if dry_run:
+            return report
+
+        sent = 0
+        for items in plan.values():
+            for item in items:
+                if self._stop.is_set():
+                    return report
+                if sent and sent % self.batch_size == 0:
+                    # Pause between batches so compaction never crowds out saves
+                    self._stop.wait(self.batch_interval)
+
+                try:
+                    self.client.delete(item['id'])
+                    report['deleted'] += 1
+                except Exception:
+                    report['failed'] += 1
+                sent += 1
+
+        return report
+
+    def start(self, interval):
+        """Run compaction every interval seconds on a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    report = self.compact()
+                    if report['reclaimable']:
+                        print(f"✓ Paste compaction: deleted {report['deleted']} of "
+                              f"{report['reclaimable']} superseded pastes ({report['failed']} failed)")
+                except Exception as e:
+                    print(f"✗ Paste compaction failed: {e}")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name='paste-compactor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread after the current delete"""
+        self._stop.set()
+
+
+if __name__ == "__main__":
+    import argparse
+    from pastebin_client import PastebinClient, load_pastebin_credentials
+
+    parser = argparse.ArgumentParser(description="Delete superseded LangGames pastes")
+    parser.add_argument('--dry-run', action='store_true', help="Only report reclaimable pastes")
+    parser.add_argument('--keep', type=int, default=3, help="Versions kept per location")
+    parser.add_argument('--location', help="Only compact this location (user_id)")
+    args = parser.parse_args()
+
+    pastebin_url, site_id, secret_key = load_pastebin_credentials()
+    if not (pastebin_url and site_id and secret_key):
+        print("✗ Pastebin not configured (PASTEBIN_URL, SITE_ID, SECRET_KEY)")
+        sys.exit(1)
+
+    compactor = PasteCompactor(PastebinClient(pastebin_url, site_id, secret_key), keep=args.keep)
+    started = time.time()
+    report = compactor.compact(location=args.location, dry_run=args.dry_run)
+
+    print("=" * 60)
+    print("Paste compaction" + (" (dry run)" if args.dry_run else ""))
+    print("=" * 60)
+    for loc, count in sorted(report['by_location'].items(), key=lambda entry: -entry[1]):
+        print(f"  {loc}: {count} reclaimable")
+    print(f"Reclaimable: {report['reclaimable']} pastes in {report['locations']} locations")
+    if not args.dry_run:
+        print(f"Deleted: {report['deleted']}  Failed: {report['failed']}")
+    print(f"Took {time.time() - started:.1f}s")
@@ -5,24 +5,30 @@ Replaces Supabase with encrypted pastebin backend
 
 import requests
 import hashlib
+import os
 import time
 import json
 from Crypto.Cipher import AES
 from Crypto.Random import get_random_bytes
+from paste_cache import PasteCache
+from tracing import traced
+from var import PASTE_CACHE_FILE, PASTE_CACHE_MAX_ITEMS
 
 
 class PastebinClient:
     """Client for encrypted pastebin service"""
 
-    def __init__(self, pastebin_url, site_id, secret_key):
+    def __init__(self, pastebin_url, site_id, secret_key, cache=None):
         self.pastebin_url = pastebin_url
         self.site_id = site_id
         self.secret_key = secret_key
+        self.cache = cache  # Optional PasteCache of decrypted pastes
 
     def _sha256(self, data):
         """Generate SHA256 hash"""
         return hashlib.sha256(data.encode()).hexdigest()
 
+    @traced('pastebin.encrypt')
     def _encrypt(self, data, epoch):
         """Encrypt data using AES-256-CBC"""
         combined_key = self.secret_key + str(epoch)
@@ -43,6 +49,7 @@ class PastebinClient:
             'iv': iv.hex()
         }
 
+    @traced('pastebin.decrypt')
     def _decrypt(self, encrypted_hex, iv_hex, epoch):
         """Decrypt data using AES-256-CBC"""
         combined_key = self.secret_key + str(epoch)
@@ -63,6 +70,7 @@ class PastebinClient:
         """Generate authentication proof"""
         return self._sha256(self.secret_key + str(epoch))
 
+    @traced('pastebin.handshake')
     def handshake(self):
         """Perform handshake with pastebin"""
         try:
@@ -93,6 +101,7 @@ class PastebinClient:
             print(f"Handshake failed: {e}")
             raise
 
+    @traced('pastebin.store')
     def store(self, location, data):
         """Store data in pastebin"""
         try:
@@ -124,28 +133,53 @@ class PastebinClient:
             print(f"Store failed: {e}")
             raise
 
+    def _fetch(self, location=None, since=None):
+        """Raw (still encrypted) pastes, optionally for one location and from an epoch on"""
+        epoch = int(time.time())
+        auth_proof = self._generate_auth_proof(epoch)
+
+        params = {
+            'site_id': self.site_id,
+            'enc': auth_proof,
+            'epo': epoch
+        }
+
+        if location:
+            params['loc'] = location
+
+        if since is not None:
+            params['since'] = since
+
+        response = requests.get(f"{self.pastebin_url}/retrieve", params=params)
+        response.raise_for_status()
+        return response.json().get('data', [])
+
+    @traced('pastebin.list')
+    def list_pastes(self, location=None):
+        """Paste metadata (id, location, epoch, created_at) without decrypting anything"""
+        try:
+            return [{key: item[key] for key in ('id', 'location', 'epoch', 'created_at')}
+                    for item in self._fetch(location)]
+        except Exception as e:
+            print(f"List failed: {e}")
+            raise
+
+    @traced('pastebin.retrieve')
     def retrieve(self, location=None):
         """Retrieve data from pastebin"""
         try:
-            epoch = int(time.time())
-            auth_proof = self._generate_auth_proof(epoch)
+            use_cache = self.cache is not None and location is not None
+            cursor = self.cache.cursor(location) if use_cache else None
 
-            params = {
-                'site_id': self.site_id,
-                'enc': auth_proof,
-                'epo': epoch
-            }
-
-            if location:
-                params['loc'] = location
-
-            response = requests.get(f"{self.pastebin_url}/retrieve", params=params)
-            response.raise_for_status()
-            result = response.json()
+            # Only ask for pastes from the cursor on; one second of overlap
+            # covers pastes written in the same second, duplicates are skipped below
+            items = self._fetch(location, since=cursor - 1 if cursor is not None else None)
 
             # Decrypt the retrieved data
             decrypted_data = []
-            for item in result.get('data', []):
+            for item in items:
+                if use_cache and self.cache.lookup(location, item['id'], item['epoch'], item['iv']):
+                    continue
                 try:
                     decrypted = self._decrypt(
                         item['encrypted_data'],
@@ -157,16 +191,23 @@ class PastebinClient:
                         'location': item['location'],
                         'data': decrypted,
                         'epoch': item['epoch'],
+                        'iv': item['iv'],
                         'created_at': item['created_at']
                     })
                 except Exception as e:
                     print(f"Failed to decrypt item {item['id']}: {e}")
 
+            if use_cache:
+                self.cache.merge(location, decrypted_data)
+                # Hand out copies so callers can't modify cached pastes
+                return json.loads(json.dumps(self.cache.items(location)))
+
             return decrypted_data
         except Exception as e:
             print(f"Retrieve failed: {e}")
             raise
 
+    @traced('pastebin.update')
     def update(self, paste_id, data):
         """Update existing data"""
         try:
@@ -186,11 +227,15 @@ class PastebinClient:
             })
             response.raise_for_status()
 
+            if self.cache is not None:
+                self.cache.remove(paste_id)
+
             return response.json()
         except Exception as e:
             print(f"Update failed: {e}")
             raise
 
+    @traced('pastebin.delete')
     def delete(self, paste_id):
         """Delete data"""
         try:
@@ -205,6 +250,9 @@ class PastebinClient:
             })
             response.raise_for_status()
 
+            if self.cache is not None:
+                self.cache.remove(paste_id)
+
             return response.json()
         except Exception as e:
             print(f"Delete failed: {e}")
@@ -219,19 +267,38 @@ class PastebinAdapter:
 
     def __init__(self, pastebin_client):
         self.client = pastebin_client
-        self._table_name = None
 
     def table(self, table_name):
-        """Select table (mimics Supabase interface)"""
+        """Start a query (mimics Supabase interface); each call gets its own query object"""
+        return PastebinQuery(self.client, table_name)
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class PastebinQuery:
+    """
+    One Supabase-style query chain against pastebin
+
+    Nothing runs until execute(), and no state is shared between queries,
+    so concurrent requests can't see each other's filters or update data.
+    """
+
+    def __init__(self, pastebin_client, table_name):
+        self.client = pastebin_client
         self._table_name = table_name
-        return self
+        self._columns = '*'
+        self._filters = {}
+        self._order_by = None
+        self._limit_count = None
+        self._operation = 'select'
+        self._data = None
 
     def select(self, columns='*'):
         """Select columns (mimics Supabase interface)"""
         self._columns = columns
-        self._filters = {}
-        self._order_by = None
-        self._limit_count = None
         return self
 
     def eq(self, column, value):
@@ -249,8 +316,26 @@ class PastebinAdapter:
         self._limit_count = count
         return self
 
+    def insert(self, data):
+        """Insert data (mimics Supabase interface)"""
+        self._operation, self._data = 'insert', data
+        return self
+
+    def update(self, data):
+        """Update data (mimics Supabase interface)"""
+        self._operation, self._data = 'update', data
+        return self
+
     def execute(self):
         """Execute the query"""
+        if self._operation == 'insert':
+            return self._execute_insert()
+        if self._operation == 'update':
+            return self._execute_update()
+        return self._execute_select()
+
+    @traced('pastebin_adapter.select')
+    def _execute_select(self):
         # For GIDbasedLV table, user_id is the location
         user_id = self._filters.get('user_id', 'default_user')
 
@@ -263,62 +348,60 @@ class PastebinAdapter:
                 data = results[0]['data']
                 # Add paste_id for update operations
                 data['_paste_id'] = results[0]['id']
-                return type('obj', (object,), {'data': [data]})
+                return _Result([data])
             else:
-                return type('obj', (object,), {'data': []})
+                return _Result([])
         except Exception as e:
             print(f"Query error: {e}")
-            return type('obj', (object,), {'data': []})
+            return _Result([])
 
-    def insert(self, data):
-        """Insert data (mimics Supabase interface)"""
-        user_id = data.get('user_id', 'default_user')
+    @traced('pastebin_adapter.insert')
+    def _execute_insert(self):
+        user_id = self._data.get('user_id', 'default_user')
 
         try:
-            result = self.client.store(location=user_id, data=data)
-            return type('obj', (object,), {'data': [data]})
+            self.client.store(location=user_id, data=self._data)
+            return _Result([self._data])
         except Exception as e:
             print(f"Insert error: {e}")
             raise
 
-    def update(self, data):
-        """Update data (mimics Supabase interface)"""
-        self._update_data = data
-        self._update_filter = None
-        return self
-
-    def eq(self, column, value):
-        """Filter for various operations"""
-        if hasattr(self, '_update_data'):
-            # This is an update operation
-            self._update_filter = (column, value)
-            return self.execute_update()
-        else:
-            # This is a select operation
-            self._filters[column] = value
-            return self
-
-    def execute_update(self):
-        """Execute the update operation"""
-        column, user_id = self._update_filter
+    @traced('pastebin_adapter.update')
+    def _execute_update(self):
+        user_id = self._filters.get('user_id', 'default_user')
 
         try:
             # Get existing paste_id
             results = self.client.retrieve(location=user_id)
             if results:
                 paste_id = results[0]['id']
-                result = self.client.update(paste_id, self._update_data)
-                return type('obj', (object,), {'data': [self._update_data]})
+                self.client.update(paste_id, self._data)
+                return _Result([self._data])
             else:
                 # No existing data, insert instead
-                self._update_data['user_id'] = user_id
-                return self.insert(self._update_data)
+                self._data = dict(self._data, user_id=user_id)
+                return self._execute_insert()
         except Exception as e:
             print(f"Update error: {e}")
             raise
 
 
-def create_pastebin_client(pastebin_url, site_id, secret_key):
+def load_pastebin_credentials(env_path=".env"):
+    """Load PASTEBIN_URL, SITE_ID and SECRET_KEY from environment variables or .env file"""
+    values = {name: os.getenv(name) for name in ('PASTEBIN_URL', 'SITE_ID', 'SECRET_KEY')}
+
+    if not all(values.values()) and os.path.exists(env_path):
+        with open(env_path, 'r') as f:
+            for line in f:
+                name, sep, value = line.strip().partition('=')
+                if sep and name in values and not values[name]:
+                    values[name] = value
+
+    return values['PASTEBIN_URL'], values['SITE_ID'], values['SECRET_KEY']
+
+
+def create_pastebin_client(pastebin_url, site_id, secret_key, cache_path=PASTE_CACHE_FILE):
     """Create a Supabase-like client that uses encrypted pastebin"""
-    client = PastebinClient(pastebin_url, site_id, secret_key)
+    cache = PasteCache(cache_path or None, secret_key, PASTE_CACHE_MAX_ITEMS)
+    client = PastebinClient(pastebin_url, site_id, secret_key, cache=cache)
     return PastebinAdapter(client)
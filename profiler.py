@@ -0,0 +1,161 @@
+"""
+Profiler for LangGames
+On-demand CPU sampling and tracemalloc snapshots for a running server
+
+Nothing here runs until an admin asks for it: the CPU sampler is a thread
+that exists only for the length of one profile, and tracemalloc is started
+by the first memory snapshot and stopped again explicitly.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+MAX_SNAPSHOTS = 8  # Older snapshots are discarded first
+MIN_INTERVAL = 0.001  # Seconds; finer sampling would starve the threads being profiled
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)})"
+
+
+class SamplingProfiler:
+    """Samples the stacks of all threads at a fixed interval"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running = False
+
+    @property
+    def running(self):
+        return self._running
+
+    def profile(self, seconds, interval=0.005, exclude=()):
+        """
+        Sample for a number of seconds
+
+        Args:
+            seconds (float): How long to sample
+            interval (float): Seconds between samples (at least MIN_INTERVAL, at most seconds)
+            exclude (iterable): Thread idents to leave out (e.g. the caller)
+
+        Returns:
+            Counter: {collapsed stack: sample count}, or None if a profile is already running
+        """
+        interval = max(MIN_INTERVAL, min(interval, seconds))
+
+        with self._lock:
+            if self._running:
+                return None
+            self._running = True
+
+        # Sample from a separate thread so the caller can be anywhere
+        stacks = Counter()
+        skip = set(exclude)
+        thread_names = {}
+
+        def sample():
+            skip.add(threading.get_ident())
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                for thread in threading.enumerate():
+                    thread_names[thread.ident] = thread.name
+                for ident, frame in sys._current_frames().items():
+                    if ident in skip:
+                        continue
+                    labels = []
+                    while frame is not None:
+                        labels.append(_frame_label(frame))
+                        frame = frame.f_back
+                    labels.append(thread_names.get(ident, str(ident)))
+                    stacks[';'.join(reversed(labels))] += 1
+                time.sleep(interval)
+
+        try:
+            sampler = threading.Thread(target=sample, name='cpu-profiler', daemon=True)
+            sampler.start()
+            sampler.join()
+        finally:
+            self._running = False
+        return stacks
+
+    @staticmethod
+    def collapsed(stacks):
+        """Format samples as collapsed stacks (flamegraph.pl / speedscope input)"""
+        return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class MemoryProfiler:
+    """Numbered tracemalloc snapshots and the differences between them"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots = {}  # {number: Snapshot}
+        self._next_id = 1
+
+    @property
+    def tracing(self):
+        return tracemalloc.is_tracing()
+
+    def snapshot(self):
+        """
+        Take a snapshot, starting tracemalloc first if needed
+
+        Allocations made before tracing started are invisible, so the first
+        snapshot is the baseline for later ones.
+
+        Returns:
+            int: Snapshot number
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        snap = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>'),
+        ))
+
+        with self._lock:
+            number = self._next_id
+            self._next_id += 1
+            self._snapshots[number] = snap
+            while len(self._snapshots) > MAX_SNAPSHOTS:
+                del self._snapshots[min(self._snapshots)]
+        return number
+
+    def diff(self, first, second, limit=25):
+        """
+        Top allocation sites by size growth between two snapshots
+
+        Returns:
+            list: Dicts with site, size_diff, size, count_diff and count;
+                  None if either snapshot is unknown
+        """
+        with self._lock:
+            old, new = self._snapshots.get(first), self._snapshots.get(second)
+        if old is None or new is None:
+            return None
+
+        sites = []
+        for stat in new.compare_to(old, 'lineno')[:limit]:
+            frame = stat.traceback[0]
+            sites.append({
+                'site': f"{frame.filename}:{frame.lineno}",
+                'size_diff': stat.size_diff,
+                'size': stat.size,
+                'count_diff': stat.count_diff,
+                'count': stat.count,
+            })
+        return sites
+
+    def stop(self):
+        """Stop tracing and drop all snapshots"""
+        with self._lock:
+            self._snapshots.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
@@ -0,0 +1,62 @@
+"""
+Progress Cache for LangGames
+Recently loaded or saved progress records, kept in memory
+
+Loads are served from here when possible, and every save writes through,
+so a player's own reads always see their latest save on this server.
+Entries expire after a TTL, which bounds how stale a record can get when
+another server process writes the same player.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class ProgressCache:
+    """LRU of progress records with per-entry expiry"""
+
+    def __init__(self, max_items=10000, ttl=300):
+        """
+        Args:
+            max_items (int): Records kept; the least recently used go first
+            ttl (float): Seconds a record is served after it was stored
+        """
+        self.max_items = max_items
+        self.ttl = ttl
+        self._entries = OrderedDict()  # {user_id: (expires_at, record)}, expires_at is wall-clock
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        """Cached record for user_id, or None"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return dict(entry[1])
+
+    def put(self, user_id, record, expires_at=None):
+        """Store a copy of record for user_id"""
+        if self.max_items <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (expires_at or time.time() + self.ttl, dict(record))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def entries(self):
+        """(user_id, expires_at, record) for every entry, least recently used first"""
+        with self._lock:
+            return [(user_id, expires_at, record) for user_id, (expires_at, record) in self._entries.items()]
+
+    def __len__(self):
+        return len(self._entries)
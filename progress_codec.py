@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Progress Codec for LangGames
+Compact binary encoding for save/load payloads
+
+Layout:
+    byte 0      magic 'L'
+    byte 1      format version (high nibble) | flags (low nibble, bit 0 = zlib)
+    rest        fields (zlib-compressed when flagged)
+
+Each field is a varint tag followed by its value. Integers are zigzag
+varints, strings are a varint byte length followed by UTF-8. Anything that
+does not fit a fixed tag is carried as JSON in the EXTRA field, so decoding
+always returns exactly what was encoded.
+"""
+
+import json
+import zlib
+
+CONTENT_TYPE = 'application/vnd.langgames.progress'
+
+MAGIC = 0x4C
+VERSION = 1
+FLAG_ZLIB = 0x01
+
+# Payloads smaller than this rarely shrink under zlib
+COMPRESS_MIN_SIZE = 96
+
+# Largest body a compressed payload may inflate to (guards against zip bombs)
+MAX_DECODED_SIZE = 256 * 1024
+
+INT, STR, STATS = 'int', 'str', 'stats'
+
+FIELDS = [
+    (1, 'user_id', STR),
+    (2, 'level', INT),
+    (3, 'score', INT),
+    (4, 'highScore', INT),
+    (5, 'gamesPlayed', INT),
+    (6, 'lastPlayed', STR),
+    (7, 'stats', STATS),
+    (8, 'updated_at', STR),
+    (9, 'created_at', STR),
+    (10, 'id', INT),
+    (11, 'clientId', STR),
+]
+TAG_EXTRA = 15
+
+FIELDS_BY_NAME = {name: (tag, kind) for tag, name, kind in FIELDS}
+FIELDS_BY_TAG = {tag: (name, kind) for tag, name, kind in FIELDS}
+
+
+class CodecError(ValueError):
+    """Raised when a binary payload cannot be decoded"""
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _fits(kind, value):
+    if kind == INT:
+        return _is_int(value)
+    if kind == STR:
+        return isinstance(value, str)
+    return isinstance(value, dict) and all(
+        isinstance(k, str) and _is_int(v) for k, v in value.items()
+    )
+
+
+def _write_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_sint(out, value):
+    _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+
+
+def _write_str(out, value):
+    raw = value.encode('utf-8')
+    _write_varint(out, len(raw))
+    out += raw
+
+
+def _read_varint(buf, pos):
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(buf):
+            raise CodecError('Truncated varint')
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _read_sint(buf, pos):
+    value, pos = _read_varint(buf, pos)
+    return (value >> 1) if not value & 1 else -((value + 1) >> 1), pos
+
+
+def _read_str(buf, pos):
+    length, pos = _read_varint(buf, pos)
+    end = pos + length
+    if end > len(buf):
+        raise CodecError('Truncated string')
+    try:
+        return bytes(buf[pos:end]).decode('utf-8'), end
+    except UnicodeDecodeError as e:
+        raise CodecError(f'Invalid UTF-8 in string: {e}')
+
+
+def encode(data, compress=True):
+    """
+    Encode a progress dict
+
+    Args:
+        data (dict): Save or load payload
+        compress (bool): Allow zlib when it makes the payload smaller
+
+    Returns:
+        bytes: Encoded payload
+    """
+    body = bytearray()
+    extra = {}
+
+    for name, value in data.items():
+        field = FIELDS_BY_NAME.get(name)
+        if field is None or not _fits(field[1], value):
+            extra[name] = value
+            continue
+
+        tag, kind = field
+        _write_varint(body, tag)
+        if kind == INT:
+            _write_sint(body, value)
+        elif kind == STR:
+            _write_str(body, value)
+        else:
+            _write_varint(body, len(value))
+            for key, count in value.items():
+                _write_str(body, key)
+                _write_sint(body, count)
+
+    if extra:
+        _write_varint(body, TAG_EXTRA)
+        _write_str(body, json.dumps(extra, separators=(',', ':')))
+
+    flags = 0
+    if compress and len(body) >= COMPRESS_MIN_SIZE:
+        compressed = zlib.compress(bytes(body), 6)
+        if len(compressed) < len(body):
+            body = compressed
+            flags |= FLAG_ZLIB
+
+    return bytes([MAGIC, (VERSION << 4) | flags]) + bytes(body)
+
+
+def decode(payload):
+    """
+    Decode a payload produced by encode() (or the game.js encoder)
+
+    Raises:
+        CodecError: If the payload is malformed
+    """
+    if len(payload) < 2 or payload[0] != MAGIC:
+        raise CodecError('Not a LangGames progress payload')
+    if payload[1] >> 4 != VERSION:
+        raise CodecError(f'Unsupported progress format version {payload[1] >> 4}')
+
+    body = payload[2:]
+    if payload[1] & FLAG_ZLIB:
+        inflater = zlib.decompressobj()
+        try:
+            body = inflater.decompress(body, MAX_DECODED_SIZE)
+        except zlib.error as e:
+            raise CodecError(f'Bad compressed payload: {e}')
+        if inflater.unconsumed_tail:
+            raise CodecError(f'Payload inflates past {MAX_DECODED_SIZE} bytes')
+        if not inflater.eof:
+            raise CodecError('Truncated compressed payload')
+
+    data = {}
+    pos = 0
+    while pos < len(body):
+        tag, pos = _read_varint(body, pos)
+
+        if tag == TAG_EXTRA:
+            raw, pos = _read_str(body, pos)
+            try:
+                extra = json.loads(raw)
+            except (ValueError, RecursionError) as e:
+                raise CodecError(f'Bad EXTRA field: {e}')
+            if not isinstance(extra, dict):
+                raise CodecError('EXTRA field is not an object')
+            data.update(extra)
+            continue
+
+        field = FIELDS_BY_TAG.get(tag)
+        if field is None:
+            raise CodecError(f'Unknown field tag {tag}')
+
+        name, kind = field
+        if kind == INT:
+            data[name], pos = _read_sint(body, pos)
+        elif kind == STR:
+            data[name], pos = _read_str(body, pos)
+        else:
+            count, pos = _read_varint(body, pos)
+            stats = {}
+            for _ in range(count):
+                key, pos = _read_str(body, pos)
+                stats[key], pos = _read_sint(body, pos)
+            data[name] = stats
+
+    return data
+
+
+def accepts_binary(accept_header):
+    """
+    Check an Accept header for the binary progress type
+
+    Returns:
+        tuple: (accepted, zlib_supported)
+    """
+    for media_range in (accept_header or '').split(','):
+        parts = [part.strip() for part in media_range.split(';')]
+        if parts[0].lower() == CONTENT_TYPE:
+            params = dict(part.split('=', 1) for part in parts[1:] if '=' in part)
+            if params.get('q', '1') in ('0', '0.0', '0.00', '0.000'):
+                return False, False
+            return True, params.get('zlib') == '1'
+    return False, False
+
+
+def is_binary_content_type(content_type):
+    """Check whether a Content-Type header names the binary progress type"""
+    return (content_type or '').split(';')[0].strip().lower() == CONTENT_TYPE
+
+
+if __name__ == "__main__":
+    # Benchmark against JSON on representative payloads
+    import timeit
+
+    save = {
+        'user_id': 'student.name@example.com',
+        'level': 12,
+        'score': 4380,
+        'highScore': 5120,
+        'gamesPlayed': 37,
+        'lastPlayed': '2026-10-19T09:41:27.318Z',
+        'stats': {'totalScore': 61240, 'levelsCompleted': 11}
+    }
+    load = dict(save, id=18342, updated_at='2026-10-19T09:41:27.402113+00:00',
+                created_at='2026-03-02T14:05:51.877390+00:00')
+
+    print("=" * 60)
+    print("Progress codec benchmark (binary vs JSON)")
+    print("=" * 60)
+
+    for label, payload in (('save', save), ('load', load)):
+        as_json = json.dumps(payload).encode()
+        as_binary = encode(payload, compress=False)
+        as_zlib = encode(payload, compress=True)
+        assert decode(as_binary) == payload and decode(as_zlib) == payload
+
+        runs = 20000
+        json_enc = timeit.timeit(lambda: json.dumps(payload).encode(), number=runs) / runs * 1e6
+        json_dec = timeit.timeit(lambda: json.loads(as_json), number=runs) / runs * 1e6
+        bin_enc = timeit.timeit(lambda: encode(payload), number=runs) / runs * 1e6
+        bin_dec = timeit.timeit(lambda: decode(as_zlib), number=runs) / runs * 1e6
+
+        print(f"\n{label} payload")
+        print(f"  JSON:    {len(as_json):4d} bytes   encode {json_enc:6.2f}us   decode {json_dec:6.2f}us")
+        print(f"  binary:  {len(as_zlib):4d} bytes   encode {bin_enc:6.2f}us   decode {bin_dec:6.2f}us"
+              f"   ({len(as_zlib) / len(as_json):.0%} of JSON, zlib={'yes' if as_zlib[1] & FLAG_ZLIB else 'no'})")
+        print(f"  binary without zlib: {len(as_binary)} bytes")
+
+    print("=" * 60)
@@ -0,0 +1,96 @@
+"""
+Progress Events for LangGames
+In-process fan-out of progress changes to server-sent event subscribers
+"""
+
+import queue
+import threading
+
+
+class Subscriber:
+    """A single event stream with a bounded queue"""
+
+    def __init__(self, user_id, max_queue):
+        self.user_id = user_id
+        self.queue = queue.Queue(max_queue)
+        self.dropped = 0
+
+    def put(self, event):
+        """Queue an event, discarding the oldest one if the subscriber is behind"""
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout):
+        """Wait for the next event; returns None on timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class ProgressBroker:
+    """Routes progress events to the subscribers of each user_id"""
+
+    def __init__(self, max_queue=16, max_subscribers=1000, max_per_user=8):
+        """
+        Args:
+            max_queue (int): Events buffered per subscriber before old ones are dropped
+            max_subscribers (int): Open streams allowed in total
+            max_per_user (int): Open streams allowed per user_id
+        """
+        self.max_queue = max_queue
+        self.max_subscribers = max_subscribers
+        self.max_per_user = max_per_user
+        self._subscribers = {}  # {user_id: set(Subscriber)}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        """
+        Open a stream for user_id
+
+        Returns:
+            Subscriber: The new subscriber, or None if a limit is reached
+        """
+        with self._lock:
+            user_subscribers = self._subscribers.setdefault(user_id, set())
+            if self._count >= self.max_subscribers or len(user_subscribers) >= self.max_per_user:
+                if not user_subscribers:
+                    del self._subscribers[user_id]
+                return None
+
+            subscriber = Subscriber(user_id, self.max_queue)
+            user_subscribers.add(subscriber)
+            self._count += 1
+            return subscriber
+
+    def unsubscribe(self, subscriber):
+        """Close a stream opened with subscribe"""
+        with self._lock:
+            user_subscribers = self._subscribers.get(subscriber.user_id)
+            if user_subscribers and subscriber in user_subscribers:
+                user_subscribers.remove(subscriber)
+                self._count -= 1
+                if not user_subscribers:
+                    del self._subscribers[subscriber.user_id]
+
+    def publish(self, user_id, event):
+        """Deliver an event to every stream of user_id without blocking"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+
+        for subscriber in subscribers:
+            subscriber.put(event)
+
+        return len(subscribers)
+
+    def __len__(self):
+        return self._count
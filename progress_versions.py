@@ -0,0 +1,92 @@
+"""
+Progress Versions for LangGames
+ETags for progress records and an index of each player's current one
+
+A record's ETag is a hash of the fields the game reads, so the copy a
+client just saved and the same record read back from storage get the
+same tag. The index maps user_id to the latest tag seen on this server,
+which lets /api/data/load answer If-None-Match without touching the
+cache or storage.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+VERSIONED_FIELDS = ('user_id', 'level', 'score', 'highScore', 'gamesPlayed', 'stats', 'lastPlayed')
+
+
+def _instant(value):
+    # Storage returns timestamps as +00:00 with microseconds, the game sends Z with milliseconds
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def progress_etag(record):
+    """Weak ETag for a progress record, or None for an empty one"""
+    if not record:
+        return None
+    fields = {field: record.get(field) for field in VERSIONED_FIELDS}
+    fields['lastPlayed'] = _instant(fields['lastPlayed'])
+    canonical = json.dumps(fields, sort_keys=True, separators=(',', ':'), default=str)
+    return 'W/"' + hashlib.blake2b(canonical.encode('utf-8'), digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match check with weak comparison (RFC 9110 13.1.2)"""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith('W/') else candidate) == opaque:
+            return True
+    return False
+
+
+class VersionIndex:
+    """user_id -> current ETag, bounded and expiring like the progress cache"""
+
+    def __init__(self, max_items=100000, ttl=300):
+        """
+        Args:
+            max_items (int): Players tracked; the least recently used go first
+            ttl (float): Seconds a tag is trusted (other servers may write meanwhile)
+        """
+        self.max_items = max_items
+        self.ttl = ttl
+        self._tags = OrderedDict()  # {user_id: (expires_at, etag)}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._tags.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._tags[user_id]
+                return None
+            self._tags.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user_id, etag):
+        if self.max_items <= 0:
+            return
+        with self._lock:
+            if etag is None:
+                self._tags.pop(user_id, None)
+                return
+            self._tags[user_id] = (time.monotonic() + self.ttl, etag)
+            self._tags.move_to_end(user_id)
+            while len(self._tags) > self.max_items:
+                self._tags.popitem(last=False)
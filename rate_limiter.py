@@ -0,0 +1,129 @@
+"""
+Rate Limiter for LangGames
+Token buckets and admission control for the API routes
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucket:
+    """Token bucket state for a single key"""
+
+    __slots__ = ('tokens', 'updated_at')
+
+    def __init__(self, tokens, updated_at):
+        self.tokens = tokens
+        self.updated_at = updated_at
+
+
+class RateLimiter:
+    """
+    Keyed token buckets with bounded memory
+
+    Buckets are kept in least-recently-used order. Buckets that have been idle
+    long enough to refill completely are dropped (a fresh bucket is identical),
+    and the least recently used key is evicted once max_keys is reached.
+    A rate of 0 or less turns the limiter off.
+    """
+
+    def __init__(self, rate, capacity, max_keys=10000):
+        """
+        Args:
+            rate (float): Tokens added per second (<= 0 admits everything)
+            capacity (float): Maximum burst size
+            max_keys (int): Maximum number of buckets kept in memory
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self.enabled = rate > 0
+        self._idle_after = capacity / rate if self.enabled else 0
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key, cost=1):
+        """
+        Take tokens from the bucket for key
+
+        Returns:
+            float: 0 if the request is allowed, otherwise seconds until it would be
+        """
+        if not self.enabled:
+            return 0
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_idle(now)
+
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.capacity, now)
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                elapsed = now - bucket.updated_at
+                bucket.tokens = min(self.capacity, bucket.tokens + elapsed * self.rate)
+                bucket.updated_at = now
+
+            if bucket.tokens >= cost:
+                bucket.tokens -= cost
+                return 0
+
+            return (cost - bucket.tokens) / self.rate
+
+    def _evict_idle(self, now, max_evictions=8):
+        """Drop a few fully refilled buckets from the cold end of the LRU"""
+        for _ in range(max_evictions):
+            if not self._buckets:
+                return
+            key, bucket = next(iter(self._buckets.items()))
+            if now - bucket.updated_at < self._idle_after:
+                return
+            del self._buckets[key]
+
+    def export(self):
+        """(key, tokens, seconds since last use) for every bucket, least recently used first"""
+        now = time.monotonic()
+        with self._lock:
+            return [(key, bucket.tokens, now - bucket.updated_at) for key, bucket in self._buckets.items()]
+
+    def restore(self, buckets):
+        """Load buckets from export(), e.g. after a restart; ones that have refilled are skipped"""
+        now = time.monotonic()
+        with self._lock:
+            for key, tokens, idle in buckets:
+                if idle >= self._idle_after:
+                    continue
+                self._buckets[key] = TokenBucket(tokens, now - idle)
+                self._buckets.move_to_end(key)
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class ConcurrencyLimiter:
+    """Non-blocking limit on the number of requests in flight"""
+
+    def __init__(self, max_concurrent):
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """Reserve a slot; returns False if the limit is reached"""
+        with self._lock:
+            if self.in_flight >= self.max_concurrent:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        """Release a slot reserved with try_acquire"""
+        with self._lock:
+            self.in_flight -= 1
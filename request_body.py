@@ -0,0 +1,152 @@
+"""
+Request Body Reading for LangGames
+Size-bounded, deadline-bounded reading of POST bodies (Content-Length or chunked)
+
+Bodies are read in pieces of at most one socket read each, so neither a
+huge body nor a client trickling bytes can hold a worker or memory beyond
+the route's limits. A declared Content-Length over the limit is refused
+before anything is read.
+"""
+
+import re
+import socket
+import time
+
+MAX_CHUNK_LINE = 1024  # Longest chunk-size or trailer line accepted
+# Stricter than int(): no sign, 0x prefix or underscores (RFC 9112 7.1, RFC 9110 8.6)
+CHUNK_SIZE_PATTERN = re.compile(rb'[0-9A-Fa-f]+')
+CONTENT_LENGTH_PATTERN = re.compile(r'[0-9]+')
+READ_SIZE = 64 * 1024
+
+
+class BodyError(Exception):
+    """The body can't be accepted; status is the HTTP status to answer with"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class BodyReader:
+    """Reads one request body from a handler's rfile"""
+
+    def __init__(self, rfile, connection, max_bytes, timeout):
+        """
+        Args:
+            rfile: Buffered reader over the client socket
+            connection (socket.socket): Client socket, used for per-read timeouts
+            max_bytes (int): Largest body accepted
+            timeout (float): Seconds allowed for the whole body to arrive
+        """
+        self.rfile = rfile
+        self.connection = connection
+        self.max_bytes = max_bytes
+        self.deadline = time.monotonic() + timeout
+
+    def _arm(self):
+        # Each socket read may only wait for what is left of the deadline
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise BodyError(408, 'Request body not received in time')
+        if isinstance(self.connection, socket.socket):
+            self.connection.settimeout(remaining)
+
+    def _read_some(self, size):
+        self._arm()
+        try:
+            data = self.rfile.read1(size)
+        except (socket.timeout, TimeoutError):
+            raise BodyError(408, 'Request body not received in time')
+        if not data:
+            raise BodyError(400, 'Request body ended early')
+        return data
+
+    def _read_exact(self, size, body):
+        while size > 0:
+            data = self._read_some(min(size, READ_SIZE))
+            body += data
+            size -= len(data)
+
+    def _read_line(self):
+        line = bytearray()
+        while not line.endswith(b'\n'):
+            self._arm()
+            try:
+                buffered = self.rfile.peek(1)
+            except (socket.timeout, TimeoutError):
+                raise BodyError(408, 'Request body not received in time')
+            if not buffered:
+                raise BodyError(400, 'Request body ended early')
+            newline = buffered.find(b'\n')
+            line += self.rfile.read(len(buffered) if newline < 0 else newline + 1)
+            if len(line) > MAX_CHUNK_LINE:
+                raise BodyError(400, 'Chunk header too long')
+        return bytes(line)
+
+    def read_sized(self, content_length):
+        """Read a body with a declared Content-Length"""
+        if content_length > self.max_bytes:
+            raise BodyError(413, f'Request body larger than {self.max_bytes} bytes')
+        body = bytearray()
+        self._read_exact(content_length, body)
+        return bytes(body)
+
+    def read_chunked(self):
+        """Read a Transfer-Encoding: chunked body, including any trailers"""
+        body = bytearray()
+        while True:
+            size_field = self._read_line().split(b';', 1)[0].strip()
+            if not CHUNK_SIZE_PATTERN.fullmatch(size_field):
+                raise BodyError(400, 'Invalid chunk size')
+            size = int(size_field, 16)
+            if size == 0:
+                break
+            if len(body) + size > self.max_bytes:
+                raise BodyError(413, f'Request body larger than {self.max_bytes} bytes')
+            self._read_exact(size, body)
+            if self._read_line() not in (b'\r\n', b'\n'):
+                raise BodyError(400, 'Chunk not terminated by CRLF')
+
+        # Trailers end with an empty line
+        while self._read_line() not in (b'\r\n', b'\n'):
+            pass
+        return bytes(body)
+
+
+def read_body(rfile, headers, connection, max_bytes, timeout):
+    """
+    Read a request body within a size limit and deadline
+
+    Args:
+        rfile: Handler's rfile
+        headers: Request headers
+        connection (socket.socket): Client socket
+        max_bytes (int): Largest body accepted
+        timeout (float): Seconds allowed for the body to arrive
+
+    Returns:
+        bytes: The body (empty if the request has none)
+
+    Raises:
+        BodyError: With the status to answer (400, 408, 413 or 501)
+    """
+    reader = BodyReader(rfile, connection, max_bytes, timeout)
+    previous_timeout = connection.gettimeout() if isinstance(connection, socket.socket) else None
+    try:
+        transfer_encoding = headers.get('Transfer-Encoding')
+        if transfer_encoding:
+            # Transfer-Encoding overrides Content-Length (RFC 9112 6.3)
+            if transfer_encoding.strip().lower() != 'chunked':
+                raise BodyError(501, f'Unsupported Transfer-Encoding: {transfer_encoding}')
+            return reader.read_chunked()
+
+        content_length = headers.get('Content-Length')
+        if content_length is None:
+            return b''
+        if not CONTENT_LENGTH_PATTERN.fullmatch(content_length.strip()):
+            raise BodyError(400, 'Invalid Content-Length')
+        return reader.read_sized(int(content_length))
+    finally:
+        if isinstance(connection, socket.socket):
+            connection.settimeout(previous_timeout)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Shard Rebalancing for LangGames
+Moves players onto shards added to the shard list
+
+Add the new shard to SHARDS_FILE with "new": true and restart the server;
+from then on it moves each affected player on first access. This tool
+moves the rest: it lists the players on every existing shard and moves
+only those whose owner changed, about 1/N of them for one added shard.
+Once it reports no failures, drop the "new" flag and restart again.
+
+Usage:
+    python shard_rebalance.py [--dry-run] [--shards shards.json]
+"""
+
+import sys
+import time
+from collections import Counter
+
+from sharding import ShardedClient, list_users, move_user
+from var import SHARDS_FILE, SHARD_VNODES
+
+TABLE_NAME = 'GIDbasedlv'
+
+
+def rebalance(sharded, table_name=TABLE_NAME, dry_run=False):
+    """
+    Move every player whose shard changed from its previous owner
+
+    Args:
+        sharded (ShardedClient): Client with new shards pending
+        table_name (str): Table holding player rows
+        dry_run (bool): Only count the players that would move
+
+    Returns:
+        dict: Report with scanned, moved, failed and by_route ({(from, to): count})
+    """
+    report = {'scanned': 0, 'moved': 0, 'failed': 0, 'by_route': Counter()}
+    if sharded.previous_ring is None:
+        return report
+
+    for name in sharded.previous_ring.nodes:
+        source = sharded.shards[name]
+        for user_id in sorted(list_users(source, table_name)):
+            report['scanned'] += 1
+            owner = sharded.shard_for(user_id)
+            if owner == name:
+                continue
+
+            report['by_route'][(name, owner)] += 1
+            if dry_run:
+                continue
+            try:
+                move_user(table_name, user_id, source, sharded.shards[owner])
+                report['moved'] += 1
+            except Exception as e:
+                report['failed'] += 1
+                print(f"✗ Moving {user_id} to {owner} failed: {e}")
+
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Move LangGames players onto newly added shards")
+    parser.add_argument('--dry-run', action='store_true', help="Only report the players that would move")
+    parser.add_argument('--shards', default=SHARDS_FILE, help="Shard list with the new shards marked")
+    args = parser.parse_args()
+
+    sharded = ShardedClient.from_config(args.shards, SHARD_VNODES)
+    if sharded.previous_ring is None:
+        print('ℹ No shard is marked "new"; nothing to move')
+        sys.exit(0)
+
+    started = time.time()
+    report = rebalance(sharded, dry_run=args.dry_run)
+
+    print("=" * 60)
+    print("Shard rebalance" + (" (dry run)" if args.dry_run else ""))
+    print("=" * 60)
+    for (source, target), count in sorted(report['by_route'].items()):
+        print(f"  {source} -> {target}: {count}")
+    affected = sum(report['by_route'].values())
+    print(f"Affected: {affected} of {report['scanned']} players")
+    if not args.dry_run:
+        print(f"Moved: {report['moved']}  Failed: {report['failed']}")
+    print(f"Took {time.time() - started:.1f}s")
+    sys.exit(1 if report['failed'] else 0)
@@ -0,0 +1,260 @@
+"""
+Sharding for LangGames
+Spreads player rows over several storage backends by consistent hashing of user_id
+
+Shards are listed in a JSON file (SHARDS_FILE):
+
+    [
+        {"name": "shard-a", "type": "supabase", "url": "https://a.supabase.co", "key": "..."},
+        {"name": "shard-b", "type": "pastebin", "url": "https://paste.example",
+         "site_id": "...", "secret_key": "..."}
+    ]
+
+Each shard owns many points (virtual nodes) on a hash ring, so users are
+spread evenly and adding a shard moves only about 1/N of them. Shard names
+place the points, so renaming a shard moves its users; URLs and keys can
+change freely.
+
+A shard being added is marked "new": true until shard_rebalance.py has
+moved its users over. Meanwhile, a user whose owner changed is moved on
+first access, so no request reads or writes a stale shard.
+"""
+
+import bisect
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from pastebin_client import PastebinAdapter, create_pastebin_client
+
+try:
+    from supabase import create_client
+except ImportError:
+    create_client = None
+
+
+SETTLED_MAX_ITEMS = 100000  # Users remembered as already on their new shard
+
+
+def _ring_hash(value):
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    """Consistent-hash ring with virtual nodes"""
+
+    def __init__(self, nodes=(), vnodes=128):
+        """
+        Args:
+            nodes (iterable): Node names
+            vnodes (int): Points per node on the ring
+        """
+        self.vnodes = vnodes
+        self._points = []  # sorted ring positions
+        self._owners = []  # node name at each position
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node):
+        """Place a node's virtual nodes on the ring"""
+        for replica in range(self.vnodes):
+            point = _ring_hash(f"{node}#{replica}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node):
+        """Take a node's virtual nodes off the ring"""
+        kept = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != node]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def node_for(self, key):
+        """Node owning key: the first virtual node clockwise from the key's hash"""
+        if not self._points:
+            raise LookupError('Hash ring is empty')
+        index = bisect.bisect(self._points, _ring_hash(key)) % len(self._points)
+        return self._owners[index]
+
+    @property
+    def nodes(self):
+        return sorted(set(self._owners))
+
+
+def load_shard_config(path):
+    """Read the shard list; names must be unique"""
+    with open(path, 'r') as f:
+        shards = json.load(f)
+
+    names = [shard['name'] for shard in shards]
+    if len(set(names)) != len(names):
+        raise ValueError('Shard names must be unique')
+    return shards
+
+
+def create_shard_client(spec):
+    """Create the storage client for one shard entry"""
+    backend = spec.get('type', 'supabase')
+    if backend == 'supabase':
+        if create_client is None:
+            raise RuntimeError('Supabase client not available (pip install supabase)')
+        return create_client(spec['url'], spec['key'])
+    if backend == 'pastebin':
+        cache_path = spec.get('cache_file', f"paste_cache.{spec['name']}.bin")
+        return create_pastebin_client(spec['url'], spec['site_id'], spec['secret_key'], cache_path)
+    raise ValueError(f"Unknown shard type: {backend}")
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+def _played_at(row):
+    """A row's lastPlayed as a comparable instant (epoch if missing or invalid)"""
+    try:
+        parsed = datetime.fromisoformat(row.get('lastPlayed'))
+    except (TypeError, ValueError):
+        return datetime.min.replace(tzinfo=timezone.utc)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def list_users(client, table_name, page_size=1000):
+    """All user_ids stored on one backend"""
+    if isinstance(client, PastebinAdapter):
+        return {paste['location'] for paste in client.client.list_pastes()}
+
+    users = set()
+    start = 0
+    while True:
+        rows = client.table(table_name).select('user_id').range(start, start + page_size - 1).execute().data or []
+        users.update(row['user_id'] for row in rows)
+        if len(rows) < page_size:
+            return users
+        start += page_size
+
+
+def delete_user(client, table_name, user_id):
+    """Remove every row (or paste) of a user from one backend"""
+    if isinstance(client, PastebinAdapter):
+        for paste in client.client.list_pastes(location=user_id):
+            client.client.delete(paste['id'])
+        return
+    client.table(table_name).delete().eq('user_id', user_id).execute()
+
+
+def move_user(table_name, user_id, source, target):
+    """
+    Copy a user's row to target, then delete it from source
+
+    A row the target already has with a newer lastPlayed (a save that
+    landed there during a live rebalance) is kept instead of overwritten.
+
+    Returns:
+        bool: True if there was a row to move
+    """
+    rows = source.table(table_name).select('*').eq('user_id', user_id).execute().data
+    if not rows:
+        return False
+
+    row = {key: value for key, value in rows[0].items() if key not in ('id', '_paste_id')}
+    existing = target.table(table_name).select('*').eq('user_id', user_id).execute().data
+    if not existing:
+        target.table(table_name).insert(row).execute()
+    elif _played_at(existing[0]) < _played_at(row):
+        target.table(table_name).update(row).eq('user_id', user_id).execute()
+
+    # Only delete once the copy is written; a crash in between leaves a harmless duplicate
+    delete_user(source, table_name, user_id)
+    return True
+
+
+class _ShardedQuery:
+    """Records a query chain and replays it on the shard that owns its user_id"""
+
+    def __init__(self, sharded, table_name):
+        self._sharded = sharded
+        self._table_name = table_name
+        self._calls = []
+        self._user_id = None
+
+    def __getattr__(self, method):
+        def record(*args, **kwargs):
+            if method == 'eq' and args and args[0] == 'user_id':
+                self._user_id = args[1]
+            elif method in ('insert', 'upsert') and args and isinstance(args[0], dict):
+                self._user_id = args[0].get('user_id', self._user_id)
+            self._calls.append((method, args, kwargs))
+            return self
+        return record
+
+    def _run(self, client):
+        query = client.table(self._table_name)
+        for method, args, kwargs in self._calls:
+            query = getattr(query, method)(*args, **kwargs)
+        return query.execute()
+
+    def execute(self):
+        if self._user_id is not None:
+            self._sharded.settle(self._table_name, self._user_id)
+            return self._run(self._sharded.client_for(self._user_id))
+
+        # Not about one player: ask every shard and combine the rows
+        rows = []
+        for client in self._sharded.shards.values():
+            rows.extend(self._run(client).data or [])
+        return _Result(rows)
+
+
+class ShardedClient:
+    """Supabase-like client that routes each query to the shard owning its user_id"""
+
+    def __init__(self, shards, vnodes=128, new_shards=()):
+        """
+        Args:
+            shards (dict): {shard name: Supabase-like client}
+            vnodes (int): Virtual nodes per shard
+            new_shards (iterable): Shards still being filled by a rebalance
+        """
+        self.shards = dict(shards)
+        self.ring = HashRing(self.shards, vnodes)
+        new_shards = set(new_shards)
+        self.previous_ring = HashRing([name for name in self.shards if name not in new_shards], vnodes) \
+            if new_shards else None
+        self._settled = OrderedDict()  # {(table, user_id): None}, oldest first
+        self._move_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, path, vnodes=128):
+        specs = load_shard_config(path)
+        shards = {spec['name']: create_shard_client(spec) for spec in specs}
+        return cls(shards, vnodes, [spec['name'] for spec in specs if spec.get('new')])
+
+    def settle(self, table_name, user_id):
+        """While a rebalance is pending, move user_id to its new shard before touching it"""
+        if self.previous_ring is None or (table_name, user_id) in self._settled:
+            return
+
+        previous, owner = self.previous_ring.node_for(str(user_id)), self.shard_for(user_id)
+        if previous != owner:
+            with self._move_lock:
+                if (table_name, user_id) not in self._settled:
+                    if move_user(table_name, user_id, self.shards[previous], self.shards[owner]):
+                        print(f"✓ Moved {user_id} from shard {previous} to {owner}")
+        with self._move_lock:
+            # Forgetting a user only costs one more lookup on the previous shard
+            self._settled[(table_name, user_id)] = None
+            while len(self._settled) > SETTLED_MAX_ITEMS:
+                self._settled.popitem(last=False)
+
+    def shard_for(self, user_id):
+        """Name of the shard that stores user_id"""
+        return self.ring.node_for(str(user_id))
+
+    def client_for(self, user_id):
+        return self.shards[self.shard_for(user_id)]
+
+    def table(self, table_name):
+        return _ShardedQuery(self, table_name)
@@ -0,0 +1,372 @@
+"""
+Shared Cache for LangGames
+Fixed-size hash table in a memory-mapped file, shared by every server process on a host
+
+With several server processes, each in-process cache would be its own
+cold copy. Pointing them all at a file under /dev/shm gives one warm
+table instead:
+
+    header    'LGSH', version, bucket count, slots per bucket, slot size
+    hands     one CLOCK hand byte per bucket
+    slots     bucket count x slots per bucket fixed-size slots
+
+    slot      seq, state, referenced, key length, value length, key hash,
+              expires at (unix time), key bytes, value bytes
+
+A key hashes to one bucket of a few slots, so every lookup reads a bounded
+number of slots. Readers take no lock: each slot has a sequence number
+that a writer makes odd while it writes, and a read that saw it change is
+retried (a seqlock). Writers lock the bucket, with a thread lock inside
+the process and an fcntl byte-range lock across processes. A full bucket
+evicts with CLOCK: a hit marks its slot referenced, and the hand passes
+over referenced slots once before reusing one.
+
+A table holding data that must not be dropped (sessions) is opened with
+evict=False instead. A full bucket then spills into the next one and is
+flagged (in its hand byte) so lookups follow it there; only expired slots
+are ever reused, and an insert into a completely full table fails.
+Writers of such a table share one lock, since a spill spans buckets.
+"""
+
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+import progress_codec
+
+MAGIC = b'LGSH'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIII')  # magic, version, no-eviction flag, buckets, slots per bucket, slot size
+HEADER_SIZE = 64
+SLOT = struct.Struct('<IBBHIQd')  # seq, state, referenced, key length, value length, key hash, expires at
+SEQ = struct.Struct('<I')
+
+EMPTY, USED = 0, 1
+READ_RETRIES = 64
+LOCK_STRIPES = 64
+
+
+def _key_hash(key):
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+
+class SharedTable:
+    """Bytes-to-bytes hash table with expiry, in a file shared between processes"""
+
+    def __init__(self, path, capacity=16384, slot_size=512, bucket_slots=8, evict=True):
+        """
+        Args:
+            path (str): Backing file, ideally on tmpfs (/dev/shm)
+            capacity (int): Entries held (rounded up to whole buckets)
+            slot_size (int): Bytes per slot; key plus value must fit in slot_size - 28
+            bucket_slots (int): Slots a key can live in (before spilling, without eviction)
+            evict (bool): Make room with CLOCK; if False, unexpired entries are never dropped
+
+        Raises:
+            ValueError: If the file exists with a different layout
+        """
+        self.path = path
+        self.evict = evict
+        self.bucket_slots = bucket_slots
+        self.buckets = max(1, -(-capacity // bucket_slots))
+        self.slot_size = slot_size
+        self.max_item = slot_size - SLOT.size
+        self._slots_offset = HEADER_SIZE + self.buckets
+        size = self._slots_offset + self.buckets * bucket_slots * slot_size
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            current = os.fstat(self._fd).st_size
+            if current == 0:
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, HEADER.pack(MAGIC, VERSION, not evict, self.buckets, bucket_slots, slot_size), 0)
+            else:
+                header = os.pread(self._fd, HEADER.size, 0)
+                expected = HEADER.pack(MAGIC, VERSION, not evict, self.buckets, bucket_slots, slot_size)
+                if header != expected or current != size:
+                    raise ValueError(f"{path} has another cache layout; remove it or change the path")
+            self._map = mmap.mmap(self._fd, size)
+        except Exception:
+            os.close(self._fd)
+            raise
+        finally:
+            try:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+            except OSError:
+                pass
+
+        self._stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def _slot_offset(self, bucket, index):
+        return self._slots_offset + (bucket * self.bucket_slots + index) * self.slot_size
+
+    def _lock(self, bucket):
+        if not self.evict:
+            bucket = 0  # A spill can touch any bucket, so one lock covers the table
+        stripe = self._stripes[bucket % LOCK_STRIPES]
+        stripe.acquire()
+        # fcntl locks belong to the process, so threads are kept apart by the stripe first
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, HEADER.size + bucket, os.SEEK_SET)
+        return stripe
+
+    def _unlock(self, bucket, stripe):
+        if not self.evict:
+            bucket = 0
+        fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, HEADER.size + bucket, os.SEEK_SET)
+        stripe.release()
+
+    def _read_slot(self, offset):
+        """Consistent (state, key hash, expires, key, value) of a slot, read without locking"""
+        data = self._map
+        for _ in range(READ_RETRIES):
+            seq = SEQ.unpack_from(data, offset)[0]
+            if seq & 1:
+                time.sleep(0)
+                continue
+            _, state, _, key_length, value_length, key_hash, expires = SLOT.unpack_from(data, offset)
+            start = offset + SLOT.size
+            if key_length + value_length > self.max_item:
+                continue  # Torn header read; the sequence check would fail too
+            key = data[start:start + key_length]
+            value = data[start + key_length:start + key_length + value_length]
+            if SEQ.unpack_from(data, offset)[0] == seq:
+                return state, key_hash, expires, key, value
+        return EMPTY, 0, 0.0, b'', b''
+
+    def _write_slot(self, offset, state, key_hash, expires, key=b'', value=b''):
+        data = self._map
+        seq = SEQ.unpack_from(data, offset)[0]
+        SEQ.pack_into(data, offset, seq + 1)
+        start = offset + SLOT.size
+        data[start:start + len(key) + len(value)] = key + value
+        SLOT.pack_into(data, offset, seq + 1, state, 0, len(key), len(value), key_hash, expires)
+        SEQ.pack_into(data, offset, (seq + 2) & 0xFFFFFFFF)
+
+    def _chain(self, bucket):
+        """Buckets a key homed at bucket may live in: just its own, or (without eviction) the spill chain"""
+        for step in range(self.buckets):
+            current = (bucket + step) % self.buckets
+            yield current
+            if self.evict or not self._map[HEADER_SIZE + current]:
+                return
+
+    def _find(self, bucket, key_hash, key):
+        """Offset of key's slot along its chain (caller holds the lock), or None"""
+        for current in self._chain(bucket):
+            for index in range(self.bucket_slots):
+                offset = self._slot_offset(current, index)
+                _, state, _, key_length, _, slot_hash, _ = SLOT.unpack_from(self._map, offset)
+                if state == USED and slot_hash == key_hash and \
+                        self._map[offset + SLOT.size:offset + SLOT.size + key_length] == key:
+                    return offset
+        return None
+
+    def _free_slot(self, bucket, now):
+        """Empty or expired slot in bucket, or None"""
+        for index in range(self.bucket_slots):
+            offset = self._slot_offset(bucket, index)
+            _, state, _, _, _, _, expires = SLOT.unpack_from(self._map, offset)
+            if state != USED or expires < now:
+                return offset
+        return None
+
+    def get(self, key):
+        """Value stored for key (bytes), or None if absent or expired"""
+        key_hash = _key_hash(key)
+        for bucket in self._chain(key_hash % self.buckets):
+            for index in range(self.bucket_slots):
+                offset = self._slot_offset(bucket, index)
+                state, slot_hash, expires, slot_key, value = self._read_slot(offset)
+                if state == USED and slot_hash == key_hash and slot_key == key:
+                    if expires < time.time():
+                        return None
+                    self._map[offset + 5] = 1  # Referenced, for CLOCK
+                    return value
+        return None
+
+    def put(self, key, value, expires_at):
+        """
+        Store value for key until expires_at (unix time)
+
+        Returns:
+            bool: False if key and value don't fit in a slot (any older value is dropped),
+                  or if the table doesn't evict and has no unexpired slot left
+        """
+        if len(key) + len(value) > self.max_item:
+            self.delete(key)
+            return False
+
+        key_hash = _key_hash(key)
+        bucket = key_hash % self.buckets
+        stripe = self._lock(bucket)
+        try:
+            now = time.time()
+            target = self._find(bucket, key_hash, key)
+            if target is None:
+                target = self._place(bucket, now)
+            if target is None:
+                return False
+            self._write_slot(target, USED, key_hash, expires_at, key, value)
+            return True
+        finally:
+            self._unlock(bucket, stripe)
+
+    def _place(self, bucket, now):
+        """Slot for a new key homed at bucket: free, evicted, or spilled further along"""
+        if self.evict:
+            free = self._free_slot(bucket, now)
+            return free if free is not None else self._evict(bucket)
+
+        for step in range(self.buckets):
+            current = (bucket + step) % self.buckets
+            free = self._free_slot(current, now)
+            if free is not None:
+                return free
+            # Full: lookups for keys homed here or earlier must go on to the next bucket
+            self._map[HEADER_SIZE + current] = 1
+        return None
+
+    def _evict(self, bucket):
+        """CLOCK over the bucket's slots: clear referenced bits until one isn't set"""
+        hand_offset = HEADER_SIZE + bucket
+        hand = self._map[hand_offset] % self.bucket_slots
+        for _ in range(2 * self.bucket_slots):
+            offset = self._slot_offset(bucket, hand)
+            hand = (hand + 1) % self.bucket_slots
+            if self._map[offset + 5]:
+                self._map[offset + 5] = 0
+            else:
+                break
+        self._map[hand_offset] = hand
+        return offset
+
+    def delete(self, key):
+        key_hash = _key_hash(key)
+        bucket = key_hash % self.buckets
+        stripe = self._lock(bucket)
+        try:
+            offset = self._find(bucket, key_hash, key)
+            if offset is not None:
+                self._write_slot(offset, EMPTY, 0, 0.0)
+        finally:
+            self._unlock(bucket, stripe)
+
+    def items(self):
+        """(key, value, expires_at) for every live entry; a full scan"""
+        now = time.time()
+        for slot in range(self.buckets * self.bucket_slots):
+            state, _, expires, key, value = self._read_slot(self._slots_offset + slot * self.slot_size)
+            if state == USED and expires >= now:
+                yield key, value, expires
+
+
+class SharedProgressCache:
+    """ProgressCache interface over a SharedTable"""
+
+    def __init__(self, table, ttl=300):
+        self.table = table
+        self.ttl = ttl
+
+    def get(self, user_id):
+        value = self.table.get(json.dumps(user_id).encode())
+        return progress_codec.decode(value) if value is not None else None
+
+    def put(self, user_id, record, expires_at=None):
+        self.table.put(json.dumps(user_id).encode(), progress_codec.encode(record),
+                       expires_at or time.time() + self.ttl)
+
+    def invalidate(self, user_id):
+        self.table.delete(json.dumps(user_id).encode())
+
+    def entries(self):
+        return [(json.loads(key), expires, progress_codec.decode(value)) for key, value, expires in self.table.items()]
+
+    def __len__(self):
+        return sum(1 for _ in self.table.items())
+
+
+class SharedVersionIndex:
+    """VersionIndex interface over a SharedTable"""
+
+    def __init__(self, table, ttl=300):
+        self.table = table
+        self.ttl = ttl
+
+    def get(self, user_id):
+        value = self.table.get(json.dumps(user_id).encode())
+        return value.decode() if value is not None else None
+
+    def put(self, user_id, etag):
+        key = json.dumps(user_id).encode()
+        if etag is None:
+            self.table.delete(key)
+        else:
+            self.table.put(key, etag.encode(), time.time() + self.ttl)
+
+
+class TableFull(ValueError):
+    """Raised when a table that never evicts has no room for a new entry"""
+
+
+class SharedSessions:
+    """
+    Dict-like WalkerAuth session store over a SharedTable opened with evict=False
+
+    Other processes change the table at any time, so callers should use
+    get() and pop(), which touch it once, rather than a membership test
+    followed by indexing.
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    def get(self, token, default=None):
+        value = self.table.get(token.encode())
+        return json.loads(value) if value is not None else default
+
+    def pop(self, token, default=None):
+        session = self.get(token, default)
+        self.table.delete(token.encode())
+        return session
+
+    def __getitem__(self, token):
+        session = self.get(token)
+        if session is None:
+            raise KeyError(token)
+        return session
+
+    def __setitem__(self, token, session):
+        if not self.table.put(token.encode(), json.dumps(session).encode(), session['expires_at']):
+            raise TableFull(f"Session not stored: {self.table.path} is full or the session exceeds "
+                            f"{self.table.max_item} bytes")
+
+    def __delitem__(self, token):
+        self.table.delete(token.encode())
+
+    def __contains__(self, token):
+        return self.table.get(token.encode()) is not None
+
+    def keys(self):
+        return [key.decode() for key, _, _ in self.table.items()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def items(self):
+        return [(key.decode(), json.loads(value)) for key, value, _ in self.table.items()]
+
+    def copy(self):
+        return dict(self.items())
+
+    def update(self, sessions):
+        for token, session in sessions.items():
+            self[token] = session
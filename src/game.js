@@ -26,10 +26,204 @@ async function checkAdConfig() {
     return ADS_ENABLED;
 }
 
+// Compact binary progress encoding (mirrors progress_codec.py)
+const ProgressCodec = {
+    contentType: 'application/vnd.langgames.progress',
+    magic: 0x4C,
+    version: 1,
+    flagZlib: 0x01,
+    compressMinSize: 96, // Payloads smaller than this rarely shrink under zlib
+    tagExtra: 15,
+    fields: [
+        [1, 'user_id', 'str'],
+        [2, 'level', 'int'],
+        [3, 'score', 'int'],
+        [4, 'highScore', 'int'],
+        [5, 'gamesPlayed', 'int'],
+        [6, 'lastPlayed', 'str'],
+        [7, 'stats', 'stats'],
+        [8, 'updated_at', 'str'],
+        [9, 'created_at', 'str'],
+        [10, 'id', 'int'],
+        [11, 'clientId', 'str']
+    ],
+
+    supportsZlib() {
+        return typeof CompressionStream !== 'undefined' && typeof DecompressionStream !== 'undefined';
+    },
+
+    acceptHeader() {
+        const zlib = this.supportsZlib() ? '; zlib=1' : '';
+        return `${this.contentType}${zlib}, application/json;q=0.5`;
+    },
+
+    fits(kind, value) {
+        if (kind === 'int') return Number.isSafeInteger(value);
+        if (kind === 'str') return typeof value === 'string';
+        return value !== null && typeof value === 'object' && !Array.isArray(value) &&
+            Object.values(value).every(v => Number.isSafeInteger(v));
+    },
+
+    // Varints use arithmetic rather than bit operators, which truncate to 32 bits
+    writeVarint(out, value) {
+        while (value > 0x7F) {
+            out.push((value % 128) | 0x80);
+            value = Math.floor(value / 128);
+        }
+        out.push(value);
+    },
+
+    writeSint(out, value) {
+        this.writeVarint(out, value >= 0 ? value * 2 : -value * 2 - 1);
+    },
+
+    writeStr(out, value) {
+        const raw = new TextEncoder().encode(value);
+        this.writeVarint(out, raw.length);
+        raw.forEach(byte => out.push(byte));
+    },
+
+    readVarint(buf, pos) {
+        let result = 0;
+        let multiplier = 1;
+        while (true) {
+            if (pos >= buf.length) throw new Error('Truncated varint');
+            const byte = buf[pos++];
+            result += (byte & 0x7F) * multiplier;
+            if (!(byte & 0x80)) return [result, pos];
+            multiplier *= 128;
+        }
+    },
+
+    readSint(buf, pos) {
+        const [value, next] = this.readVarint(buf, pos);
+        return [value % 2 === 0 ? value / 2 : -(value + 1) / 2, next];
+    },
+
+    readStr(buf, pos) {
+        const [length, start] = this.readVarint(buf, pos);
+        if (start + length > buf.length) throw new Error('Truncated string');
+        return [new TextDecoder().decode(buf.subarray(start, start + length)), start + length];
+    },
+
+    async pipe(bytes, stream) {
+        const piped = new Blob([bytes]).stream().pipeThrough(stream);
+        return new Uint8Array(await new Response(piped).arrayBuffer());
+    },
+
+    async encode(data) {
+        const body = [];
+        const extra = {};
+
+        for (const [name, value] of Object.entries(data)) {
+            const field = this.fields.find(f => f[1] === name);
+            if (!field || !this.fits(field[2], value)) {
+                extra[name] = value;
+                continue;
+            }
+
+            const [tag, , kind] = field;
+            this.writeVarint(body, tag);
+            if (kind === 'int') {
+                this.writeSint(body, value);
+            } else if (kind === 'str') {
+                this.writeStr(body, value);
+            } else {
+                const entries = Object.entries(value);
+                this.writeVarint(body, entries.length);
+                entries.forEach(([key, count]) => {
+                    this.writeStr(body, key);
+                    this.writeSint(body, count);
+                });
+            }
+        }
+
+        if (Object.keys(extra).length > 0) {
+            this.writeVarint(body, this.tagExtra);
+            this.writeStr(body, JSON.stringify(extra));
+        }
+
+        let payload = Uint8Array.from(body);
+        let flags = 0;
+        if (this.supportsZlib() && payload.length >= this.compressMinSize) {
+            const compressed = await this.pipe(payload, new CompressionStream('deflate'));
+            if (compressed.length < payload.length) {
+                payload = compressed;
+                flags |= this.flagZlib;
+            }
+        }
+
+        const out = new Uint8Array(payload.length + 2);
+        out[0] = this.magic;
+        out[1] = (this.version << 4) | flags;
+        out.set(payload, 2);
+        return out;
+    },
+
+    async decode(bytes) {
+        if (bytes.length < 2 || bytes[0] !== this.magic || (bytes[1] >> 4) !== this.version) {
+            throw new Error('Not a LangGames progress payload');
+        }
+
+        let body = bytes.subarray(2);
+        if (bytes[1] & this.flagZlib) {
+            body = await this.pipe(body, new DecompressionStream('deflate'));
+        }
+
+        const data = {};
+        let pos = 0;
+        while (pos < body.length) {
+            let tag;
+            [tag, pos] = this.readVarint(body, pos);
+
+            if (tag === this.tagExtra) {
+                let raw;
+                [raw, pos] = this.readStr(body, pos);
+                Object.assign(data, JSON.parse(raw));
+                continue;
+            }
+
+            const field = this.fields.find(f => f[0] === tag);
+            if (!field) throw new Error(`Unknown field tag ${tag}`);
+
+            const [, name, kind] = field;
+            if (kind === 'int') {
+                [data[name], pos] = this.readSint(body, pos);
+            } else if (kind === 'str') {
+                [data[name], pos] = this.readStr(body, pos);
+            } else {
+                let count;
+                [count, pos] = this.readVarint(body, pos);
+                const stats = {};
+                for (let i = 0; i < count; i++) {
+                    let key;
+                    [key, pos] = this.readStr(body, pos);
+                    [stats[key], pos] = this.readSint(body, pos);
+                }
+                data[name] = stats;
+            }
+        }
+
+        return data;
+    }
+};
+
 // Data persistence module (Supabase only)
 const DataManager = {
     apiUrl: `${SERVER_URL}/api`,
-    autoSaveInterval: null,
+    autoSaveTimer: null,
+    autoSaveDelay: 30000, // Replaced by the server's nextSaveMs after every save
+    maxAutoSaveDelay: 300000,
+    maxPendingSaves: 50,
+    binaryPayloads: true, // Use ProgressCodec on the wire, JSON stays as fallback
+    eventSource: null,
+    clientId: sessionStorage.getItem('clientId') || (() => {
+        // Identifies this tab so it can ignore progress events about its own saves
+        const id = Math.random().toString(36).slice(2) + Date.now().toString(36);
+        sessionStorage.setItem('clientId', id);
+        return id;
+    })(),
+    isFlushing: false,
 
     async saveGameData() {
         // Get user_id from localStorage (WalkerAuth) or use default
@@ -38,6 +232,7 @@ const DataManager = {
 
         const gameData = {
             user_id: userId,
+            clientId: this.clientId,
             level: game.level,
             score: game.score,
             highScore: this.getHighScore(),
@@ -49,27 +244,160 @@ const DataManager = {
             }
         };
 
+        // Saves that failed earlier go out together with this one
+        if (this.getPendingSaves().length > 0) {
+            this.queueSave(gameData);
+            return this.flushPendingSaves();
+        }
+
         // Save to Supabase
         try {
             const response = await fetch(`${this.apiUrl}/data/save`, {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(gameData)
+                ...(await this.encodeBody(gameData))
             });
 
             if (response.ok) {
                 console.log('✓ Game data saved to Supabase');
+                const result = await response.json();
+                this.cacheProgress(userId, result.etag, gameData);
+                this.followCadence(result);
                 return true;
             } else {
                 console.error('✗ Failed to save game data (Supabase error)');
+                if (this.isRetryable(response.status)) {
+                    this.queueSave(gameData);
+                    this.backOffAutoSave();
+                }
                 return false;
             }
         } catch (error) {
             console.error('✗ Failed to save game data (Supabase unavailable):', error);
+            this.queueSave(gameData);
+            this.backOffAutoSave();
             return false;
         }
     },
 
+    followCadence(result) {
+        // The server recommends the next autosave from its current load
+        if (result && result.nextSaveMs > 0) {
+            this.autoSaveDelay = Math.min(result.nextSaveMs, this.maxAutoSaveDelay);
+        }
+        this.scheduleAutoSave();
+    },
+
+    backOffAutoSave() {
+        this.autoSaveDelay = Math.min(this.autoSaveDelay * 2, this.maxAutoSaveDelay);
+        this.scheduleAutoSave();
+    },
+
+    async encodeBody(gameData) {
+        if (this.binaryPayloads) {
+            try {
+                return {
+                    headers: { 'Content-Type': ProgressCodec.contentType },
+                    body: await ProgressCodec.encode(gameData)
+                };
+            } catch (error) {
+                console.log('ℹ Binary encoding failed, sending JSON:', error);
+            }
+        }
+        return {
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(gameData)
+        };
+    },
+
+    async decodeResponse(response) {
+        const contentType = response.headers.get('Content-Type') || '';
+        if (contentType.startsWith(ProgressCodec.contentType)) {
+            return ProgressCodec.decode(new Uint8Array(await response.arrayBuffer()));
+        }
+        return response.json();
+    },
+
+    isRetryable(status) {
+        // Rate limited, overloaded or unreachable backend
+        return status === 429 || status >= 500;
+    },
+
+    getPendingSaves() {
+        const saved = localStorage.getItem('pendingSaves');
+        return saved ? JSON.parse(saved) : [];
+    },
+
+    queueSave(gameData) {
+        // Keep the newest saves only; the server merges them by lastPlayed anyway
+        const pending = this.getPendingSaves();
+        // The id lets a finished sync drop exactly the saves it sent
+        pending.push({ ...gameData, queueId: `${Date.now()}-${Math.random().toString(36).slice(2)}` });
+        localStorage.setItem('pendingSaves', JSON.stringify(pending.slice(-this.maxPendingSaves)));
+        console.log(`ℹ Save queued for sync (${Math.min(pending.length, this.maxPendingSaves)} pending)`);
+    },
+
+    async flushPendingSaves() {
+        const pending = this.getPendingSaves();
+        if (pending.length === 0 || this.isFlushing) {
+            return true;
+        }
+
+        // Replay the whole queue in one request
+        this.isFlushing = true;
+        try {
+            const response = await fetch(`${this.apiUrl}/sync`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ events: pending })
+            });
+
+            if (response.ok) {
+                // Only drop what was sent; saves queued meanwhile stay for next time
+                const sent = new Set(pending.map(save => save.queueId));
+                const remaining = this.getPendingSaves().filter(save => !sent.has(save.queueId));
+                localStorage.setItem('pendingSaves', JSON.stringify(remaining));
+                // The server merged the queue, so the local copy may not match its version
+                localStorage.removeItem('progressCache');
+                console.log(`✓ Synced ${pending.length} queued save(s)`);
+                this.followCadence(await response.json());
+                return true;
+            } else {
+                console.error('✗ Failed to sync queued saves (server error)');
+                if (!this.isRetryable(response.status)) {
+                    // The server rejected the queue itself; retrying won't help
+                    localStorage.removeItem('pendingSaves');
+                }
+                return false;
+            }
+        } catch (error) {
+            console.error('✗ Failed to sync queued saves (server unavailable):', error);
+            return false;
+        } finally {
+            this.isFlushing = false;
+        }
+    },
+
+    scheduleFlush() {
+        // Spread reconnecting clients out so a whole classroom doesn't sync at once
+        const delay = Math.random() * 5000;
+        setTimeout(() => this.flushPendingSaves(), delay);
+    },
+
+    getCachedProgress(userId) {
+        const saved = localStorage.getItem('progressCache');
+        const cached = saved ? JSON.parse(saved) : null;
+        return cached && cached.userId === userId ? cached : null;
+    },
+
+    cacheProgress(userId, etag, data) {
+        // Progress as of a server version, so the next load can skip the download if unchanged
+        if (etag) {
+            localStorage.setItem('progressCache', JSON.stringify({ userId, etag, data }));
+        } else {
+            localStorage.removeItem('progressCache');
+        }
+    },
+
     async loadGameData() {
         // Get user_id from localStorage (WalkerAuth) or use default
         const userEmail = localStorage.getItem('user_email');
@@ -77,10 +405,21 @@ const DataManager = {
 
         // Load from Supabase
         try {
-            const response = await fetch(`${this.apiUrl}/data/load?user_id=${encodeURIComponent(userId)}`);
+            const headers = this.binaryPayloads ? { 'Accept': ProgressCodec.acceptHeader() } : {};
+            const cached = this.getCachedProgress(userId);
+            if (cached) {
+                headers['If-None-Match'] = cached.etag;
+            }
+            const response = await fetch(`${this.apiUrl}/data/load?user_id=${encodeURIComponent(userId)}`, { headers });
+
+            if (response.status === 304 && cached) {
+                console.log('✓ Game data unchanged since this device last saw it');
+                return cached.data;
+            }
 
             if (response.ok) {
-                const data = await response.json();
+                const data = await this.decodeResponse(response);
+                this.cacheProgress(userId, response.headers.get('ETag'), data);
                 if (data && Object.keys(data).length > 0) {
                     console.log('✓ Game data loaded from Supabase');
                     return data;
@@ -98,19 +437,52 @@ const DataManager = {
         }
     },
 
+    subscribeToProgress() {
+        // Live progress pushed from the player's other devices
+        if (typeof EventSource === 'undefined' || this.eventSource) {
+            return;
+        }
+
+        const userEmail = localStorage.getItem('user_email');
+        const userId = userEmail || localStorage.getItem('user_id') || 'default_user';
+
+        this.eventSource = new EventSource(`${this.apiUrl}/events?user_id=${encodeURIComponent(userId)}`);
+        this.eventSource.addEventListener('progress', (event) => {
+            const progress = JSON.parse(event.data);
+            if (progress.clientId !== this.clientId) {
+                applyRemoteProgress(progress);
+            }
+        });
+    },
+
     startAutoSave() {
-        // Auto-save every 30 seconds
-        this.autoSaveInterval = setInterval(() => {
-            if (!game.isGameOver) {
-                this.saveGameData();
+        this.scheduleAutoSave();
+    },
+
+    scheduleAutoSave() {
+        // (Re)start the countdown; any save, automatic or not, resets it
+        if (this.autoSaveTimer) {
+            clearTimeout(this.autoSaveTimer);
+        }
+        this.autoSaveTimer = setTimeout(() => {
+            this.autoSaveTimer = null;
+            if (game.isGameOver) {
+                this.scheduleAutoSave();
+            } else {
+                // Keep the chain going even if this save didn't reschedule it
+                this.saveGameData().finally(() => {
+                    if (!this.autoSaveTimer) {
+                        this.scheduleAutoSave();
+                    }
+                });
             }
-        }, 30000);
+        }, this.autoSaveDelay);
     },
 
     stopAutoSave() {
-        if (this.autoSaveInterval) {
-            clearInterval(this.autoSaveInterval);
-            this.autoSaveInterval = null;
+        if (this.autoSaveTimer) {
+            clearTimeout(this.autoSaveTimer);
+            this.autoSaveTimer = null;
         }
     },
 
@@ -142,6 +514,66 @@ const DataManager = {
     }
 };
 
+// Match/miss events, buffered and sent in batches for per-word difficulty stats
+const GameplayEvents = {
+    url: `${SERVER_URL}/api/gameplay/events`,
+    buffer: [],
+    maxBuffered: 500,
+    batchSize: 100,
+    flushInterval: 15000,
+
+    record(type, vocabulary) {
+        this.buffer.push({ type, english: vocabulary.english, level: game.level });
+        if (this.buffer.length > this.maxBuffered) {
+            this.buffer.splice(0, this.buffer.length - this.maxBuffered);
+        }
+        if (this.buffer.length >= this.batchSize) {
+            this.flush();
+        }
+    },
+
+    body(events) {
+        const userEmail = localStorage.getItem('user_email');
+        const userId = userEmail || localStorage.getItem('user_id') || 'default_user';
+        return JSON.stringify({ user_id: userId, events });
+    },
+
+    async flush() {
+        if (this.buffer.length === 0) {
+            return;
+        }
+
+        const events = this.buffer.splice(0, this.buffer.length);
+        try {
+            const response = await fetch(this.url, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: this.body(events)
+            });
+            if (response.status === 429 || response.status >= 500) {
+                // Put them back for the next flush
+                this.buffer = events.concat(this.buffer).slice(-this.maxBuffered);
+            }
+        } catch (error) {
+            this.buffer = events.concat(this.buffer).slice(-this.maxBuffered);
+        }
+    },
+
+    start() {
+        setInterval(() => this.flush(), this.flushInterval);
+
+        // Send whatever is left when the page goes away
+        window.addEventListener('pagehide', () => {
+            if (this.buffer.length > 0 && navigator.sendBeacon) {
+                const blob = new Blob([this.body(this.buffer)], { type: 'application/json' });
+                if (navigator.sendBeacon(this.url, blob)) {
+                    this.buffer = [];
+                }
+            }
+        });
+    }
+};
+
 // Game state
 const game = {
     canvas: null,
@@ -465,6 +897,32 @@ function showWelcomeBackMessage() {
     }, 2000);
 }
 
+// Apply progress saved on another device
+function applyRemoteProgress(progress) {
+    if (progress.highScore > DataManager.getHighScore()) {
+        localStorage.setItem('highScore', progress.highScore.toString());
+    }
+    if (progress.gamesPlayed > DataManager.getGamesPlayed()) {
+        localStorage.setItem('gamesPlayed', progress.gamesPlayed.toString());
+    }
+    if (progress.stats && progress.stats.totalScore > DataManager.getTotalScore()) {
+        localStorage.setItem('totalScore', progress.stats.totalScore.toString());
+    }
+
+    // Only move forward; never pull a player back to an older level
+    if (progress.level > game.level) {
+        console.log('✓ Progress from another device - continuing from level', progress.level);
+        skipToLevel(progress.level);
+        game.savedLevel = progress.level;
+        game.score = progress.score || game.score;
+        updateUI();
+
+        if (game.isGameOver) {
+            document.getElementById('restartBtn').textContent = `Retry Level ${game.level}`;
+        }
+    }
+}
+
 // Device detection
 const DeviceInfo = {
     isMobile() {
@@ -699,6 +1157,18 @@ async function initGame() {
     // Start auto-save
     DataManager.startAutoSave();
 
+    // Batch match/miss events for per-word difficulty stats
+    GameplayEvents.start();
+
+    // Follow progress made on other devices instead of re-fetching it
+    DataManager.subscribeToProgress();
+
+    // Replay saves queued while offline
+    DataManager.scheduleFlush();
+    window.addEventListener('online', () => {
+        DataManager.scheduleFlush();
+    });
+
     // Save on window close
     window.addEventListener('beforeunload', () => {
         DataManager.saveGameData();
@@ -826,9 +1296,11 @@ function selectWord(english, kannada, element) {
     // Check if it matches
     if (firstTank.vocabulary.english === english) {
         // Correct match!
+        GameplayEvents.record('match', firstTank.vocabulary);
         handleCorrectMatch(firstTank, english);
     } else {
         // Wrong match
+        GameplayEvents.record('wrong', firstTank.vocabulary);
         createParticles(firstTank.x, firstTank.y, '#F44336', 'wrong', 1);
         playWrongSound();
 
@@ -950,10 +1422,12 @@ function checkMatch(kannada, english, dropX, dropY) {
         // Check if the English text matches
         if (closestTank.vocabulary.english === english) {
             // Correct match!
+            GameplayEvents.record('match', closestTank.vocabulary);
             handleCorrectMatch(closestTank, english);
             return true;
         } else {
             // Wrong match - dragged wrong item to tank
+            GameplayEvents.record('wrong', closestTank.vocabulary);
             // Visual feedback - red X particles
             createParticles(closestTank.x, closestTank.y, '#F44336', 'wrong', 1);
 
@@ -1033,6 +1507,9 @@ function levelUp() {
     updateUI();
     startSpawning(); // Update spawn rate
 
+    // Key moment: save right away instead of waiting for the next autosave
+    DataManager.saveGameData();
+
     // Show level up message briefly
     const canvas = game.canvas;
     const ctx = game.ctx;
@@ -1218,6 +1695,7 @@ function gameLoop() {
 
         if (!alive) {
             // Tank reached the end - track as missed
+            GameplayEvents.record('miss', tank.vocabulary);
             game.missedTanks.push({
                 english: tank.vocabulary.english,
                 kannada: tank.vocabulary.kannada
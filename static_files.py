@@ -0,0 +1,194 @@
+"""
+Static File Serving for LangGames
+Zero-copy file transfer and HTTP Range support for SimpleHTTPRequestHandler
+"""
+
+import os
+import socket
+import uuid
+
+MAX_RANGES = 16  # More ranges than this in one request is treated as abuse
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+def parse_byte_ranges(header, size):
+    """
+    Parse a Range header against a file size
+
+    Args:
+        header (str): Range header value, e.g. "bytes=0-99,200-"
+        size (int): File size in bytes
+
+    Returns:
+        list: Sorted, merged (start, end) pairs with inclusive ends; empty if
+              no range is satisfiable. None if the header is invalid and
+              should be ignored.
+    """
+    unit, _, specs = header.partition('=')
+    if unit.strip().lower() != 'bytes' or not specs:
+        return None
+
+    ranges = []
+    for spec in specs.split(','):
+        first, dash, last = spec.strip().partition('-')
+        if not dash:
+            return None
+        try:
+            if not first:
+                # Suffix range: the last N bytes
+                length = int(last)
+                if length <= 0 or size == 0:
+                    continue  # An empty file has no last bytes to send
+                ranges.append((max(0, size - length), size - 1))
+            else:
+                start = int(first)
+                end = int(last) if last else None
+                if start < 0 or (end is not None and end < start):
+                    return None
+                if start >= size:
+                    continue
+                ranges.append((start, size - 1 if end is None else min(end, size - 1)))
+        except ValueError:
+            return None
+
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    # Overlapping or adjacent ranges are sent once
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class StaticFileMixin:
+    """
+    Adds byte-range requests and sendfile() transfers to SimpleHTTPRequestHandler
+
+    Whole files and single ranges go straight from the page cache to the
+    socket with socket.sendfile(), which itself falls back to send() when
+    the transport can't use sendfile (TLS, non-socket outputs).
+    """
+
+    use_sendfile = hasattr(os, 'sendfile')
+
+    def send_head(self):
+        self._byte_ranges = None
+        self._multipart_boundary = None
+        self._accepts_ranges = False
+
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path) or self.path.endswith('/'):
+            return super().send_head()
+
+        range_header = self.headers.get('Range')
+        if not range_header:
+            self._accepts_ranges = True
+            return super().send_head()
+
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            return super().send_head()
+
+        try:
+            fs = os.fstat(f.fileno())
+            last_modified = self.date_time_string(fs.st_mtime)
+
+            # If-Range: only honour the range if the file hasn't changed
+            if_range = self.headers.get('If-Range')
+            ranges = parse_byte_ranges(range_header, fs.st_size)
+            if ranges is None or (if_range and if_range != last_modified):
+                f.close()
+                self._accepts_ranges = True
+                return super().send_head()
+
+            if not ranges:
+                f.close()
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{fs.st_size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return None
+
+            ctype = self.guess_type(path)
+            self.send_response(206)
+            self.send_header('Last-Modified', last_modified)
+            self.send_header('Accept-Ranges', 'bytes')
+
+            if len(ranges) == 1:
+                start, end = ranges[0]
+                self.send_header('Content-type', ctype)
+                self.send_header('Content-Range', f'bytes {start}-{end}/{fs.st_size}')
+                self.send_header('Content-Length', str(end - start + 1))
+                self._byte_ranges = [(start, end, b'')]
+            else:
+                boundary = uuid.uuid4().hex
+                parts = []
+                length = 0
+                for start, end in ranges:
+                    part_header = (
+                        f'\r\n--{boundary}\r\n'
+                        f'Content-Type: {ctype}\r\n'
+                        f'Content-Range: bytes {start}-{end}/{fs.st_size}\r\n\r\n'
+                    ).encode('latin-1')
+                    parts.append((start, end, part_header))
+                    length += len(part_header) + end - start + 1
+                closing = f'\r\n--{boundary}--\r\n'.encode('latin-1')
+                length += len(closing)
+
+                self.send_header('Content-type', f'multipart/byteranges; boundary={boundary}')
+                self.send_header('Content-Length', str(length))
+                self._byte_ranges = parts
+                self._multipart_boundary = closing
+
+            self.end_headers()
+            return f
+        except Exception:
+            f.close()
+            raise
+
+    def end_headers(self):
+        if getattr(self, '_accepts_ranges', False):
+            self.send_header('Accept-Ranges', 'bytes')
+            self._accepts_ranges = False
+        super().end_headers()
+
+    def copyfile(self, source, outputfile):
+        """Send the whole file, or only the requested ranges"""
+        ranges = getattr(self, '_byte_ranges', None)
+        if not ranges:
+            size = os.fstat(source.fileno()).st_size - source.tell()
+            self._send_file_range(source, outputfile, source.tell(), size)
+            return
+
+        for start, end, part_header in ranges:
+            if part_header:
+                outputfile.write(part_header)
+            self._send_file_range(source, outputfile, start, end - start + 1)
+        if self._multipart_boundary:
+            outputfile.write(self._multipart_boundary)
+
+    def _send_file_range(self, source, outputfile, offset, count):
+        if count <= 0:
+            return
+
+        connection = getattr(self, 'connection', None)
+        if self.use_sendfile and isinstance(connection, socket.socket) and outputfile is self.wfile:
+            outputfile.flush()
+            connection.sendfile(source, offset, count)
+            return
+
+        # Plain copy for outputs that aren't a socket
+        source.seek(offset)
+        remaining = count
+        while remaining > 0:
+            chunk = source.read(min(COPY_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            outputfile.write(chunk)
+            remaining -= len(chunk)
+
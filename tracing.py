@@ -0,0 +1,198 @@
+"""
+Request Tracing for LangGames
+Lightweight spans per request, exported as Chrome trace-event JSON
+
+Every traced request gets a trace id. Only a sampled fraction of them
+record spans; for the rest span() hands back a shared no-op context
+manager, so instrumented code pays one thread-local lookup. Sampled traces
+are written to the export directory as <trace id>-<pid>-<n>.json (callers may
+reuse a trace id across requests) and can be opened in chrome://tracing or
+https://ui.perfetto.dev.
+"""
+
+import functools
+import itertools
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+
+TRACE_ID_PATTERN = re.compile(r'^[0-9a-f]{16,32}$')
+
+_local = threading.local()
+
+
+class _NoopSpan:
+    """Stands in for a span when the current request isn't sampled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """One timed section of a trace"""
+
+    def __init__(self, trace, name, args):
+        self.trace = trace
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.trace.add(self.name, self.start, end, self.args)
+        return False
+
+
+class Trace:
+    """Spans recorded for one sampled request"""
+
+    def __init__(self, trace_id, name):
+        self.trace_id = trace_id
+        self.name = name
+        self.events = []
+        self._lock = threading.Lock()
+
+    def add(self, name, start_ns, end_ns, args):
+        event = {
+            'name': name,
+            'ph': 'X',
+            'ts': start_ns / 1000,
+            'dur': (end_ns - start_ns) / 1000,
+            'pid': os.getpid(),
+            'tid': threading.get_native_id(),
+        }
+        if args:
+            event['args'] = args
+        with self._lock:
+            self.events.append(event)
+
+    def to_chrome(self):
+        """Chrome trace-event document for this trace"""
+        return {
+            'traceEvents': sorted(self.events, key=lambda event: event['ts']),
+            'displayTimeUnit': 'ms',
+            'otherData': {'trace_id': self.trace_id, 'request': self.name},
+        }
+
+
+class Tracer:
+    """Samples requests and writes their traces to disk"""
+
+    def __init__(self, sample_rate=0.0, export_dir='traces', max_files=1000):
+        """
+        Args:
+            sample_rate (float): Fraction of requests that record spans (0-1)
+            export_dir (str): Directory for exported trace files
+            max_files (int): Exported traces kept; the oldest are deleted first
+        """
+        self.sample_rate = sample_rate
+        self.export_dir = export_dir
+        self.max_files = max_files
+        self._exported = deque()
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def begin(self, name, trace_id=None):
+        """
+        Start tracing the current request on this thread
+
+        Args:
+            name (str): Request description, e.g. "POST /api/data/save"
+            trace_id (str): Id propagated by the caller, if valid
+
+        Returns:
+            str: The request's trace id
+        """
+        if not trace_id or not TRACE_ID_PATTERN.match(trace_id):
+            trace_id = os.urandom(8).hex()
+
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            _local.trace = Trace(trace_id, name)
+            _local.started = time.perf_counter_ns()
+        else:
+            _local.trace = None
+        return trace_id
+
+    def end(self):
+        """Finish the current request and export it if it was sampled"""
+        trace = getattr(_local, 'trace', None)
+        if trace is None:
+            return
+        _local.trace = None
+        trace.add(trace.name, _local.started, time.perf_counter_ns(), {'trace_id': trace.trace_id})
+        self.export(trace)
+
+    def export(self, trace):
+        """Write a trace as <export_dir>/<trace id>-<pid>-<n>.json"""
+        name = f"{trace.trace_id}-{os.getpid()}-{next(self._sequence)}.json"
+        path = os.path.join(self.export_dir, name)
+        try:
+            os.makedirs(self.export_dir, exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(trace.to_chrome(), f)
+        except OSError as e:
+            print(f"✗ Trace export failed: {e}")
+            return
+
+        with self._lock:
+            self._exported.append(path)
+            while len(self._exported) > self.max_files:
+                try:
+                    os.remove(self._exported.popleft())
+                except OSError:
+                    pass
+
+
+def span(name, **args):
+    """Time a block as part of the current request's trace (no-op if unsampled)"""
+    trace = getattr(_local, 'trace', None)
+    if trace is None:
+        return NOOP_SPAN
+    return Span(trace, name, args)
+
+
+def traced(name):
+    """Decorator form of span() for functions and methods"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = getattr(_local, 'trace', None)
+            if trace is None:
+                return func(*args, **kwargs)
+            with Span(trace, name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def carry(func):
+    """Bind func to the current request's trace so its spans count when run on another thread"""
+    trace = getattr(_local, 'trace', None)
+    if trace is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = getattr(_local, 'trace', None)
+        _local.trace = trace
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.trace = previous
+    return wrapper
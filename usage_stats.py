@@ -0,0 +1,209 @@
+"""
+Usage Stats for LangGames
+Live player counts and activity in fixed memory, using probabilistic sketches
+
+- Unique players per UTC day: HyperLogLog, 16 KB per day, ~0.8% error
+- Most active players: count-min sketch (never undercounts) plus a top-K heap
+- Loads and saves per minute: ring of per-minute counters covering the last hour
+
+Memory stays the same whether ten or ten million players show up. Today's
+sketches are kept next to yesterday's; both roll over at UTC midnight.
+"""
+
+import hashlib
+import heapq
+import math
+import threading
+import time
+from array import array
+from datetime import datetime, timezone
+
+MAX_DEPTH = 8  # Count-min rows a key digest has bits for
+
+
+def _digest(value):
+    # 64 bits for HyperLogLog, then 32 independent bits per count-min row
+    return hashlib.blake2b(str(value).encode('utf-8'), digest_size=8 + 4 * MAX_DEPTH).digest()
+
+
+class HyperLogLog:
+    """Cardinality estimate from 2^precision one-byte registers"""
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+
+    def add_digest(self, digest):
+        """Add a key by its digest"""
+        value = int.from_bytes(digest[:8], 'little')
+        index = value >> (64 - self.precision)
+        rest = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Few items: linear counting over the empty registers is more accurate
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+
+class CountMinSketch:
+    """Approximate per-key counts in depth rows of width counters"""
+
+    def __init__(self, width=2048, depth=4):
+        if depth > MAX_DEPTH:
+            raise ValueError(f"depth must be at most {MAX_DEPTH}")
+        self.width = width
+        self.depth = depth
+        self.counters = array('I', bytes(4 * width * depth))
+
+    def _cells(self, digest):
+        return [row * self.width + int.from_bytes(digest[8 + 4 * row:12 + 4 * row], 'little') % self.width
+                for row in range(self.depth)]
+
+    def add_digest(self, digest, count=1):
+        """Count a key by its digest; returns the key's new estimate"""
+        cells = self._cells(digest)
+        counters = self.counters
+        for cell in cells:
+            counters[cell] = min(counters[cell] + count, 0xFFFFFFFF)
+        return min(counters[cell] for cell in cells)
+
+
+class TopK:
+    """The k keys with the highest counts seen so far"""
+
+    def __init__(self, k=20):
+        self.k = k
+        self.counts = {}  # {key: count} for current members
+        self._heap = []   # (count, key); entries whose count is outdated are skipped
+
+    def offer(self, key, count):
+        if key not in self.counts and len(self.counts) >= self.k:
+            while self._heap[0][0] != self.counts.get(self._heap[0][1]):
+                heapq.heappop(self._heap)
+            if count <= self._heap[0][0]:
+                return
+            del self.counts[heapq.heappop(self._heap)[1]]
+
+        self.counts[key] = count
+        heapq.heappush(self._heap, (count, key))
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(count, key) for key, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def ranked(self):
+        return sorted(self.counts.items(), key=lambda entry: -entry[1])
+
+
+class SlidingWindow:
+    """Event counts in fixed time buckets over a rolling window"""
+
+    def __init__(self, buckets=60, bucket_seconds=60):
+        self.bucket_seconds = bucket_seconds
+        self.counts = array('Q', bytes(8 * buckets))
+        self.stamps = array('q', bytes(8 * buckets))  # bucket number each slot currently holds
+
+    def _slot(self, bucket):
+        slot = bucket % len(self.counts)
+        if self.stamps[slot] != bucket:
+            self.stamps[slot] = bucket
+            self.counts[slot] = 0
+        return slot
+
+    def add(self, now, count=1):
+        self.counts[self._slot(int(now // self.bucket_seconds))] += count
+
+    def series(self, now, buckets=None):
+        """Counts of the latest buckets, oldest first (the last one is still filling)"""
+        current = int(now // self.bucket_seconds)
+        buckets = min(buckets or len(self.counts), len(self.counts))
+        return [self.counts[bucket % len(self.counts)] if self.stamps[bucket % len(self.counts)] == bucket else 0
+                for bucket in range(current - buckets + 1, current + 1)]
+
+
+class UsageStats:
+    """Unique players, heavy hitters and per-minute activity, in fixed memory"""
+
+    KINDS = ('load', 'save')
+
+    def __init__(self, precision=14, width=2048, depth=4, top_k=20):
+        """
+        Args:
+            precision (int): HyperLogLog registers are 2^precision bytes
+            width (int): Count-min counters per row
+            depth (int): Count-min rows
+            top_k (int): Most active players tracked
+        """
+        self.precision = precision
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.windows = {kind: SlidingWindow() for kind in self.KINDS}
+        self._day = None
+        self._yesterday = None
+        self._lock = threading.Lock()
+        self._roll(self._today())
+
+    @staticmethod
+    def _today():
+        return datetime.now(timezone.utc).date().isoformat()
+
+    def _roll(self, day):
+        if self._day is not None:
+            self._yesterday = {'day': self._day, 'uniquePlayers': self._unique.count(),
+                               'topPlayers': self._ranked()}
+        self._day = day
+        self._unique = HyperLogLog(self.precision)
+        self._activity = CountMinSketch(self.width, self.depth)
+        self._top = TopK(self.top_k)
+
+    def _ranked(self):
+        return [{'user_id': user_id, 'requests': count} for user_id, count in self._top.ranked()]
+
+    def record(self, kind, user_id):
+        """Count one load or save by a player"""
+        digest = _digest(user_id)
+        now = time.time()
+        with self._lock:
+            today = self._today()
+            if today != self._day:
+                self._roll(today)
+            self._unique.add_digest(digest)
+            self._top.offer(user_id, self._activity.add_digest(digest))
+            self.windows[kind].add(now)
+
+    def snapshot(self):
+        """Current figures for the admin stats endpoint"""
+        now = time.time()
+        with self._lock:
+            per_minute = {kind: window.series(now) for kind, window in self.windows.items()}
+            stats = {
+                'day': self._day,
+                'uniquePlayers': self._unique.count(),
+                'topPlayers': self._ranked(),
+                'yesterday': self._yesterday,
+            }
+
+        # The current minute is partial, so rates use the completed ones
+        for kind, series in per_minute.items():
+            stats[f'{kind}sPerMinute'] = {
+                'lastMinute': series[-2],
+                'last5Minutes': round(sum(series[-6:-1]) / 5, 1),
+                'last60Minutes': round(sum(series[:-1]) / (len(series) - 1), 1),
+                'series': series,
+            }
+        stats['memoryBytes'] = self.memory_bytes()
+        return stats
+
+    def memory_bytes(self):
+        """Bytes held by the sketches and window counters"""
+        windows = sum(window.counts.itemsize * len(window.counts) * 2 for window in self.windows.values())
+        return (1 << self.precision) + 4 * self.width * self.depth + windows
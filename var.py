@@ -15,6 +15,12 @@ API_BASE_URL = f"{SERVER_URL}/api"
 API_DATA_SAVE = f"{API_BASE_URL}/data/save"
 API_DATA_LOAD = f"{API_BASE_URL}/data/load"
 API_SYNC_SETTINGS = f"{API_BASE_URL}/sync/settings"
+API_SYNC = f"{API_BASE_URL}/sync"
+API_EVENTS = f"{API_BASE_URL}/events"
+API_GAMEPLAY_EVENTS = f"{API_BASE_URL}/gameplay/events"
+API_GAMEPLAY_HARDEST = f"{API_BASE_URL}/gameplay/hardest"
+API_VOCAB_SEARCH = f"{API_BASE_URL}/vocab/search"
+API_VOCAB_DISTRACTORS = f"{API_BASE_URL}/vocab/distractors"
 
 # Authentication URLs (to be configured)
 WALKER_AUTH_URL = ""  # WalkerAuth server URL - to be provided
@@ -30,16 +36,33 @@ PASTEBIN_LOAD = f"{PASTEBIN_URL}/load" if PASTEBIN_URL else ""
 # Sync Configuration
 DEFAULT_SYNC_URL = "https://example.com/api/save"  # Default sync URL (placeholder)
 SYNC_SETTINGS_FILE = "sync_settings.json"
+SYNC_MAX_EVENTS = int(os.getenv('SYNC_MAX_EVENTS', 200))  # Queued saves accepted per /api/sync request
+
+# Progress Push (server-sent events)
+SSE_HEARTBEAT_INTERVAL = int(os.getenv('SSE_HEARTBEAT_INTERVAL', 15))  # seconds
+SSE_QUEUE_SIZE = int(os.getenv('SSE_QUEUE_SIZE', 16))  # events buffered per stream
+SSE_MAX_SUBSCRIBERS = int(os.getenv('SSE_MAX_SUBSCRIBERS', 1000))
 
 # Encryption Configuration
 ENCRYPTION_KEY_FILE = "secret.key"
 ENCRYPTED_DATA_FILE = "EMDATA.txt"
 
+# Pastebin Cache (decrypted pastes, stored encrypted on disk; empty path = memory only)
+PASTE_CACHE_FILE = os.getenv('PASTE_CACHE_FILE', 'paste_cache.bin')
+PASTE_CACHE_MAX_ITEMS = int(os.getenv('PASTE_CACHE_MAX_ITEMS', 5000))
+PASTE_COMPACTION_INTERVAL = int(os.getenv('PASTE_COMPACTION_INTERVAL', 3600))  # seconds, 0 = off
+PASTE_COMPACTION_KEEP = int(os.getenv('PASTE_COMPACTION_KEEP', 3))  # versions kept per location
+SHARDS_FILE = os.getenv('SHARDS_FILE', 'shards.json')  # shard list; storage is unsharded without it
+SHARD_VNODES = int(os.getenv('SHARD_VNODES', 128))  # ring points per shard
+
 # Feature Flags
 AUTH_ENABLED = False  # Enable when WalkerAuth is configured
 SYNC_ENABLED = True   # Cloud sync enabled by default
 AUTO_SAVE_ENABLED = True
-AUTO_SAVE_INTERVAL = 30  # seconds
+AUTO_SAVE_INTERVAL = int(os.getenv('AUTO_SAVE_INTERVAL', 30))  # seconds at nominal load
+AUTO_SAVE_MIN_INTERVAL = int(os.getenv('AUTO_SAVE_MIN_INTERVAL', 10))  # seconds, idle server
+AUTO_SAVE_MAX_INTERVAL = int(os.getenv('AUTO_SAVE_MAX_INTERVAL', 300))  # seconds, overloaded server
+AUTO_SAVE_TARGET_LATENCY = float(os.getenv('AUTO_SAVE_TARGET_LATENCY', 0.25))  # seconds per backend call
 
 # Game Configuration
 TRIAL_MODE = False  # Trial mode disabled - infinite levels
@@ -47,8 +70,65 @@ MAX_LEVEL = 999  # No limit
 DEFAULT_LIVES = 3
 BASE_SPAWN_RATE = 3000  # milliseconds
 
+# Rate Limiting (token buckets: sustained requests/second and burst size; a rate of 0 = off)
+RATE_LIMIT_IP_RATE = float(os.getenv('RATE_LIMIT_IP_RATE', 5))
+RATE_LIMIT_IP_BURST = float(os.getenv('RATE_LIMIT_IP_BURST', 30))
+RATE_LIMIT_USER_RATE = float(os.getenv('RATE_LIMIT_USER_RATE', 1))
+RATE_LIMIT_USER_BURST = float(os.getenv('RATE_LIMIT_USER_BURST', 10))
+RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', 10000))
+BACKEND_MAX_CONCURRENCY = int(os.getenv('BACKEND_MAX_CONCURRENCY', 8))
+SAVE_QUEUE_MAX_PENDING = int(os.getenv('SAVE_QUEUE_MAX_PENDING', 16))  # saves waiting per user
+TRUST_FORWARDED_FOR = os.getenv('TRUST_FORWARDED_FOR', '0') == '1'  # Behind a reverse proxy
+
+# Progress Cache (loads served from memory; saves write through)
+PROGRESS_CACHE_MAX_ITEMS = int(os.getenv('PROGRESS_CACHE_MAX_ITEMS', 10000))  # 0 = off
+PROGRESS_CACHE_TTL = int(os.getenv('PROGRESS_CACHE_TTL', 300))  # seconds
+VERSION_INDEX_MAX_ITEMS = int(os.getenv('VERSION_INDEX_MAX_ITEMS', 100000))  # per-user ETags for conditional loads
+
+# Shared Cache (progress, ETags and sessions in shared memory, for several server processes on one host)
+SHARED_CACHE_DIR = os.getenv('SHARED_CACHE_DIR', '')  # e.g. /dev/shm/langgames; empty = per-process caches
+SHARED_CACHE_SLOT_SIZE = int(os.getenv('SHARED_CACHE_SLOT_SIZE', 512))  # bytes per cached progress record
+SHARED_SESSION_SLOTS = int(os.getenv('SHARED_SESSION_SLOTS', 16384))  # sessions held (never evicted); logins fail once full
+
+# Warm Restart (state written on shutdown, restored on the next start)
+STATE_SNAPSHOT_FILE = os.getenv('STATE_SNAPSHOT_FILE', 'state.snapshot')  # empty = off
+STATE_SNAPSHOT_MAX_AGE = int(os.getenv('STATE_SNAPSHOT_MAX_AGE', 600))  # seconds cached progress stays usable
+
+# Hedged Reads (a second load is raced against one slower than the recent p95)
+HEDGED_READS = os.getenv('HEDGED_READS', '0') == '1'
+HEDGE_BUDGET = float(os.getenv('HEDGE_BUDGET', 0.05))  # hedges per read, on average
+HEDGE_MIN_DELAY = float(os.getenv('HEDGE_MIN_DELAY', 0.02))  # seconds
+HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', 95))
+HEDGE_COLD_DELAY = float(os.getenv('HEDGE_COLD_DELAY', 1.0))  # seconds, until enough reads give a percentile
+
+# Gameplay Stats (per-vocabulary-item match/miss counters; empty log path = memory only)
+GAMEPLAY_LOG_FILE = os.getenv('GAMEPLAY_LOG_FILE', 'gameplay_events.bin')
+GAMEPLAY_MAX_EVENTS = int(os.getenv('GAMEPLAY_MAX_EVENTS', 500))  # events accepted per batch
+GAMEPLAY_STATS_TTL = int(os.getenv('GAMEPLAY_STATS_TTL', 30))  # seconds a hardest-items list is cached
+
+# Distractors (similar-looking wrong answers, rebuilt at startup when the vocabulary changes)
+DISTRACTORS_FILE = os.getenv('DISTRACTORS_FILE', 'distractors.bin')
+DISTRACTORS_K = int(os.getenv('DISTRACTORS_K', 8))  # distractors stored per item
+
+# Request Bodies (bytes accepted per POST route, and seconds allowed for a body to arrive)
+BODY_LIMIT_DEFAULT = int(os.getenv('BODY_LIMIT_DEFAULT', 64 * 1024))
+BODY_LIMIT_SAVE = int(os.getenv('BODY_LIMIT_SAVE', 16 * 1024))
+BODY_LIMIT_SYNC = int(os.getenv('BODY_LIMIT_SYNC', 1024 * 1024))
+BODY_LIMIT_GAMEPLAY = int(os.getenv('BODY_LIMIT_GAMEPLAY', 256 * 1024))
+BODY_READ_TIMEOUT = float(os.getenv('BODY_READ_TIMEOUT', 10))
+
+# Admin Endpoints (disabled unless ADMIN_TOKEN is set; sent as X-Admin-Token)
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+PROFILE_MAX_SECONDS = float(os.getenv('PROFILE_MAX_SECONDS', 60))  # longest CPU profile per request
+
+# Request Tracing (TRACE_SAMPLE_RATE is the fraction of API requests traced, 0 = off)
+TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', 0))
+TRACE_EXPORT_DIR = os.getenv('TRACE_EXPORT_DIR', 'traces')
+TRACE_MAX_FILES = int(os.getenv('TRACE_MAX_FILES', 1000))
+
 # File Paths
 SRC_DIRECTORY = "src"
+ASSET_BUNDLING = os.getenv('ASSET_BUNDLING', '1') == '1'  # Serve content-hashed bundles from src/dist
 STATIC_FILES = ["index.html", "game.js", "vocabulary.js", "crypto.js"]
 
 # Environment Variables (os already imported above)
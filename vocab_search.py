@@ -0,0 +1,243 @@
+"""
+Vocabulary Search for LangGames
+Prefix trie and trigram index over English, Kannada and romanized Kannada
+
+Every item is indexed under three keys: casefolded English, NFC-normalized
+Kannada, and a romanization of the Kannada with vowel length and
+aspiration folded away (so "niru", "neeru" and "niiru" all reach ನೀರು).
+Trie nodes keep their best matches pre-sorted, which makes prefix lookups
+a walk of len(query) nodes; trigram postings catch matches that don't start
+at a word boundary and small misspellings.
+"""
+
+import re
+import unicodedata
+
+MAX_NODE_RESULTS = 50  # Pre-ranked matches kept per trie node
+MIN_NGRAM_SCORE = 0.3
+
+# Scores by kind of match; transliterated matches are scaled by ROMAN_WEIGHT
+SCORE_EXACT = 3.0
+SCORE_EXACT_WORD = 2.5
+SCORE_LEADING_WORD = 0.25  # Bonus when the exact word starts the field
+SCORE_FIELD_PREFIX = 2.0
+SCORE_WORD_PREFIX = 1.5
+ROMAN_WEIGHT = 0.9
+
+KANNADA_VOWELS = {
+    'ಅ': 'a', 'ಆ': 'aa', 'ಇ': 'i', 'ಈ': 'ii', 'ಉ': 'u', 'ಊ': 'uu', 'ಋ': 'ru',
+    'ಎ': 'e', 'ಏ': 'ee', 'ಐ': 'ai', 'ಒ': 'o', 'ಓ': 'oo', 'ಔ': 'au',
+}
+KANNADA_CONSONANTS = {
+    'ಕ': 'k', 'ಖ': 'kh', 'ಗ': 'g', 'ಘ': 'gh', 'ಙ': 'ng',
+    'ಚ': 'ch', 'ಛ': 'chh', 'ಜ': 'j', 'ಝ': 'jh', 'ಞ': 'ny',
+    'ಟ': 't', 'ಠ': 'th', 'ಡ': 'd', 'ಢ': 'dh', 'ಣ': 'n',
+    'ತ': 't', 'ಥ': 'th', 'ದ': 'd', 'ಧ': 'dh', 'ನ': 'n',
+    'ಪ': 'p', 'ಫ': 'ph', 'ಬ': 'b', 'ಭ': 'bh', 'ಮ': 'm',
+    'ಯ': 'y', 'ರ': 'r', 'ಱ': 'r', 'ಲ': 'l', 'ವ': 'v', 'ಶ': 'sh', 'ಷ': 'sh',
+    'ಸ': 's', 'ಹ': 'h', 'ಳ': 'l', 'ೞ': 'l',
+}
+KANNADA_VOWEL_SIGNS = {
+    'ಾ': 'aa', 'ಿ': 'i', 'ೀ': 'ii', 'ು': 'u', 'ೂ': 'uu', 'ೃ': 'ru',
+    'ೆ': 'e', 'ೇ': 'ee', 'ೈ': 'ai', 'ೊ': 'o', 'ೋ': 'oo', 'ೌ': 'au',
+}
+LABIALS = {'ಪ', 'ಫ', 'ಬ', 'ಭ', 'ಮ'}
+VIRAMA = '್'
+ANUSVARA = 'ಂ'
+VISARGA = 'ಃ'
+
+def normalize(text):
+    """NFC-normalize, casefold and reduce punctuation to single spaces"""
+    text = unicodedata.normalize('NFC', text).casefold()
+    # Letters, numbers and marks: Kannada vowel signs and viramas are marks, not \w
+    kept = ''.join(char if unicodedata.category(char)[0] in 'LMN' else ' ' for char in text)
+    return ' '.join(kept.split())
+
+
+def transliterate(kannada):
+    """Romanize Kannada text (lowercase ASCII, long vowels doubled)"""
+    out = []
+    pending_a = False  # A consonant's inherent 'a' not yet written
+    kannada = unicodedata.normalize('NFC', kannada)
+    for index, char in enumerate(kannada):
+        if char in KANNADA_CONSONANTS:
+            if pending_a:
+                out.append('a')
+            out.append(KANNADA_CONSONANTS[char])
+            pending_a = True
+            continue
+
+        if char in KANNADA_VOWEL_SIGNS:
+            out.append(KANNADA_VOWEL_SIGNS[char])
+        elif char == VIRAMA:
+            pass
+        else:
+            if pending_a:
+                out.append('a')
+            if char in KANNADA_VOWELS:
+                out.append(KANNADA_VOWELS[char])
+            elif char == ANUSVARA:
+                # Nasal takes the place of the next consonant: ಚಂದ್ರ chandra, ಕಂಬ kamba
+                following = kannada[index + 1] if index + 1 < len(kannada) else ''
+                out.append('n' if following in KANNADA_CONSONANTS and following not in LABIALS else 'm')
+            elif char == VISARGA:
+                out.append('h')
+            elif '೦' <= char <= '೯':
+                out.append(str(ord(char) - ord('೦')))
+            elif char.isascii():
+                out.append(char.lower())
+            else:
+                out.append(' ')
+        pending_a = False
+
+    if pending_a:
+        out.append('a')
+    return ''.join(out)
+
+
+def phonetic_key(roman):
+    """Fold spelling variation out of romanized text: aspiration, w/v and doubled letters"""
+    roman = re.sub(r'[^a-z0-9 ]', ' ', roman.lower())
+    roman = re.sub(r'([kgcjtdpb])h', r'\1', roman)
+    roman = roman.replace('w', 'v')
+    roman = re.sub(r'(.)\1+', r'\1', roman)
+    return ' '.join(roman.split())
+
+
+def query_keys(query):
+    """Phonetic keys for a Latin-script query; 'ee'/'oo' are also tried as long i/u"""
+    keys = {phonetic_key(query)}
+    keys.add(phonetic_key(query.lower().replace('ee', 'i').replace('oo', 'u')))
+    return [key for key in keys if key]
+
+
+def trigrams(text):
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Node:
+    __slots__ = ('children', 'matches', 'ranked')
+
+    def __init__(self):
+        self.children = {}
+        self.matches = {}  # {item id: score} while building
+        self.ranked = ()   # ((item id, score), ...) best first once built
+
+
+class VocabularyIndex:
+    """Search index over vocabulary items"""
+
+    def __init__(self, vocabulary):
+        """
+        Args:
+            vocabulary (list): Items from vocabulary.load_vocabulary()
+        """
+        self.vocabulary = vocabulary
+        self._roots = {'text': _Node(), 'roman': _Node()}
+        self._exact = {'text': {}, 'roman': {}}  # {key: {item id: score}}
+        self._grams = {'text': {}, 'roman': {}}  # {trigram: [item ids]}
+        self._gram_counts = {'text': {}, 'roman': {}}  # {item id: trigrams per key}
+
+        for item in vocabulary:
+            roman = phonetic_key(transliterate(item['kannada']))
+            for field, key in (('text', normalize(item['english'])),
+                               ('text', normalize(item['kannada'])),
+                               ('roman', roman)):
+                self._add(field, item['id'], key)
+
+        for root in self._roots.values():
+            self._finish(root)
+
+    def _add(self, field, item_id, key):
+        if not key:
+            return
+
+        self._insert(field, key, item_id, SCORE_FIELD_PREFIX)
+        for position, word in enumerate(key.split(' ')):
+            self._insert(field, word, item_id, SCORE_WORD_PREFIX)
+            exact = self._exact[field].setdefault(word, {})
+            score = SCORE_EXACT_WORD + (SCORE_LEADING_WORD if position == 0 else 0)
+            exact[item_id] = max(exact.get(item_id, 0), score)
+        self._exact[field].setdefault(key, {})[item_id] = SCORE_EXACT
+
+        grams = trigrams(key)
+        for gram in grams:
+            self._grams[field].setdefault(gram, []).append(item_id)
+        counts = self._gram_counts[field]
+        counts[item_id] = max(counts.get(item_id, 0), len(grams))
+
+    def _insert(self, field, key, item_id, score):
+        node = self._roots[field]
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            if node.matches.get(item_id, 0) < score:
+                node.matches[item_id] = score
+
+    def _finish(self, root):
+        # Rank each node's matches once: best score, then shortest item
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            ranked = sorted(node.matches.items(),
+                            key=lambda match: (-match[1], len(self.vocabulary[match[0]]['english'])))
+            node.ranked = tuple(ranked[:MAX_NODE_RESULTS])
+            node.matches = None
+            stack.extend(node.children.values())
+
+    def _lookup(self, field, key, weight, scores):
+        for item_id, score in self._exact[field].get(key, {}).items():
+            scores[item_id] = max(scores.get(item_id, 0), score * weight)
+
+        node = self._roots[field]
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                break
+        else:
+            for item_id, score in node.ranked:
+                scores[item_id] = max(scores.get(item_id, 0), score * weight)
+
+        # Trigram overlap for mid-word matches and typos
+        if len(key) < 3:
+            return
+        grams = trigrams(key)
+        shared = {}
+        postings = self._grams[field]
+        for gram in grams:
+            for item_id in postings.get(gram, ()):
+                shared[item_id] = shared.get(item_id, 0) + 1
+        counts = self._gram_counts[field]
+        for item_id, count in shared.items():
+            score = count / (len(grams) + counts[item_id] - count)
+            if score >= MIN_NGRAM_SCORE:
+                scores[item_id] = max(scores.get(item_id, 0), score * weight)
+
+    def search(self, query, limit=10):
+        """
+        Ranked matches for a query in English, Kannada or romanized Kannada
+
+        Returns:
+            list: Items as dicts with id, english, kannada, category and score
+        """
+        scores = {}
+        text = normalize(query)
+        if text:
+            self._lookup('text', text, 1.0, scores)
+        if query.isascii():
+            for key in query_keys(query):
+                self._lookup('roman', key, ROMAN_WEIGHT, scores)
+
+        best = sorted(scores.items(),
+                      key=lambda match: (-match[1], len(self.vocabulary[match[0]]['english'])))
+        results = []
+        for item_id, score in best[:limit]:
+            item = self.vocabulary[item_id]
+            results.append({
+                'id': item_id,
+                'english': item['english'],
+                'kannada': item['kannada'],
+                'category': item['category'],
+                'score': round(score, 3),
+            })
+        return results
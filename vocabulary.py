@@ -0,0 +1,73 @@
+"""
+Vocabulary for LangGames
+Reads the word list from src/vocabulary.js so the server and the game share one source
+"""
+
+import hashlib
+import os
+import re
+
+VOCABULARY_FILE = os.path.join("src", "vocabulary.js")
+
+CATEGORY_PATTERN = re.compile(r'^\s*(\w+)\s*:\s*\[', re.M)
+ITEM_PATTERN = re.compile(
+    r"\{\s*english:\s*'((?:[^'\\]|\\.)*)',\s*"
+    r"kannada:\s*'((?:[^'\\]|\\.)*)',\s*"
+    r"difficulty:\s*'((?:[^'\\]|\\.)*)'\s*\}"
+)
+
+# Categories the game draws from at each level (see getVocabularyForLevel)
+LEVEL_CATEGORIES = [
+    (2, ('letters',)),
+    (5, ('words', 'letters')),
+    (None, ('sentences', 'words', 'letters')),
+]
+
+
+def _unescape(value):
+    return re.sub(r"\\(.)", r"\1", value)
+
+
+def load_vocabulary(path=VOCABULARY_FILE):
+    """
+    Parse vocabularyData from vocabulary.js
+
+    Returns:
+        list: Items as dicts with id, english, kannada, difficulty and category;
+              id is the item's position in this list
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    # Each category's items run until the next category starts
+    categories = [(match.group(1), match.end()) for match in CATEGORY_PATTERN.finditer(source)]
+    items = []
+    for index, (category, start) in enumerate(categories):
+        end = categories[index + 1][1] if index + 1 < len(categories) else len(source)
+        for match in ITEM_PATTERN.finditer(source, start, end):
+            items.append({
+                'id': len(items),
+                'english': _unescape(match.group(1)),
+                'kannada': _unescape(match.group(2)),
+                'difficulty': _unescape(match.group(3)),
+                'category': category,
+            })
+    return items
+
+
+def categories_for_level(level):
+    """Vocabulary categories that can appear at a level"""
+    for max_level, categories in LEVEL_CATEGORIES:
+        if max_level is None or level <= max_level:
+            return categories
+
+
+def vocabulary_fingerprint(vocabulary, fields=('english',)):
+    """
+    Hash of the item order, so files keyed by item id are only read against the same ids
+
+    Args:
+        fields (tuple): Item fields the file's contents depend on
+    """
+    joined = '\n'.join('\t'.join(item[field] for field in fields) for item in vocabulary)
+    return hashlib.sha256(joined.encode('utf-8')).digest()[:16]
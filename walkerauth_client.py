@@ -85,14 +85,14 @@ class WalkerAuthClient:
         Returns:
             dict: User data if valid, None if invalid/expired
         """
-        if token not in self.sessions:
+        # One lookup: with a shared store the entry can vanish between two
+        session = self.sessions.get(token)
+        if session is None:
             return None
 
-        session = self.sessions[token]
-
         # Check expiration
         if time.time() > session['expires_at']:
-            del self.sessions[token]
+            self.sessions.pop(token, None)
             return None
 
         return session['user']
@@ -104,5 +104,4 @@ class WalkerAuthClient:
         Args:
             token (str): Session token to remove
         """
-        if token in self.sessions:
-            del self.sessions[token]
+        self.sessions.pop(token, None)
@@ -0,0 +1,266 @@
+"""
+Warm Restart for LangGames
+Snapshots in-memory server state on shutdown and restores it on startup
+
+File layout (little-endian):
+
+    header    'LGSS', version, written at (unix time), section count
+    section   tag (4 bytes), payload length, CRC-32 of payload, payload
+
+Sections are sessions (SESS), cached progress (PROG) and rate-limit
+buckets (RLIM). Each one is checked and restored on its own, so a damaged
+section only loses that part of the state. The file is memory-mapped for
+loading and deleted afterwards, so a later crash can't bring back stale
+state. Sessions or progress can be left out (passed as None) when they
+live somewhere that survives a restart anyway, such as the shared cache. Session tokens are bearer credentials, so the file is created
+readable by its owner only.
+"""
+
+import json
+import mmap
+import os
+from contextlib import suppress
+import struct
+import time
+import zlib
+
+import progress_codec
+
+MAGIC = b'LGSS'
+VERSION = 1
+HEADER = struct.Struct('<4sBdI')   # magic, version, written_at, section count
+SECTION = struct.Struct('<4sII')   # tag, payload length, crc32
+COUNT = struct.Struct('<I')
+LENGTH = struct.Struct('<I')
+FLOAT = struct.Struct('<d')
+
+
+class _Writer:
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def count(self, value):
+        self.buffer += COUNT.pack(value)
+
+    def float(self, value):
+        self.buffer += FLOAT.pack(value)
+
+    def bytes(self, value):
+        self.buffer += LENGTH.pack(len(value))
+        self.buffer += value
+
+    def str(self, value):
+        self.bytes(value.encode('utf-8'))
+
+
+class _Reader:
+    """Reads fields of one section straight from the mapped file"""
+
+    def __init__(self, data, start, end):
+        self.data = data
+        self.offset = start
+        self.end = end
+
+    def _take(self, size):
+        if self.offset + size > self.end:
+            raise ValueError('Section ends early')
+        start = self.offset
+        self.offset += size
+        return start
+
+    def count(self):
+        return COUNT.unpack_from(self.data, self._take(COUNT.size))[0]
+
+    def float(self):
+        return FLOAT.unpack_from(self.data, self._take(FLOAT.size))[0]
+
+    def bytes(self):
+        length = LENGTH.unpack_from(self.data, self._take(LENGTH.size))[0]
+        start = self._take(length)
+        return self.data[start:start + length]
+
+    def str(self):
+        return self.bytes().decode('utf-8')
+
+
+def encode_sessions(sessions):
+    writer = _Writer()
+    writer.count(len(sessions))
+    for token, session in sessions.items():
+        writer.str(token)
+        writer.float(session['created_at'])
+        writer.float(session['expires_at'])
+        writer.str(json.dumps(session['user']))
+    return writer.buffer
+
+
+def decode_sessions(reader, now):
+    sessions = {}
+    for _ in range(reader.count()):
+        token, created_at, expires_at, user = reader.str(), reader.float(), reader.float(), reader.str()
+        if expires_at > now:
+            sessions[token] = {'user': json.loads(user), 'created_at': created_at, 'expires_at': expires_at}
+    return sessions
+
+
+def encode_progress(entries):
+    writer = _Writer()
+    writer.count(len(entries))
+    for user_id, expires_at, record in entries:
+        writer.str(json.dumps(user_id))
+        writer.float(expires_at)
+        writer.bytes(progress_codec.encode(record, compress=False))
+    return writer.buffer
+
+
+def decode_progress(reader, now):
+    entries = []
+    for _ in range(reader.count()):
+        user_id, expires_at, record = reader.str(), reader.float(), reader.bytes()
+        if expires_at > now:
+            entries.append((json.loads(user_id), expires_at, progress_codec.decode(record)))
+    return entries
+
+
+def encode_rate_limits(limiters):
+    writer = _Writer()
+    buckets = [(name, key, tokens, idle) for name, limiter in limiters.items()
+               for key, tokens, idle in limiter.export()]
+    writer.count(len(buckets))
+    for name, key, tokens, idle in buckets:
+        writer.str(name)
+        writer.str(json.dumps(key))
+        writer.float(tokens)
+        writer.float(idle)
+    return writer.buffer
+
+
+def decode_rate_limits(reader, downtime):
+    buckets = {}
+    for _ in range(reader.count()):
+        name, key, tokens, idle = reader.str(), reader.str(), reader.float(), reader.float()
+        # Buckets kept refilling while the server was down
+        buckets.setdefault(name, []).append((json.loads(key), tokens, idle + downtime))
+    return buckets
+
+
+def write_snapshot(path, sections):
+    """
+    Write sections ({tag: payload}) atomically
+
+    Returns:
+        int: Bytes written
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(fd, 0o600)  # A leftover temp file keeps its old mode otherwise
+    with os.fdopen(fd, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, time.time(), len(sections)))
+        for tag, payload in sections.items():
+            f.write(SECTION.pack(tag, len(payload), zlib.crc32(payload)))
+            f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+
+def save_state(path, walkerauth, progress_cache, limiters):
+    """Snapshot sessions, cached progress and rate-limit buckets to path (None leaves a part out)"""
+    started = time.time()
+    sections = {}
+    if walkerauth is not None:
+        sections[b'SESS'] = encode_sessions(walkerauth.sessions.copy())
+    if progress_cache is not None:
+        sections[b'PROG'] = encode_progress(progress_cache.entries())
+    sections[b'RLIM'] = encode_rate_limits(limiters)
+    try:
+        size = write_snapshot(path, sections)
+    except OSError as e:
+        print(f"✗ State snapshot failed: {e}")
+        return
+    print(f"✓ State snapshot written: {size} bytes in {(time.time() - started) * 1000:.0f}ms")
+
+
+def restore_state(path, walkerauth, progress_cache, limiters, max_age=600):
+    """
+    Restore a snapshot written by save_state, then delete it
+
+    Sections for a walkerauth or progress_cache of None are skipped.
+
+    Args:
+        max_age (float): Seconds after which cached progress is too old to
+                         trust (other servers may have written since)
+
+    Returns:
+        dict: Entries restored per section
+    """
+    restored = {}
+    if not os.path.exists(path):
+        return restored
+
+    started = time.time()
+    try:
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        # Restored and removed by another process in the meantime
+        return restored
+    except (OSError, ValueError) as e:
+        print(f"✗ State snapshot unreadable: {e}")
+        with suppress(FileNotFoundError):
+            os.remove(path)
+        return restored
+
+    try:
+        if len(data) < HEADER.size:
+            raise ValueError('File is truncated')
+        magic, version, written_at, section_count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Unknown snapshot format')
+
+        now = time.time()
+        downtime = max(0.0, now - written_at)
+        offset = HEADER.size
+        for _ in range(section_count):
+            if offset + SECTION.size > len(data):
+                raise ValueError('File is truncated')
+            tag, length, crc = SECTION.unpack_from(data, offset)
+            start, offset = offset + SECTION.size, offset + SECTION.size + length
+            if offset > len(data):
+                raise ValueError('File is truncated')
+            if zlib.crc32(data[start:offset]) != crc:
+                print(f"✗ State snapshot section {tag.decode(errors='replace')} is corrupt, skipped")
+                continue
+
+            reader = _Reader(data, start, offset)
+            try:
+                if tag == b'SESS' and walkerauth is not None:
+                    sessions = decode_sessions(reader, now)
+                    walkerauth.sessions.update(sessions)
+                    restored['sessions'] = len(sessions)
+                elif tag == b'PROG' and progress_cache is not None and downtime <= max_age:
+                    entries = decode_progress(reader, now)
+                    for user_id, expires_at, record in entries:
+                        progress_cache.put(user_id, record, expires_at)
+                    restored['progress'] = len(entries)
+                elif tag == b'RLIM':
+                    buckets = decode_rate_limits(reader, downtime)
+                    for name, limiter_buckets in buckets.items():
+                        if name in limiters:
+                            limiters[name].restore(limiter_buckets)
+                    restored['rateLimits'] = sum(len(entries) for entries in buckets.values())
+            except (ValueError, UnicodeDecodeError, progress_codec.CodecError) as e:
+                print(f"✗ State snapshot section {tag.decode(errors='replace')} unreadable: {e}")
+    except ValueError as e:
+        print(f"✗ State snapshot ignored: {e}")
+    finally:
+        data.close()
+        with suppress(FileNotFoundError):
+            os.remove(path)
+
+    if restored:
+        summary = ', '.join(f"{count} {name}" for name, count in restored.items())
+        print(f"✓ State restored in {(time.time() - started) * 1000:.0f}ms: {summary}")
+    return restored
@@ -0,0 +1,97 @@
+"""
+Write Queues for LangGames
+Runs each key's writes one at a time, in order, while different keys run in parallel
+
+Every key (user_id) gets its own FIFO queue, drained by at most one pool
+thread at a time, so a player's select-then-update steps never interleave
+with another save of the same player. The pool is shared and bounded;
+a busy key hands its thread back after a few writes so one player can't
+hold a worker. Writes carry an order (their lastPlayed); one that has a
+newer write queued behind it is skipped, since that write replaces it.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+DRAIN_BATCH = 8  # Writes run for one key before its thread is handed back
+
+
+class QueueFull(Exception):
+    """Too many writes are already waiting for this key"""
+
+
+class KeyedExecutor:
+    """Ordered per-key execution on a bounded thread pool"""
+
+    def __init__(self, max_workers=8, max_pending=16):
+        """
+        Args:
+            max_workers (int): Threads shared by all keys
+            max_pending (int): Writes allowed to wait per key
+        """
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='keyed-write')
+        self._queues = {}  # {key: deque of pending writes}; a key is present while it is scheduled
+        self._lock = threading.Lock()
+        self._stats = {'submitted': 0, 'applied': 0, 'superseded': 0}
+
+    def submit(self, key, func, *args, order=None, **kwargs):
+        """
+        Queue func(*args, **kwargs) behind the key's earlier writes
+
+        Args:
+            key: Writes with equal keys run one at a time, in submission order
+            func (callable): The write
+            order: Comparable recency of the write (e.g. lastPlayed), or None
+
+        Returns:
+            Future: func's result, or None if a newer write made it redundant
+
+        Raises:
+            QueueFull: If max_pending writes are already waiting for key
+        """
+        future = Future()
+        with self._lock:
+            queue = self._queues.get(key)
+            idle = queue is None
+            if idle:
+                queue = self._queues[key] = deque()
+            elif len(queue) >= self.max_pending:
+                raise QueueFull(f"{len(queue)} writes already waiting")
+            queue.append((order, future, func, args, kwargs))
+            self._stats['submitted'] += 1
+
+        if idle:
+            self._executor.submit(self._drain, key)
+        return future
+
+    def _drain(self, key):
+        for _ in range(DRAIN_BATCH):
+            with self._lock:
+                queue = self._queues[key]
+                if not queue:
+                    del self._queues[key]
+                    return
+                order, future, func, args, kwargs = queue.popleft()
+                superseded = order is not None and any(
+                    later is not None and later >= order for later, *_ in queue)
+                self._stats['superseded' if superseded else 'applied'] += 1
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            if superseded:
+                future.set_result(None)
+                continue
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+        # Let other keys have the thread; this key stays scheduled so its order holds
+        self._executor.submit(self._drain, key)
+
+    def stats(self):
+        """Counters plus the number of keys with writes queued"""
+        with self._lock:
+            return dict(self._stats, activeKeys=len(self._queues))